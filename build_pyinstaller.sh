@@ -19,6 +19,7 @@ pyinstaller --name="RoadTripPlanner" \
     --onefile \
     --windowed \
     --add-data="config.py:." \
+    --add-data="resources/us_places.csv:resources" \
     --hidden-import=PyQt6.QtCore \
     --hidden-import=PyQt6.QtGui \
     --hidden-import=PyQt6.QtWidgets \
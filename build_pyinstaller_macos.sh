@@ -22,6 +22,7 @@ pyinstaller --name="RoadTripPlanner" \
     --onedir \
     --windowed \
     --add-data="config.py:." \
+    --add-data="resources/us_places.csv:resources" \
     --hidden-import=PyQt6.QtCore \
     --hidden-import=PyQt6.QtGui \
     --hidden-import=PyQt6.QtWidgets \
@@ -86,3 +86,88 @@ PET_FRIENDLY_CHAINS = [
     'marriott', 'hyatt', 'sheraton', 'westin', 'doubletree',
     'holiday inn', 'courtyard', 'country inn'
 ]
+
+# Maximum pooled keep-alive connections per API host
+HTTP_POOL_SIZE = 10
+
+# Concurrent Google Places searches during planning (1 = sequential)
+DEFAULT_PLACES_WORKERS = 4
+
+# Request budgets per API host: (requests per second, burst size)
+RATE_LIMITS = {
+    'nominatim.openstreetmap.org': (1.0, 1),  # Nominatim usage policy
+    'router.project-osrm.org': (1.0, 1),  # Public demo server policy
+    'places.googleapis.com': (10.0, 10),
+    'en.wikipedia.org': (10.0, 5),
+    'en.wikivoyage.org': (10.0, 5),
+}
+
+# Maximum in-flight requests per API host for the async service clients
+ASYNC_MAX_IN_FLIGHT = {
+    'nominatim.openstreetmap.org': 1,
+    'router.project-osrm.org': 2,
+    'places.googleapis.com': 50,
+    'en.wikipedia.org': 10,
+    'en.wikivoyage.org': 10,
+}
+ASYNC_DEFAULT_IN_FLIGHT = 10
+
+# Route scans: (search radius, corridor half-width to cover) in meters by category;
+# search circles are placed by utils.coverage.plan_corridor_coverage. Parks and
+# chargers share one 20 km circle per point (parks are still only kept within
+# 5 km of it), and viewpoints only need the road itself covered, so a scan makes
+# fewer calls than fixed-interval sampling every 25/75/15 miles.
+ROUTE_SCAN_COVERAGE = {
+    'parks': (20000, 5000),
+    'viewpoints': (25000, 0),
+    'ev_chargers': (20000, 5000),
+}
+
+# Places search-along-route (corridor) mode: the route is split into segments of
+# this length, each simplified and sent as one encoded polyline; scans fall back
+# to fixed-interval sampling if any segment's polyline is still too long
+PLACES_CORRIDOR_SEGMENT_MILES = 200
+PLACES_CORRIDOR_SIMPLIFY_METERS = 200
+PLACES_CORRIDOR_MAX_POLYLINE_CHARS = 8000
+PLACES_CORRIDOR_MAX_PAGES = 3  # Text search returns at most 20 results per page
+
+# Forward geocoding cache (cleared from the GUI via Tools → Clear Location Cache)
+LOCATION_CACHE_FILE = 'location_cache.json'
+REVERSE_GEOCODE_CACHE_FILE = 'reverse_geocode_cache.json'
+LOCATION_CACHE_FLUSH_EVERY = 100  # New entries held in memory before the file is rewritten
+
+# Places API response cache
+PLACES_CACHE_FILE = 'places_cache.db'
+PLACES_CACHE_MAX_ENTRIES = 20000
+
+# OSRM route geometry transport: 'polyline6' is several times smaller than
+# 'geojson' and decodes straight into a NumPy array
+OSRM_GEOMETRIES = 'polyline6'
+
+# OSRM route cache: each leg between two waypoints is stored on its own, so
+# routes sharing legs with an earlier trip only fetch the new ones
+ROUTE_CACHE_FILE = 'route_cache.db'
+ROUTE_CACHE_MAX_ENTRIES = 5000
+ROUTE_CACHE_TTL = 30 * 86400  # Seconds; road networks change slowly
+
+# Local POI store: every Nearby Search result plus the areas fully searched,
+# so later trips through the same areas skip those searches (same TTLs as the cache)
+POI_STORE_FILE = 'poi_store.db'
+
+# Finished pipeline stages of each trip, kept until its exports are written
+# so an interrupted plan can resume (--resume, or Resume in the GUI)
+CHECKPOINT_DIR = 'checkpoints'
+
+# How long to keep cached Places responses, in seconds, by request category
+PLACES_CACHE_TTL = {
+    'hotels': 7 * 86400,
+    'vets': 7 * 86400,
+    'parks': 30 * 86400,
+    'museums': 30 * 86400,
+    'restaurants': 7 * 86400,
+    'dog_parks': 30 * 86400,
+    'viewpoints': 90 * 86400,
+    'national_parks': 90 * 86400,
+    'monuments': 90 * 86400,
+    'ev_chargers': 7 * 86400,
+}
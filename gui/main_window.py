@@ -10,8 +10,11 @@ from PyQt6.QtGui import QAction, QIcon
 import sys
 from pathlib import Path
 
+from config import LOCATION_CACHE_FILE, REVERSE_GEOCODE_CACHE_FILE
+
 from .trip_form import TripForm
 from .results_panel import ResultsPanel
+from .trip_planner_thread import TripPlannerThread
 from .settings_dialog import SettingsDialog
 
 
@@ -141,9 +144,12 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage('Settings saved', 3000)
     
     def clear_cache(self):
-        """Clear the location cache."""
-        cache_file = Path('location_cache.json')
-        if cache_file.exists():
+        """Clear the forward and reverse geocoding caches."""
+        cache_files = [
+            Path(name) for name in (LOCATION_CACHE_FILE, REVERSE_GEOCODE_CACHE_FILE)
+            if Path(name).exists()
+        ]
+        if cache_files:
             reply = QMessageBox.question(
                 self,
                 'Clear Cache',
@@ -151,10 +157,13 @@ class MainWindow(QMainWindow):
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
             if reply == QMessageBox.StandardButton.Yes:
-                cache_file.unlink()
+                TripPlannerThread.clear_location_caches()
+                for cache_file in cache_files:
+                    if cache_file.exists():
+                        cache_file.unlink()
                 self.status_bar.showMessage('Cache cleared', 3000)
         else:
-            QMessageBox.information(self, 'Cache', 'No cache file found.')
+            QMessageBox.information(self, 'Cache', 'No cache files found.')
     
     def show_about(self):
         """Show about dialog."""
@@ -125,7 +125,7 @@ class ResultsPanel(QWidget):
         # Update details
         details = []
         details.append(f"# Trip Summary\n")
-        details.append(f"Generated: {trip_data.get('generated_at', 'N/A')}\n\n")
+        details.append(f"Generated: {trip_data.get('generated', 'N/A')}\n\n")
         
         details.append(f"## Major Stops ({len(trip_data.get('major_stops', []))})\n")
         for stop in trip_data.get('major_stops', []):
@@ -90,6 +90,14 @@ class TripForm(QWidget):
         self.roundtrip.setToolTip('Use --via cities instead for a varied return route')
         options_layout.addRow('', self.roundtrip)
         
+        self.offline_geocoding = QCheckBox('Offline city lookup (faster)')
+        self.offline_geocoding.setToolTip('Find cities along the route from the bundled gazetteer instead of OpenStreetMap')
+        options_layout.addRow('', self.offline_geocoding)
+        
+        self.corridor_search = QCheckBox('Search along route corridor (fewer API calls)')
+        self.corridor_search.setToolTip('Scan the route with Places search-along-route requests instead of a search every few miles')
+        options_layout.addRow('', self.corridor_search)
+        
         options_group.setLayout(options_layout)
         form_layout.addWidget(options_group)
         
@@ -189,9 +197,17 @@ class TripForm(QWidget):
         button_layout = QHBoxLayout()
         button_layout.addStretch()
         
+        self.resume_button = QPushButton('Resume ↻')
+        self.resume_button.setMinimumHeight(40)
+        self.resume_button.setToolTip(
+            'Continue an interrupted plan of this trip, skipping the steps it already finished'
+        )
+        self.resume_button.clicked.connect(lambda: self.plan_trip(resume=True))
+        button_layout.addWidget(self.resume_button)
+        
         self.plan_button = QPushButton('Plan Trip 🚗')
         self.plan_button.setMinimumHeight(40)
-        self.plan_button.clicked.connect(self.plan_trip)
+        self.plan_button.clicked.connect(lambda: self.plan_trip())
         button_layout.addWidget(self.plan_button)
         
         layout.addLayout(button_layout)
@@ -232,8 +248,8 @@ class TripForm(QWidget):
                 via_cities.append(line_edit.text().strip())
         return via_cities
         
-    def plan_trip(self):
-        """Start trip planning."""
+    def plan_trip(self, resume=False):
+        """Start trip planning (resume continues the trip's last interrupted run)."""
         # Validate inputs
         origin = self.origin_input.text().strip()
         destination = self.destination_input.text().strip()
@@ -266,6 +282,9 @@ class TripForm(QWidget):
             'roundtrip': self.roundtrip.isChecked(),
             'target_hours': self.stop_distance.value() // 65,  # Approximate
             'waypoint_interval': self.waypoint_interval.value(),
+            'offline_geocoding': self.offline_geocoding.isChecked(),
+            'corridor_search': self.corridor_search.isChecked(),
+            'resume': resume,
             # Search options
             'search_hotels': self.search_hotels.isChecked(),
             'pet_friendly_only': self.pet_friendly_only.isChecked(),
@@ -294,8 +313,9 @@ class TripForm(QWidget):
         self.planner_thread.finished.connect(self.on_planning_finished)
         self.planner_thread.error.connect(self.on_planning_error)
         
-        # Disable plan button
+        # Disable plan buttons
         self.plan_button.setEnabled(False)
+        self.resume_button.setEnabled(False)
         
         # Start planning
         self.planner_thread.start()
@@ -304,15 +324,18 @@ class TripForm(QWidget):
     def on_planning_finished(self, trip_data):
         """Handle successful trip planning."""
         self.plan_button.setEnabled(True)
+        self.resume_button.setEnabled(True)
         self.progress_dialog.close()
         self.trip_completed.emit(trip_data)
         
     def on_planning_error(self, error_msg):
         """Handle trip planning error."""
         self.plan_button.setEnabled(True)
+        self.resume_button.setEnabled(True)
         self.progress_dialog.close()
         QMessageBox.critical(
             self,
             'Error Planning Trip',
-            f'An error occurred while planning your trip:\n\n{error_msg}'
+            f'An error occurred while planning your trip:\n\n{error_msg}\n\n'
+            f'Steps that finished were saved; use Resume to continue from them.'
         )
@@ -0,0 +1,40 @@
+"""Trip planning engine and the steps shared by the CLI, the GUI and the async pipeline.
+
+The async pipeline needs aiohttp, so it is imported from
+planner.async_pipeline directly rather than re-exported here.
+"""
+
+from .stops import (
+    HOTEL_STOP_TYPES,
+    VET_STOP_TYPES,
+    ATTRACTION_STOP_TYPES,
+    build_waypoints,
+    select_stops,
+    wikivoyage_queries,
+    assign_wikivoyage_urls,
+    states_along_route,
+    dedupe_attractions,
+)
+from .engine import TripPlanner, TripRequest, TripResult, export_trip
+from .checkpoint import TripCheckpoint
+from .batch import BatchEntry, read_batch_file, run_batch
+
+__all__ = [
+    'HOTEL_STOP_TYPES',
+    'VET_STOP_TYPES',
+    'ATTRACTION_STOP_TYPES',
+    'build_waypoints',
+    'select_stops',
+    'wikivoyage_queries',
+    'assign_wikivoyage_urls',
+    'states_along_route',
+    'dedupe_attractions',
+    'TripPlanner',
+    'TripRequest',
+    'TripResult',
+    'export_trip',
+    'TripCheckpoint',
+    'BatchEntry',
+    'read_batch_file',
+    'run_batch',
+]
@@ -0,0 +1,326 @@
+"""Asyncio trip planning pipeline.
+
+Produces the same trip data as TripPlanner.plan(), but overlaps the
+work on one event loop: all geocoding at once, route scans alongside the
+city search, and every per-stop and per-state search together. Several trips
+can share one AsyncHTTPPool so per-host limits hold across all of them.
+"""
+
+import asyncio
+import threading
+from typing import List, Dict, Optional
+from services.async_services import (
+    AsyncHTTPPool, AsyncNominatimGeocoder, AsyncOSRMRouter,
+    AsyncGooglePlacesFinder, AsyncWikipediaHelper
+)
+from services.cache import ResponseCache, LocationCache
+from services.poi_store import POIStore
+from services.offline_geocoder import OfflineReverseGeocoder
+from utils.route_geometry import RouteGeometry
+from planner.stops import (
+    HOTEL_STOP_TYPES, VET_STOP_TYPES, ATTRACTION_STOP_TYPES, build_waypoints, select_stops,
+    wikivoyage_queries, assign_wikivoyage_urls, states_along_route
+)
+from config import TripConfig, LOCATION_CACHE_FILE, REVERSE_GEOCODE_CACHE_FILE
+
+# The bundled gazetteer, loaded by the first offline trip and shared by later ones
+_offline_geocoder: Optional[OfflineReverseGeocoder] = None
+_offline_geocoder_lock = threading.Lock()
+
+
+def _shared_offline_geocoder() -> OfflineReverseGeocoder:
+    global _offline_geocoder
+    with _offline_geocoder_lock:
+        if _offline_geocoder is None:
+            _offline_geocoder = OfflineReverseGeocoder()
+        return _offline_geocoder
+
+
+def _flush(*caches: LocationCache) -> None:
+    for cache in caches:
+        cache.flush()
+
+
+async def _gather_list(coroutines) -> List:
+    return list(await asyncio.gather(*coroutines))
+
+
+async def plan_trip_async(
+    origin: str,
+    destination: str,
+    via: Optional[List[str]] = None,
+    roundtrip: bool = False,
+    trip_config: Optional[TripConfig] = None,
+    api_key: str = '',
+    target_hours: int = 8,
+    waypoint_interval: int = 100,
+    places_cache: Optional[ResponseCache] = None,
+    route_cache: Optional[ResponseCache] = None,
+    poi_store: Optional[POIStore] = None,
+    location_cache: Optional[LocationCache] = None,
+    reverse_geocode_cache: Optional[LocationCache] = None,
+    offline_geocoding: bool = False,
+    offline_geocoder: Optional[OfflineReverseGeocoder] = None,
+    corridor_search: bool = False,
+    pool: Optional[AsyncHTTPPool] = None
+) -> Optional[Dict]:
+    """
+    Plan one trip with the async services.
+    
+    Args:
+        origin: Starting city (e.g., "Atlanta, GA")
+        destination: Destination city
+        via: Additional cities to visit
+        roundtrip: Return to origin on the same route
+        trip_config: Which searches to run (defaults to all)
+        api_key: Google Places API key
+        target_hours: Target driving hours between major stops
+        waypoint_interval: Miles between waypoint cities
+        places_cache: Places response cache, or None to always query
+        route_cache: Per-leg OSRM route cache, or None to always query
+        poi_store: Local POI store for already-searched areas, or None
+        location_cache: Forward geocoding cache (defaults to LOCATION_CACHE_FILE)
+        reverse_geocode_cache: Reverse geocoding cache (defaults to REVERSE_GEOCODE_CACHE_FILE)
+        offline_geocoding: Find cities along the route with the bundled gazetteer
+        offline_geocoder: Gazetteer geocoder to use (defaults to one shared by every trip)
+        corridor_search: Scan the route with Places search-along-route requests
+        pool: Shared HTTP pool; a private one is created and closed if omitted
+    
+    Returns:
+        Dict with via_cities, route_data, all_cities, major_stops, waypoint_cities,
+        hotels, waypoint_hotels, vets, attractions and route_scan_stats, or None on failure
+    """
+    # Cache files and the gazetteer are read off the event loop
+    if location_cache is None:
+        location_cache = await asyncio.to_thread(LocationCache, LOCATION_CACHE_FILE)
+    if reverse_geocode_cache is None:
+        reverse_geocode_cache = await asyncio.to_thread(LocationCache, REVERSE_GEOCODE_CACHE_FILE)
+    if offline_geocoding and offline_geocoder is None:
+        offline_geocoder = await asyncio.to_thread(_shared_offline_geocoder)
+    
+    owns_pool = pool is None
+    if owns_pool:
+        pool = AsyncHTTPPool()
+    
+    try:
+        return await _plan(
+            origin, destination, via or [], roundtrip, trip_config or TripConfig(), api_key,
+            target_hours, waypoint_interval, places_cache, route_cache, poi_store,
+            location_cache, reverse_geocode_cache, offline_geocoder if offline_geocoding else None,
+            corridor_search, pool
+        )
+    finally:
+        await asyncio.to_thread(_flush, location_cache, reverse_geocode_cache)
+        if owns_pool:
+            await pool.close()
+
+
+async def plan_trips_async(trips: List[Dict], **shared) -> List[Optional[Dict]]:
+    """
+    Plan several trips concurrently over one HTTP pool and one set of caches.
+    
+    Args:
+        trips: plan_trip_async() keyword arguments for each trip
+        **shared: Keyword arguments applied to every trip (api_key, trip_config, ...)
+    
+    Returns:
+        Trip data (or None) for each trip, in input order
+    """
+    if 'location_cache' not in shared:
+        shared['location_cache'] = await asyncio.to_thread(LocationCache, LOCATION_CACHE_FILE)
+    if 'reverse_geocode_cache' not in shared:
+        shared['reverse_geocode_cache'] = await asyncio.to_thread(LocationCache, REVERSE_GEOCODE_CACHE_FILE)
+    
+    async with AsyncHTTPPool() as pool:
+        return await _gather_list(
+            plan_trip_async(**{**shared, **trip, 'pool': pool}) for trip in trips
+        )
+
+
+async def _plan(origin, destination, via, roundtrip, trip_config, api_key, target_hours,
+                waypoint_interval, places_cache, route_cache, poi_store, location_cache, reverse_geocode_cache,
+                offline_geocoder, corridor_search, pool) -> Optional[Dict]:
+    geocoder = AsyncNominatimGeocoder(pool, cache=location_cache, reverse_cache=reverse_geocode_cache)
+    router = AsyncOSRMRouter(pool, cache=route_cache)
+    wikipedia = AsyncWikipediaHelper(pool)
+    places_finder = AsyncGooglePlacesFinder(
+        api_key, pool, cache=places_cache, wikipedia=wikipedia, corridor_search=corridor_search,
+        poi_store=poi_store
+    )
+    
+    # Geocode origin, destination and via cities together
+    print(f"📍 Geocoding locations...")
+    queries = [origin, destination] + list(via)
+    results = await _gather_list(geocoder.geocode(query) for query in queries)
+    
+    for query, result in zip(queries, results):
+        if not result:
+            print(f"Error: Could not find '{query}'")
+            return None
+    
+    (origin_lat, origin_lon, origin_display), (dest_lat, dest_lon, dest_display) = results[:2]
+    print(f"  ✓ Origin: {origin_display}")
+    print(f"  ✓ Destination: {dest_display}")
+    
+    via_cities = []
+    for via_city, (via_lat, via_lon, via_display) in zip(via, results[2:]):
+        via_cities.append({
+            'name': via_city,
+            'lat': via_lat,
+            'lon': via_lon,
+            'display': via_display
+        })
+        print(f"  ✓ Via: {via_display}")
+    print()
+    
+    # Calculate route
+    print(f"🛣️  Calculating route...")
+    waypoints = build_waypoints((origin_lat, origin_lon), (dest_lat, dest_lon), via_cities, roundtrip)
+    route_data = await router.get_route(waypoints)
+    
+    if not route_data['success']:
+        print(f"Error: Could not calculate route: {route_data.get('error')}")
+        return None
+    
+    total_distance_mi = route_data['distance_m'] / 1609.34
+    total_duration_h = route_data['duration_s'] / 3600
+    print(f"  ✓ Total distance: {total_distance_mi:.1f} miles")
+    print(f"  ✓ Estimated driving time: {int(total_duration_h)}h {int((total_duration_h % 1) * 60)}m")
+    print()
+    
+    # Route scans only need the geometry, so start them before the city search
+    route = RouteGeometry.from_route(route_data)
+    route_categories = [
+        category for category, enabled in (
+            ('parks', trip_config.search_parks),
+            ('viewpoints', trip_config.search_viewpoints),
+            ('ev_chargers', trip_config.search_ev_chargers),
+        ) if enabled
+    ]
+    route_scan = asyncio.ensure_future(places_finder.scan_route(route, route_categories))
+    
+    # Cancel the scan if anything below fails, so it doesn't outlive the trip
+    try:
+        # Find all cities along the route
+        print(f"📍 Finding cities along route...")
+        city_geocoder = geocoder
+        if offline_geocoder is not None and offline_geocoder.available:
+            city_geocoder = offline_geocoder
+        all_cities = await router.find_cities_along_route(route_data, city_geocoder, route=route)
+        print(f"✓ Found {len(all_cities)} cities along route")
+        print()
+        
+        # Select strategic stop cities based on driving hours
+        print(f"🎯 Selecting major stop cities (~{target_hours} hours of driving apart)...")
+        major_stops, waypoint_cities = select_stops(
+            {'name': origin, 'lat': origin_lat, 'lon': origin_lon},
+            {'name': destination, 'lat': dest_lat, 'lon': dest_lon},
+            via_cities,
+            roundtrip,
+            all_cities,
+            target_hours,
+            waypoint_interval,
+            route=route
+        )
+        print()
+        
+        # Everything below depends only on the stops, so it all runs at once
+        hotel_stops = [stop for stop in major_stops if stop['type'] in HOTEL_STOP_TYPES] if trip_config.search_hotels else []
+        hotel_cities = hotel_stops + (waypoint_cities if trip_config.search_hotels else [])
+        vet_stops = [stop for stop in major_stops if stop['type'] in VET_STOP_TYPES] if trip_config.search_vets else []
+        state_names = []
+        if trip_config.search_national_parks or trip_config.search_monuments:
+            state_names = states_along_route(all_cities, major_stops)
+        
+        city_categories = []
+        if trip_config.search_parks:
+            city_categories.append(('parks', places_finder.find_parks_nearby, 3))
+        if trip_config.search_museums:
+            city_categories.append(('museums', places_finder.find_museums_in_city, 3))
+        if trip_config.search_restaurants:
+            city_categories.append(('restaurants', places_finder.find_dog_friendly_restaurants, 5))
+        if trip_config.search_dog_parks:
+            city_categories.append(('dog_parks', places_finder.find_dog_parks_in_city, 2))
+        if trip_config.search_ev_chargers:
+            city_categories.append(('ev_chargers', places_finder.find_ev_chargers_in_city, 3))
+        attraction_stops = [stop for stop in major_stops if stop['type'] in ATTRACTION_STOP_TYPES]
+        city_searches = [
+            (category, stop, search)
+            for stop in attraction_stops
+            for category, search, _ in city_categories
+        ]
+        limits = {category: limit for category, _, limit in city_categories}
+        
+        print(f"🔎 Searching hotels, vets and attractions...")
+        wikivoyage_urls, hotel_results, vet_results, national_parks, monuments, city_results = await asyncio.gather(
+            _gather_list(wikipedia.search_wikivoyage(query) for query in wikivoyage_queries(major_stops)),
+            _gather_list(
+                places_finder.find_pet_friendly_hotel(
+                    city['name'], city['lat'], city['lon'], pet_friendly_only=trip_config.pet_friendly_only
+                )
+                for city in hotel_cities
+            ),
+            _gather_list(places_finder.find_emergency_vet(stop['name'], stop['lat'], stop['lon']) for stop in vet_stops),
+            _gather_list(
+                places_finder.find_national_parks_by_state(name)
+                for name in (state_names if trip_config.search_national_parks else [])
+            ),
+            _gather_list(
+                places_finder.find_monuments_by_state(name)
+                for name in (state_names if trip_config.search_monuments else [])
+            ),
+            _gather_list(
+                search(stop['name'], stop['lat'], stop['lon'], limit=limits[category])
+                for category, stop, search in city_searches
+            )
+        )
+        route_attractions = await route_scan
+    finally:
+        if not route_scan.done():
+            route_scan.cancel()
+    
+    assign_wikivoyage_urls(major_stops, wikivoyage_urls)
+    
+    hotels = {}
+    waypoint_hotels = {}
+    for city, hotel in zip(hotel_cities, hotel_results):
+        if hotel:
+            target = hotels if city['is_major_stop'] else waypoint_hotels
+            target[city['name']] = hotel
+    
+    vets = {stop['name']: vet for stop, vet in zip(vet_stops, vet_results) if vet}
+    
+    # Assemble in the same order as the sequential planner
+    all_attractions = {
+        'parks': [],
+        'museums': [],
+        'restaurants': [],
+        'dog_parks': [],
+        'viewpoints': [],
+        'national_parks': [],
+        'monuments': [],
+        'ev_chargers': []
+    }
+    for parks in national_parks:
+        all_attractions['national_parks'].extend(parks)
+    for state_monuments in monuments:
+        all_attractions['monuments'].extend(state_monuments)
+    for category, attractions in route_attractions.items():
+        all_attractions[category].extend(attractions)
+    for (category, _, _), results in zip(city_searches, city_results):
+        all_attractions[category].extend(results)
+    
+    print(f"  ✓ {len(hotels) + len(waypoint_hotels)} hotels, {len(vets)} vets")
+    
+    return {
+        'via_cities': via_cities,
+        'route_data': route_data,
+        'all_cities': all_cities,
+        'major_stops': major_stops,
+        'waypoint_cities': waypoint_cities,
+        'hotels': hotels,
+        'waypoint_hotels': waypoint_hotels,
+        'vets': vets,
+        'attractions': all_attractions,
+        'route_scan_stats': dict(places_finder.route_scan_stats)
+    }
@@ -0,0 +1,251 @@
+"""Batch planning: many trips from a JSONL file through one warm TripPlanner.
+
+Each input line is a JSON object describing one trip:
+
+    {"origin": "Atlanta, GA", "destination": "Denver, CO", "via": ["Nashville, TN"],
+     "target_hours": 6, "search_museums": false, "id": "spring-break"}
+
+origin and destination are required. via, roundtrip, target_hours,
+waypoint_interval and offline_geocoding override the batch defaults, any
+TripConfig field (search_*, pet_friendly_only, export_*) overrides the batch
+config, and an optional id is copied to the trip's result line.
+"""
+
+import json
+import multiprocessing
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from planner.checkpoint import TripCheckpoint
+from planner.engine import TripPlanner, TripRequest, TripResult, export_trip
+from config import TripConfig
+
+REQUEST_FIELDS = ('via', 'roundtrip', 'target_hours', 'waypoint_interval', 'offline_geocoding')
+CONFIG_FIELDS = tuple(f.name for f in fields(TripConfig))
+
+
+@dataclass
+class BatchEntry:
+    """One input line: the trip to plan, or why the line couldn't be read."""
+    
+    line: int
+    trip_id: Optional[str] = None
+    request: Optional[TripRequest] = None
+    error: Optional[str] = None
+
+
+def batch_request(data: Dict, defaults: TripRequest) -> TripRequest:
+    """
+    Build the TripRequest for one batch line (raises ValueError if it is invalid).
+    
+    Args:
+        data: The line's JSON object
+        defaults: Request whose route options and config apply where the line is silent
+    
+    Returns:
+        TripRequest for the line
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Each line must be a JSON object")
+    unknown = [key for key in data if key not in ('id', 'origin', 'destination') + REQUEST_FIELDS + CONFIG_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if not data.get('origin') or not data.get('destination'):
+        raise ValueError("origin and destination are required")
+    
+    via = data.get('via', defaults.via)
+    if isinstance(via, str):
+        via = [via]
+    roundtrip = data.get('roundtrip', defaults.roundtrip)
+    if via and roundtrip:
+        raise ValueError("Cannot use both via and roundtrip")
+    
+    return TripRequest(
+        origin=data['origin'],
+        destination=data['destination'],
+        via=list(via),
+        roundtrip=roundtrip,
+        target_hours=data.get('target_hours', defaults.target_hours),
+        waypoint_interval=data.get('waypoint_interval', defaults.waypoint_interval),
+        config=replace(defaults.config, **{key: data[key] for key in CONFIG_FIELDS if key in data}),
+        offline_geocoding=data.get('offline_geocoding', defaults.offline_geocoding)
+    )
+
+
+def read_batch_file(path: Path, defaults: TripRequest) -> List[BatchEntry]:
+    """
+    Read every trip in a JSONL batch file (blank lines and # comments are skipped).
+    
+    Args:
+        path: Batch file
+        defaults: Request whose route options and config apply where a line is silent
+    
+    Returns:
+        One BatchEntry per trip line, with error set for lines that couldn't be parsed
+    """
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            entry = BatchEntry(line=line_number)
+            try:
+                data = json.loads(line)
+                if isinstance(data, dict) and data.get('id') is not None:
+                    entry.trip_id = str(data['id'])
+                entry.request = batch_request(data, defaults)
+            except json.JSONDecodeError as e:
+                entry.error = f"Invalid JSON: {e}"
+            except (ValueError, TypeError) as e:
+                entry.error = str(e)
+            entries.append(entry)
+    return entries
+
+
+def batch_record(entry: BatchEntry, result: Optional[TripResult], elapsed_s: float) -> Dict:
+    """One output line: the trip, whether it succeeded and a summary of what was found."""
+    request = entry.request
+    record = {
+        'line': entry.line,
+        'id': entry.trip_id,
+        'origin': request.origin if request else None,
+        'destination': request.destination if request else None,
+        'via': request.via if request else [],
+        'success': result is not None and result.success,
+        'error': entry.error if result is None else result.error,
+        'elapsed_s': round(elapsed_s, 2)
+    }
+    if result is not None and result.success:
+        record.update({
+            'total_distance_miles': round(result.total_distance_mi, 1),
+            'total_duration_hours': round(result.total_duration_h, 1),
+            'major_stops': [stop['name'] for stop in result.major_stops],
+            'hotels': len(result.hotels) + len(result.waypoint_hotels),
+            'vets': len(result.vets),
+            'attractions': {category: len(items) for category, items in result.attractions.items()},
+            'output_files': result.output_files
+        })
+    return record
+
+
+def batch_output_base(entry: BatchEntry) -> str:
+    """
+    Base file name for a batch trip's exports.
+    
+    Lines can differ only in their options, so the trip's id (or its line number)
+    is added to the request's output_base to keep their exports apart.
+    """
+    suffix = re.sub(r'[^A-Za-z0-9_-]+', '_', entry.trip_id) if entry.trip_id else f"line{entry.line}"
+    return f"{entry.request.output_base}_{suffix}"
+
+
+def export_quietly(payload: TripResult, output_dir: Path, output_base: Optional[str] = None) -> Dict[str, str]:
+    """Export a trip without progress lines (the export worker process entry point)."""
+    return export_trip(payload, output_dir, log=lambda line: None, output_base=output_base)
+
+
+def run_batch(planner: TripPlanner, entries: List[BatchEntry], output_path: Path, output_dir: Path,
+              jobs: int = 1, export_processes: int = 0, resume: bool = False,
+              log: Callable[[str], None] = print) -> Dict[str, float]:
+    """
+    Plan and export every trip, streaming one result line per trip as it finishes.
+    
+    Trips share the planner's clients, caches and worker pool (and the process-wide
+    rate limits), so up to `jobs` trips run at once without exceeding them. A trip
+    that fails, or whose line couldn't be parsed, is written as a failure and the
+    batch carries on.
+    
+    Map, GPX and summary rendering is CPU-bound and holds the GIL, so with
+    export_processes the exports run in a process pool instead: each planned
+    trip's export_payload() is sent to a worker and its thread moves straight on
+    to the next trip's network stages.
+    
+    Args:
+        planner: Planner to run every trip through
+        entries: Trips from read_batch_file
+        output_path: JSONL file for the result lines (overwritten)
+        output_dir: Directory for each trip's exports (named by batch_output_base)
+        jobs: Trips planned concurrently
+        export_processes: Worker processes for exports (0 = export on the trip's thread)
+        resume: Continue each trip from its checkpoint (see TripPlanner.plan)
+        log: Receives one line per finished trip
+    
+    Returns:
+        Aggregate counts and timings: trips, succeeded, failed, wall_s, trip_s (summed per-trip time)
+    """
+    stats = {'trips': len(entries), 'succeeded': 0, 'failed': 0, 'wall_s': 0.0, 'trip_s': 0.0}
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    quiet = lambda line: None
+    start = time.perf_counter()
+    
+    def plan_one(entry: BatchEntry):
+        trip_start = time.perf_counter()
+        if entry.request is None:
+            return entry, None, trip_start
+        try:
+            result = planner.plan(entry.request, progress=quiet, resume=resume)
+            if result.success and not export_processes:
+                planner.export(result, output_dir, progress=quiet, output_base=batch_output_base(entry))
+        except Exception as e:
+            result = TripResult.failed(entry.request, f"{type(e).__name__}: {e}")
+        return entry, result, trip_start
+    
+    def finish(entry: BatchEntry, result: Optional[TripResult], elapsed_s: float):
+        record = batch_record(entry, result, elapsed_s)
+        out.write(json.dumps(record) + '\n')
+        out.flush()
+        
+        stats['trip_s'] += elapsed_s
+        done = stats['succeeded'] + stats['failed'] + 1
+        label = entry.trip_id or f"line {entry.line}"
+        if record['success']:
+            stats['succeeded'] += 1
+            log(f"  ✓ [{done}/{len(entries)}] {label}: {entry.request.trip_name} - "
+                f"{record['total_distance_miles']} mi, {len(record['major_stops'])} stops, "
+                f"{sum(record['attractions'].values())} attractions ({elapsed_s:.1f}s)")
+        else:
+            stats['failed'] += 1
+            log(f"  ✗ [{done}/{len(entries)}] {label}: {record['error']}")
+    
+    # Spawned rather than forked: the parent is full of threads and open SQLite connections
+    processes = (
+        ProcessPoolExecutor(max_workers=export_processes, mp_context=multiprocessing.get_context('spawn'))
+        if export_processes else None
+    )
+    with open(output_path, 'w', encoding='utf-8') as out, \
+            ThreadPoolExecutor(max_workers=max(jobs, 1), thread_name_prefix='trip') as threads:
+        try:
+            # Future -> (entry, result being exported or None while planning, trip start)
+            pending = {threads.submit(plan_one, entry): (entry, None, None) for entry in entries}
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    entry, exporting, trip_start = pending.pop(future)
+                    if exporting is None:
+                        entry, result, trip_start = future.result()
+                        if processes is not None and result is not None and result.success:
+                            pending[processes.submit(export_quietly, result.export_payload(), output_dir,
+                                                     batch_output_base(entry))] = (
+                                entry, result, trip_start
+                            )
+                            continue
+                    else:
+                        result = exporting
+                        try:
+                            result.output_files = future.result()
+                            TripCheckpoint.for_request(entry.request).clear()
+                        except Exception as e:
+                            result = TripResult.failed(entry.request, f"Export failed: {type(e).__name__}: {e}")
+                    elapsed_s = time.perf_counter() - trip_start if result is not None else 0.0
+                    finish(entry, result, elapsed_s)
+        finally:
+            if processes is not None:
+                processes.shutdown()
+    
+    stats['wall_s'] = time.perf_counter() - start
+    return stats
@@ -0,0 +1,87 @@
+"""Per-trip checkpoints of finished pipeline stages, so an interrupted plan can resume."""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from config import CHECKPOINT_DIR
+
+
+class TripCheckpoint:
+    """
+    File holding the result and log lines of every stage a trip's plan has finished.
+    
+    The file is rewritten (atomically) as each stage finishes, so a crash or a
+    closed window loses at most the stages that were still running. Its name
+    includes a hash of the whole request, so changing any option starts afresh
+    instead of resuming from results planned for different settings.
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Checkpoint file (created on the first save)
+        """
+        self.path = Path(path)
+        self._stages: Dict[str, Tuple[Any, List[str]]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def for_request(cls, request, directory: Path = Path(CHECKPOINT_DIR)) -> 'TripCheckpoint':
+        """
+        Checkpoint of a TripRequest.
+        
+        Args:
+            request: TripRequest being planned
+            directory: Directory holding checkpoint files
+        
+        Returns:
+            TripCheckpoint (whether or not its file exists yet)
+        """
+        key = hashlib.sha1(json.dumps(asdict(request), sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        return cls(Path(directory) / f"{request.output_base}_{key}.pkl")
+    
+    def completed(self) -> Dict[str, Tuple[Any, List[str]]]:
+        """Finished stages as {name: (result, log_lines)}; empty if there's no usable file."""
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                if self.path.exists():
+                    try:
+                        with open(self.path, 'rb') as f:
+                            self._stages = pickle.load(f)
+                    except Exception as e:
+                        print(f"Warning: Ignoring unreadable checkpoint {self.path}: {e}")
+                        self._stages = {}
+            return dict(self._stages)
+    
+    def save(self, name: str, result: Any, log_lines: List[str]) -> None:
+        """Record a finished stage and rewrite the file."""
+        with self._lock:
+            self._stages[name] = (result, log_lines)
+            self._loaded = True
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.path.with_suffix('.tmp')
+                with open(temp_path, 'wb') as f:
+                    pickle.dump(self._stages, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, self.path)
+            except (OSError, pickle.PicklingError) as e:
+                print(f"Warning: Could not save checkpoint {self.path}: {e}")
+    
+    def clear(self) -> None:
+        """Forget every stage and delete the file."""
+        with self._lock:
+            self._stages = {}
+            self._loaded = True
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Warning: Could not remove checkpoint {self.path}: {e}")
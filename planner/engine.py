@@ -0,0 +1,1064 @@
+"""Trip planning engine shared by the CLI and the GUI.
+
+TripPlanner owns the service clients, caches and worker pool and turns a
+TripRequest into a TripResult; the front ends only collect options, report
+progress and show or save the result.
+"""
+
+import asyncio
+import json
+import threading
+import numpy as np
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from services import (
+    WikipediaHelper, NominatimGeocoder, OSRMRouter, GooglePlacesFinder,
+    ResponseCache, LocationCache, OfflineReverseGeocoder, POIStore
+)
+from utils import create_trip_map, create_gpx_file, OrderedFanOut, StageGraph, StageError, RouteGeometry
+from planner.checkpoint import TripCheckpoint
+from planner.incremental import leg_key, previous_legs, previous_stop_results, kept_route_attractions
+from planner.stops import (
+    HOTEL_STOP_TYPES, VET_STOP_TYPES, ATTRACTION_STOP_TYPES, build_waypoints, select_stops,
+    wikivoyage_queries, assign_wikivoyage_urls, states_along_route, dedupe_attractions
+)
+from config import (
+    TripConfig, LOCATION_CACHE_FILE, REVERSE_GEOCODE_CACHE_FILE, PLACES_CACHE_FILE,
+    PLACES_CACHE_MAX_ENTRIES, PLACES_CACHE_TTL, DEFAULT_PLACES_WORKERS, POI_STORE_FILE,
+    ROUTE_CACHE_FILE, ROUTE_CACHE_MAX_ENTRIES, ROUTE_CACHE_TTL
+)
+
+ATTRACTION_CATEGORIES = [
+    'parks', 'museums', 'restaurants', 'dog_parks', 'viewpoints', 'national_parks', 'monuments', 'ev_chargers'
+]
+
+
+def _runs(indices: Iterable[int]) -> List[Tuple[int, int]]:
+    """Group sorted indices into (first, last) runs of consecutive values."""
+    runs = []
+    for i in indices:
+        if runs and runs[-1][1] == i - 1:
+            runs[-1] = (runs[-1][0], i)
+        else:
+            runs.append((i, i))
+    return runs
+
+
+@dataclass
+class TripRequest:
+    """One trip to plan: the route and what to search for along it."""
+    
+    origin: str
+    destination: str
+    via: List[str] = field(default_factory=list)
+    roundtrip: bool = False
+    target_hours: int = 8
+    waypoint_interval: int = 100
+    config: TripConfig = field(default_factory=TripConfig)
+    offline_geocoding: bool = False
+    
+    @property
+    def trip_name(self) -> str:
+        """Title used on the map, GPX file and summary."""
+        trip_name = f"Road Trip: {self.origin} → {self.destination}"
+        if self.via:
+            for via in self.via:
+                trip_name += f" → {via}"
+            trip_name += f" → {self.origin}"
+        elif self.roundtrip:
+            trip_name += f" → {self.origin}"
+        return trip_name
+    
+    @property
+    def output_base(self) -> str:
+        """Base file name (without extension) for the trip's exports."""
+        if self.via:
+            via_names = '_'.join([via.replace(', ', '_').replace(' ', '_') for via in self.via])
+            output_base = f"trip_{self.origin.replace(', ', '_')}_{self.destination.replace(', ', '_')}_via_{via_names}"
+        else:
+            output_base = f"trip_{self.origin.replace(', ', '_')}_{self.destination.replace(', ', '_')}"
+        return output_base.replace(' ', '_')
+
+
+@dataclass
+class TripResult:
+    """A planned trip, or the reason planning failed (success/error, like OSRMRouter.get_route)."""
+    
+    request: TripRequest
+    success: bool = True
+    error: Optional[str] = None
+    via_cities: List[Dict] = field(default_factory=list)
+    route_data: Optional[Dict] = None
+    all_cities: List[Dict] = field(default_factory=list)
+    major_stops: List[Dict] = field(default_factory=list)
+    waypoint_cities: List[Dict] = field(default_factory=list)
+    hotels: Dict = field(default_factory=dict)
+    waypoint_hotels: Dict = field(default_factory=dict)
+    vets: Dict = field(default_factory=dict)
+    attractions: Dict[str, List] = field(default_factory=dict)
+    route_scan_stats: Dict[str, int] = field(default_factory=dict)
+    output_files: Dict[str, str] = field(default_factory=dict)
+    # (start, end) seconds from the start of planning, by pipeline stage
+    stage_timings: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+    restored_stages: List[str] = field(default_factory=list)
+    # Per-part results kept for re-planning an edited trip (see planner.incremental)
+    waypoints: List[Tuple[float, float]] = field(default_factory=list)
+    leg_bounds: List[int] = field(default_factory=list)
+    route_attractions: Dict[str, List] = field(default_factory=dict)
+    state_attractions: Dict[str, Dict[str, List]] = field(default_factory=dict)
+    stop_attractions: Dict[str, Dict[str, List]] = field(default_factory=dict)
+    
+    @classmethod
+    def failed(cls, request: TripRequest, error: str) -> 'TripResult':
+        return cls(request=request, success=False, error=error)
+    
+    @property
+    def total_distance_mi(self) -> float:
+        return self.route_data['distance_m'] / 1609.34
+    
+    @property
+    def total_duration_h(self) -> float:
+        return self.route_data['duration_s'] / 3600
+    
+    def to_dict(self) -> Dict:
+        """Trip data as written to the _data.json export."""
+        config = self.request.config
+        return {
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'origin': self.request.origin,
+            'destination': self.request.destination,
+            'via_cities': [via['name'] for via in self.via_cities] if self.via_cities else None,
+            'roundtrip': self.request.roundtrip,
+            'total_distance_miles': round(self.total_distance_mi, 1),
+            'total_duration_hours': round(self.total_duration_h, 1),
+            'major_stops': self.major_stops,
+            'waypoint_cities': self.waypoint_cities,
+            'hotels': {city: asdict(hotel) for city, hotel in self.hotels.items()},
+            'waypoint_hotels': {city: asdict(hotel) for city, hotel in self.waypoint_hotels.items()},
+            'vets': {city: asdict(vet) for city, vet in self.vets.items()},
+            'attractions': {
+                category: [asdict(a) for a in self.attractions[category]]
+                for category in ('national_parks', 'monuments', 'parks', 'museums',
+                                 'restaurants', 'dog_parks', 'viewpoints', 'ev_chargers')
+            },
+            'config': {
+                'search_hotels': config.search_hotels,
+                'pet_friendly_only': config.pet_friendly_only,
+                'search_vets': config.search_vets,
+                'search_national_parks': config.search_national_parks,
+                'search_monuments': config.search_monuments,
+                'search_parks': config.search_parks,
+                'search_museums': config.search_museums,
+                'search_restaurants': config.search_restaurants,
+                'search_dog_parks': config.search_dog_parks,
+                'search_viewpoints': config.search_viewpoints,
+                'search_ev_chargers': config.search_ev_chargers
+            }
+        }
+    
+    def export_payload(self) -> 'TripResult':
+        """
+        Copy holding only what export_trip reads, for sending to an export worker process.
+        
+        Drops the cities along the route, the run statistics and everything in the
+        OSRM response but the totals and geometry (legs, steps), which can be larger
+        than the rest of the trip together.
+        """
+        route_data = {
+            key: self.route_data[key] for key in ('success', 'distance_m', 'duration_s', 'geometry')
+        }
+        return replace(
+            self, all_cities=[], route_data=route_data, route_scan_stats={}, stage_timings={}, critical_path=[],
+            restored_stages=[], waypoints=[], leg_bounds=[], route_attractions={}, state_attractions={},
+            stop_attractions={}
+        )
+
+
+class TripPlanner:
+    """
+    Plans trips end to end: geocoding, routing, stop selection and every Places search.
+    
+    Service clients, caches and the worker pool are created once and reused by
+    every plan() call, so a long-lived planner (the GUI, batch runs) stays warm.
+    Per-host rate limits live in services.rate_limiter and are process-wide, so
+    they also hold across several planners.
+    """
+    
+    def __init__(self, api_key: str, use_cache: bool = True, workers: int = DEFAULT_PLACES_WORKERS,
+                 corridor_search: bool = False, progress: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            api_key: Google Places API key
+            use_cache: Reuse cached Places responses, route legs and the local POI store
+            workers: Concurrent Google Places searches (1 = sequential)
+            corridor_search: Scan routes with Places search-along-route requests
+            progress: Called with each progress line (defaults to print)
+        """
+        self.api_key = api_key
+        self.corridor_search = corridor_search
+        self.progress = progress or print
+        
+        self.location_cache = LocationCache(LOCATION_CACHE_FILE)
+        self.reverse_geocode_cache = LocationCache(REVERSE_GEOCODE_CACHE_FILE)
+        self.places_cache = None
+        self.route_cache = None
+        self.poi_store = None
+        if use_cache:
+            self.places_cache = ResponseCache(
+                PLACES_CACHE_FILE,
+                max_entries=PLACES_CACHE_MAX_ENTRIES,
+                ttls=PLACES_CACHE_TTL
+            )
+            self.route_cache = ResponseCache(
+                ROUTE_CACHE_FILE,
+                max_entries=ROUTE_CACHE_MAX_ENTRIES,
+                default_ttl=ROUTE_CACHE_TTL
+            )
+            self.poi_store = POIStore(POI_STORE_FILE, ttls=PLACES_CACHE_TTL)
+        
+        self.geocoder = NominatimGeocoder(cache=self.location_cache, reverse_cache=self.reverse_geocode_cache)
+        # Gazetteer for offline city lookups, loaded by the first plan that asks for it
+        self._offline_geocoder: Optional[OfflineReverseGeocoder] = None
+        self._offline_geocoder_lock = threading.Lock()
+        self.router = OSRMRouter(cache=self.route_cache)
+        self.places_finder = GooglePlacesFinder(
+            api_key, cache=self.places_cache, corridor_search=corridor_search, poi_store=self.poi_store
+        )
+        
+        # Independent Places searches run on a bounded pool; results are gathered
+        # in submission order so output stays deterministic
+        self.fan_out = OrderedFanOut(workers)
+    
+    @property
+    def offline_geocoder(self) -> OfflineReverseGeocoder:
+        """Gazetteer geocoder (falling back to Nominatim), shared by every plan."""
+        with self._offline_geocoder_lock:
+            if self._offline_geocoder is None:
+                self._offline_geocoder = OfflineReverseGeocoder(fallback=self.geocoder)
+            return self._offline_geocoder
+    
+    def flush_caches(self) -> None:
+        """Write geocoding results still held in memory to the location cache files."""
+        self.location_cache.flush()
+        self.reverse_geocode_cache.flush()
+    
+    def close(self) -> None:
+        """Save the location caches and release the worker threads."""
+        self.flush_caches()
+        self.fan_out.shutdown()
+    
+    def __enter__(self) -> 'TripPlanner':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def plan(self, request: TripRequest, progress: Optional[Callable[[str], None]] = None,
+             resume: bool = False, previous: Optional[TripResult] = None) -> TripResult:
+        """
+        Geocode, route and run every search for a trip.
+        
+        The steps run as a stage graph: searches that only need the route (route
+        scans) or the stops (hotels, vets, state and city attractions) overlap
+        instead of waiting for each other. Progress lines still come out in
+        pipeline order.
+        
+        Each finished stage is saved to the trip's checkpoint, which export()
+        removes once the files are written. With resume, stages found in the
+        checkpoint are restored instead of run again.
+        
+        Given the previous result of an edited trip, only what the edit changed
+        is looked up again: legs between new waypoints are routed and scanned,
+        and stops, states and categories that are new are searched; the rest
+        is carried over (see planner.incremental).
+        
+        Args:
+            request: Trip to plan
+            progress: Progress callback for this plan (defaults to the planner's)
+            resume: Continue from the trip's checkpoint instead of starting over
+            previous: Earlier result to reuse unchanged parts of
+        
+        Returns:
+            TripResult; success is False (with error set) if geocoding or routing failed
+        """
+        log = progress or self.progress
+        trip_config = request.config
+        scan_stats_before = dict(self.places_finder.route_scan_stats)
+        checkpoint = TripCheckpoint.for_request(request)
+        if not resume:
+            checkpoint.clear()
+        elif checkpoint.completed():
+            log(f"↻ Resuming from checkpoint: {', '.join(checkpoint.completed())} already done")
+            log('')
+        
+        if previous is not None and not previous.success:
+            previous = None
+        
+        graph = StageGraph(log)
+        graph.add('geocode', lambda results, log: self._geocode(request, log))
+        graph.add('route', lambda results, log: self._route(request, results['geocode'], log, previous),
+                  deps=['geocode'])
+        graph.add('cities', lambda results, log: self._find_cities(request, results['route'], log), deps=['route'])
+        graph.add('stops', lambda results, log: self._select_stops(
+            request, results['geocode'], results['route'], results['cities'], log
+        ), deps=['geocode', 'route', 'cities'])
+        graph.add('wikivoyage', lambda results, log: self._find_wikivoyage_urls(results['stops'][0], previous),
+                  deps=['stops'])
+        graph.add('hotels', lambda results, log: self._find_hotels(trip_config, results['stops'], log, previous),
+                  deps=['stops'])
+        graph.add('vets', lambda results, log: self._find_vets(trip_config, results['stops'][0], log, previous),
+                  deps=['stops'])
+        graph.add('state_attractions', lambda results, log: self._find_state_attractions(
+            trip_config, results['cities'], results['stops'][0], log, previous
+        ), deps=['cities', 'stops'])
+        graph.add('route_scan', lambda results, log: self._scan_route(trip_config, results['route'], log, previous),
+                  deps=['route'])
+        graph.add('city_attractions', lambda results, log: self._find_city_attractions(
+            trip_config, results['stops'][0], log, previous
+        ), deps=['stops'])
+        
+        try:
+            # With one worker the stages run one at a time too, keeping --workers 1 fully sequential
+            results = graph.run(max_workers=1 if self.fan_out.max_workers <= 1 else None, checkpoint=checkpoint)
+        except StageError as e:
+            return self._failed(request, str(e), log)
+        finally:
+            self.flush_caches()
+        
+        # Flatten in pipeline order: state searches, route scans, then stop searches
+        all_attractions = {category: [] for category in ATTRACTION_CATEGORIES}
+        for found in results['state_attractions'].values():
+            for category, attractions in found.items():
+                all_attractions[category].extend(attractions)
+        for category, attractions in results['route_scan'].items():
+            all_attractions[category].extend(attractions)
+        for found in results['city_attractions'].values():
+            for category, attractions in found.items():
+                all_attractions[category].extend(attractions)
+        dedupe_attractions(all_attractions)
+        
+        major_stops, waypoint_cities = results['stops']
+        # Applied only now: the stops are shared with (and checkpointed by) other stages
+        assign_wikivoyage_urls(major_stops, results['wikivoyage'])
+        hotels, waypoint_hotels = results['hotels']
+        scan_stats = {
+            key: value - scan_stats_before.get(key, 0)
+            for key, value in self.places_finder.route_scan_stats.items()
+        }
+        return TripResult(
+            request=request,
+            via_cities=results['geocode']['via_cities'],
+            route_data=results['route']['route_data'],
+            all_cities=results['cities'],
+            major_stops=major_stops,
+            waypoint_cities=waypoint_cities,
+            hotels=hotels,
+            waypoint_hotels=waypoint_hotels,
+            vets=results['vets'],
+            attractions=all_attractions,
+            route_scan_stats=scan_stats,
+            stage_timings=dict(graph.timings),
+            critical_path=graph.critical_path(),
+            restored_stages=list(graph.restored),
+            waypoints=results['route']['waypoints'],
+            leg_bounds=results['route']['leg_bounds'],
+            route_attractions=results['route_scan'],
+            state_attractions=results['state_attractions'],
+            stop_attractions=results['city_attractions']
+        )
+    
+    # Pipeline stages (see plan()); each logs through the log it is given
+    
+    def _geocode(self, request: TripRequest, log: Callable[[str], None]) -> Dict:
+        """Geocode origin, destination and via cities (raises StageError if one isn't found)."""
+        log(f"📍 Geocoding locations...")
+        origin_result = self.geocoder.geocode(request.origin)
+        if not origin_result:
+            raise StageError(f"Could not find '{request.origin}'")
+        
+        origin_lat, origin_lon, origin_display = origin_result
+        log(f"  ✓ Origin: {origin_display}")
+        
+        dest_result = self.geocoder.geocode(request.destination)
+        if not dest_result:
+            raise StageError(f"Could not find '{request.destination}'")
+        
+        dest_lat, dest_lon, dest_display = dest_result
+        log(f"  ✓ Destination: {dest_display}")
+        
+        # Geocode optional via cities
+        via_cities = []
+        for via_city in request.via:
+            via_result = self.geocoder.geocode(via_city)
+            if not via_result:
+                raise StageError(f"Could not find '{via_city}'")
+            via_lat, via_lon, via_display = via_result
+            via_cities.append({
+                'name': via_city,
+                'lat': via_lat,
+                'lon': via_lon,
+                'display': via_display
+            })
+            log(f"  ✓ Via: {via_display}")
+        log('')
+        
+        return {
+            'origin': {'name': request.origin, 'lat': origin_lat, 'lon': origin_lon},
+            'destination': {'name': request.destination, 'lat': dest_lat, 'lon': dest_lon},
+            'via_cities': via_cities
+        }
+    
+    def _route(self, request: TripRequest, places: Dict, log: Callable[[str], None],
+               previous: Optional[TripResult] = None) -> Dict:
+        """
+        Calculate the route (raises StageError if OSRM fails).
+        
+        Legs the previous result already routed between the same waypoints are
+        reused; the router looks up or fetches the rest (see get_route_legs).
+        
+        Returns:
+            Dict with route_data, route (RouteGeometry), waypoints, leg_bounds
+            and changed_legs (True for each leg the previous result didn't have)
+        """
+        log(f"🛣️  Calculating route...")
+        origin = places['origin']
+        destination = places['destination']
+        via_cities = places['via_cities']
+        waypoints = build_waypoints(
+            (origin['lat'], origin['lon']), (destination['lat'], destination['lon']), via_cities, request.roundtrip
+        )
+        
+        known_legs = previous_legs(previous)
+        route_data, leg_bounds = self.router.get_route_legs(waypoints, known_legs)
+        changed_legs = [leg_key(start, end) not in known_legs for start, end in zip(waypoints, waypoints[1:])]
+        if known_legs:
+            log(f"  ♻ Reused {changed_legs.count(False)} of {len(changed_legs)} legs from the previous plan")
+        
+        if not route_data['success']:
+            raise StageError(f"Could not calculate route: {route_data.get('error')}")
+        
+        # Segment lengths and chainage, shared by the city search and every route scan
+        route = RouteGeometry.from_route(route_data)
+        
+        total_distance_mi = route_data['distance_m'] / 1609.34
+        total_duration_h = route_data['duration_s'] / 3600
+        
+        log(f"  ✓ Total distance: {total_distance_mi:.1f} miles")
+        log(f"  ✓ Estimated driving time: {int(total_duration_h)}h {int((total_duration_h % 1) * 60)}m")
+        if via_cities:
+            route_str = f"{request.origin} → {request.destination}"
+            for via in via_cities:
+                route_str += f" → {via['name']}"
+            route_str += f" → {request.origin}"
+            log(f"  ✓ Route: {route_str}")
+        elif request.roundtrip:
+            log(f"  ✓ Route: {request.origin} → {request.destination} → {request.origin} (same way back)")
+        log('')
+        return {
+            'route_data': route_data,
+            'route': route,
+            'waypoints': waypoints,
+            'leg_bounds': leg_bounds,
+            'changed_legs': changed_legs
+        }
+    
+    def _find_cities(self, request: TripRequest, routed: Dict, log: Callable[[str], None]) -> List[Dict]:
+        route_data = routed['route_data']
+        route = routed['route']
+        log(f"📍 Finding cities along route...")
+        if request.offline_geocoding:
+            all_cities = self.router.find_cities_along_route(
+                route_data, self.offline_geocoder, route=route
+            )
+        else:
+            all_cities = self.router.find_cities_along_route(route_data, self.geocoder, route=route)
+        log(f"✓ Found {len(all_cities)} cities along route")
+        if all_cities:
+            log(f"   Cities: {', '.join([c['name'] for c in all_cities[:10]])}" +
+                (f" ...and {len(all_cities)-10} more" if len(all_cities) > 10 else ""))
+        log('')
+        return all_cities
+    
+    def _select_stops(self, request: TripRequest, places: Dict, routed: Dict, all_cities: List[Dict],
+                      log: Callable[[str], None]) -> Tuple[List[Dict], List[Dict]]:
+        """Select strategic stop cities based on driving hours along the route."""
+        log(f"🎯 Selecting major stop cities (~{request.target_hours} hours of driving apart)...")
+        major_stops, waypoint_cities = select_stops(
+            places['origin'],
+            places['destination'],
+            places['via_cities'],
+            request.roundtrip,
+            all_cities,
+            request.target_hours,
+            request.waypoint_interval,
+            log=log,
+            route=routed['route']
+        )
+        
+        log('')
+        log(f"✓ Selected {len(major_stops)} major stops")
+        if waypoint_cities:
+            log(f"✓ Found {len(waypoint_cities)} waypoint cities (hotel-only options every ~{request.waypoint_interval} miles)")
+        log('')
+        return major_stops, waypoint_cities
+    
+    @staticmethod
+    def _find_wikivoyage_urls(major_stops: List[Dict], previous: Optional[TripResult] = None) -> List[Optional[str]]:
+        known = {stop['name']: stop['wikivoyage_url'] for stop in previous.major_stops} if previous else {}
+        lookup_stops = [stop for stop in major_stops if stop['type'] != 'return']
+        return [
+            known[stop['name']] if stop['name'] in known else WikipediaHelper.search_wikivoyage(query)
+            for stop, query in zip(lookup_stops, wikivoyage_queries(major_stops))
+        ]
+    
+    def _submit_unless_known(self, known: Dict[str, Any], name: str, func: Callable, *args, **kwargs) -> Future:
+        """Future of a per-stop search: the previous plan's result for the stop if it has one, else a new search."""
+        if name in known:
+            future: Future = Future()
+            future.set_result(known[name])
+            return future
+        return self.fan_out.submit(func, *args, **kwargs)
+    
+    def _find_hotels(self, trip_config: TripConfig, stops: Tuple[List[Dict], List[Dict]],
+                     log: Callable[[str], None], previous: Optional[TripResult] = None) -> Tuple[Dict, Dict]:
+        """Find hotels for major stops AND waypoint cities (reusing the previous plan's searches)."""
+        major_stops, waypoint_cities = stops
+        places_finder = self.places_finder
+        hotels = {}
+        waypoint_hotels = {}
+        
+        if not trip_config.search_hotels:
+            log(f"⊘ Hotel search disabled")
+            log('')
+            return hotels, waypoint_hotels
+        
+        known_stops, known_waypoints = {}, {}
+        if previous and previous.request.config.search_hotels and \
+                previous.request.config.pet_friendly_only == trip_config.pet_friendly_only:
+            known_stops = previous_stop_results(previous.major_stops, previous.hotels, HOTEL_STOP_TYPES)
+            known_waypoints = previous_stop_results(previous.waypoint_cities, previous.waypoint_hotels)
+        
+        hotel_type = "pet-friendly hotels" if trip_config.pet_friendly_only else "hotels"
+        log(f"🏨 Finding top {hotel_type}...")
+        log(f"  Searching {len(major_stops)} major stops...")
+        
+        hotel_stops = [
+            stop for stop in major_stops
+            if stop['type'] in HOTEL_STOP_TYPES
+        ]
+        reused = sum(stop['name'] in known_stops for stop in hotel_stops) + \
+            sum(waypoint['name'] in known_waypoints for waypoint in waypoint_cities)
+        if reused:
+            log(f"  ♻ Reusing the previous plan's hotels for {reused} stops")
+        stop_hotel_futures = [
+            self._submit_unless_known(
+                known_stops, stop['name'],
+                places_finder.find_pet_friendly_hotel,
+                stop['name'], stop['lat'], stop['lon'],
+                pet_friendly_only=trip_config.pet_friendly_only
+            )
+            for stop in hotel_stops
+        ]
+        waypoint_hotel_futures = [
+            self._submit_unless_known(
+                known_waypoints, waypoint['name'],
+                places_finder.find_pet_friendly_hotel,
+                waypoint['name'], waypoint['lat'], waypoint['lon'],
+                pet_friendly_only=trip_config.pet_friendly_only
+            )
+            for waypoint in waypoint_cities
+        ]
+        
+        # Search hotels for major stops
+        for stop, future in zip(hotel_stops, stop_hotel_futures):
+            log(f"  {stop['name']}...")
+            hotel = future.result()
+            if hotel:
+                hotels[stop['name']] = hotel
+                log(f"    ✓ {hotel.name} ({hotel.rating}⭐, {hotel.user_ratings_total} reviews)")
+            else:
+                log(f"    ⚠ No hotels found")
+        
+        # Search hotels for waypoint cities
+        if waypoint_cities:
+            log(f"  Searching {len(waypoint_cities)} waypoint cities...")
+            for waypoint, future in zip(waypoint_cities, waypoint_hotel_futures):
+                log(f"  {waypoint['name']}...")
+                hotel = future.result()
+                if hotel:
+                    waypoint_hotels[waypoint['name']] = hotel
+                    log(f"    ✓ {hotel.name} ({hotel.rating}⭐)")
+                else:
+                    log(f"    ⚠ No hotels found")
+        log('')
+        return hotels, waypoint_hotels
+    
+    def _find_vets(self, trip_config: TripConfig, major_stops: List[Dict], log: Callable[[str], None],
+                   previous: Optional[TripResult] = None) -> Dict:
+        """Find vets for major stops only (reusing the previous plan's searches)."""
+        vets = {}
+        if not trip_config.search_vets:
+            log(f"⊘ Emergency vet search disabled")
+            log('')
+            return vets
+        
+        known = {}
+        if previous and previous.request.config.search_vets:
+            known = previous_stop_results(previous.major_stops, previous.vets, VET_STOP_TYPES)
+        
+        log(f"🏥 Finding 24/7 emergency veterinarians...")
+        vet_stops = [
+            stop for stop in major_stops
+            if stop['type'] in VET_STOP_TYPES
+        ]
+        reused = sum(stop['name'] in known for stop in vet_stops)
+        if reused:
+            log(f"  ♻ Reusing the previous plan's vets for {reused} stops")
+        vet_futures = [
+            self._submit_unless_known(
+                known, stop['name'],
+                self.places_finder.find_emergency_vet, stop['name'], stop['lat'], stop['lon']
+            )
+            for stop in vet_stops
+        ]
+        for stop, future in zip(vet_stops, vet_futures):
+            vet = future.result()
+            log(f"  Searching {stop['name']}...")
+            if vet:
+                vets[stop['name']] = vet
+                hours_text = "24/7" if vet.is_24_hours else "Regular hours"
+                log(f"    ✓ {vet.name} ({vet.rating}⭐, {hours_text})")
+            else:
+                log(f"    ⚠ No vets found")
+        log('')
+        return vets
+    
+    def _find_state_attractions(self, trip_config: TripConfig, all_cities: List[Dict], major_stops: List[Dict],
+                                log: Callable[[str], None],
+                                previous: Optional[TripResult] = None) -> Dict[str, Dict[str, List]]:
+        """
+        Find national parks and monuments in each state we pass through.
+        
+        Returns:
+            {state: {category: attractions}} for every state and searched category;
+            the previous plan's results are reused for states it already searched
+        """
+        places_finder = self.places_finder
+        known = previous.state_attractions if previous else {}
+        found = {}
+        
+        # Heads the attraction section, whose later parts come from the other stages
+        log(f"🎯 Finding attractions and points of interest...")
+        
+        if trip_config.search_national_parks or trip_config.search_monuments:
+            state_names = states_along_route(all_cities, major_stops)
+            searches = {
+                'national_parks': (trip_config.search_national_parks, places_finder.find_national_parks_by_state),
+                'monuments': (trip_config.search_monuments, places_finder.find_monuments_by_state)
+            }
+            futures = {
+                state_name: {
+                    category: self._submit_unless_known(known.get(state_name, {}), category, search, state_name)
+                    for category, (enabled, search) in searches.items() if enabled
+                }
+                for state_name in state_names
+            }
+            if trip_config.search_national_parks:
+                log(f"  🏞️ Finding major national parks by state...")
+            elif trip_config.search_monuments:
+                log(f"  🗿 Finding monuments by state...")
+            
+            for state_name in state_names:
+                if trip_config.search_national_parks:
+                    log(f"    Searching {state_name}...")
+                found[state_name] = {category: future.result() for category, future in futures[state_name].items()}
+        return found
+    
+    def _scan_route(self, trip_config: TripConfig, routed: Dict, log: Callable[[str], None],
+                    previous: Optional[TripResult] = None) -> Dict[str, List]:
+        """
+        Scan for parks, viewpoints and EV chargers along the route in one pass.
+        
+        When re-planning, only legs the previous plan didn't route (or categories it
+        didn't scan) are scanned; results along reused legs are carried over.
+        """
+        route_categories = []
+        
+        # 1. Major parks along the route (tighter criteria)
+        if trip_config.search_parks:
+            log(f"  🌲 Scanning for major parks along route...")
+            route_categories.append('parks')
+        
+        # 2. Scenic viewpoints along the route
+        if trip_config.search_viewpoints:
+            log(f"  📸 Scanning for scenic viewpoints...")
+            route_categories.append('viewpoints')
+        
+        # 2.5. EV chargers along the route
+        if trip_config.search_ev_chargers:
+            log(f"  ⚡ Scanning for EV charging stations along route...")
+            route_categories.append('ev_chargers')
+        
+        route = routed['route']
+        bounds = routed['leg_bounds']
+        changed = [k for k, leg_changed in enumerate(routed['changed_legs']) if leg_changed]
+        if previous is None or not bounds or len(changed) == len(bounds) - 1:
+            # Requests go to the shared pool; this stage's own thread waits on them
+            return self.places_finder.scan_route(route, route_categories, fan_out=self.fan_out, log=log)
+        
+        waypoints = routed['waypoints']
+        reused_legs = {
+            leg_key(start, end) for k, (start, end) in enumerate(zip(waypoints, waypoints[1:])) if k not in changed
+        }
+        found = {}
+        # Categories needing the same legs rescanned share one scan
+        rescans: Dict[Tuple[int, ...], List[str]] = {}
+        for category in route_categories:
+            kept = kept_route_attractions(previous, category, reused_legs, route)
+            found[category] = kept or []
+            legs = tuple(changed) if kept is not None else tuple(range(len(bounds) - 1))
+            if legs:
+                rescans.setdefault(legs, []).append(category)
+        
+        for legs, categories in rescans.items():
+            log(f"    ♻ Scanning {len(legs)} of {len(bounds) - 1} legs for {', '.join(categories)}")
+            for first, last in _runs(legs):
+                # The section keeps trip chainage, so "~N mi from start" labels stay right
+                section = route.section(bounds[first], bounds[last + 1])
+                scanned = self.places_finder.scan_route(section, categories, fan_out=self.fan_out, log=log)
+                for category in categories:
+                    found[category].extend(scanned.get(category, []))
+        return found
+    
+    def _find_city_attractions(self, trip_config: TripConfig, major_stops: List[Dict],
+                               log: Callable[[str], None],
+                               previous: Optional[TripResult] = None) -> Dict[str, Dict[str, List]]:
+        """
+        Find attractions at major stop cities.
+        
+        Returns:
+            {stop name: {category: attractions}} for every searched stop; the previous
+            plan's results are reused for stops and categories it already searched
+        """
+        places_finder = self.places_finder
+        known = previous.stop_attractions if previous else {}
+        found = {}
+        
+        city_searches = []
+        if any([trip_config.search_parks, trip_config.search_museums, trip_config.search_restaurants, trip_config.search_dog_parks, trip_config.search_ev_chargers]):
+            for stop in major_stops:
+                if stop['type'] in ATTRACTION_STOP_TYPES:
+                    stop_known = known.get(stop['name'], {})
+                    submit = lambda category, search, limit: (category, self._submit_unless_known(
+                        stop_known, category, search, stop['name'], stop['lat'], stop['lon'], limit=limit
+                    ))
+                    stop_futures = []
+                    
+                    # Parks at cities
+                    if trip_config.search_parks:
+                        stop_futures.append(submit('parks', places_finder.find_parks_nearby, 3))
+                    
+                    # Museums
+                    if trip_config.search_museums:
+                        stop_futures.append(submit('museums', places_finder.find_museums_in_city, 3))
+                    
+                    # Dog-friendly restaurants
+                    if trip_config.search_restaurants:
+                        stop_futures.append(submit('restaurants', places_finder.find_dog_friendly_restaurants, 5))
+                    
+                    # Dog parks
+                    if trip_config.search_dog_parks:
+                        stop_futures.append(submit('dog_parks', places_finder.find_dog_parks_in_city, 2))
+                    
+                    # EV chargers
+                    if trip_config.search_ev_chargers:
+                        stop_futures.append(submit('ev_chargers', places_finder.find_ev_chargers_in_city, 3))
+                    
+                    city_searches.append((stop, stop_futures))
+        
+        if city_searches:
+            log(f"  Searching near major stop cities...")
+            for stop, stop_futures in city_searches:
+                log(f"    {stop['name']}...")
+                found[stop['name']] = {category: future.result() for category, future in stop_futures}
+        return found
+    
+    async def plan_async(self, request: TripRequest, pool=None) -> TripResult:
+        """
+        Plan a trip on the asyncio pipeline (requires aiohttp), sharing this planner's caches.
+        
+        Args:
+            request: Trip to plan
+            pool: Shared AsyncHTTPPool; a private one is used if omitted
+        """
+        # Imported here so the default path doesn't require aiohttp
+        from planner.async_pipeline import plan_trip_async
+        offline_geocoder = None
+        if request.offline_geocoding:
+            # The first offline plan reads the gazetteer; keep that off the event loop
+            offline_geocoder = await asyncio.to_thread(lambda: self.offline_geocoder)
+        trip = await plan_trip_async(
+            request.origin,
+            request.destination,
+            via=request.via,
+            roundtrip=request.roundtrip,
+            trip_config=request.config,
+            api_key=self.api_key,
+            target_hours=request.target_hours,
+            waypoint_interval=request.waypoint_interval,
+            places_cache=self.places_cache,
+            route_cache=self.route_cache,
+            poi_store=self.poi_store,
+            location_cache=self.location_cache,
+            reverse_geocode_cache=self.reverse_geocode_cache,
+            offline_geocoding=request.offline_geocoding,
+            offline_geocoder=offline_geocoder,
+            corridor_search=self.corridor_search,
+            pool=pool
+        )
+        if trip is None:
+            return TripResult.failed(request, f"Could not plan {request.origin} → {request.destination}")
+        
+        dedupe_attractions(trip['attractions'])
+        return TripResult(request=request, **trip)
+    
+    @staticmethod
+    def _failed(request: TripRequest, error: str, log: Callable[[str], None]) -> TripResult:
+        log(f"Error: {error}")
+        return TripResult.failed(request, error)
+    
+    def export(self, result: TripResult, output_dir: Path,
+               progress: Optional[Callable[[str], None]] = None,
+               output_base: Optional[str] = None) -> Dict[str, str]:
+        """
+        Write the exports enabled in the request's config (map, data, GPX, summary).
+        
+        Args:
+            result: Successful trip result
+            output_dir: Directory to write into (created if missing)
+            progress: Progress callback (defaults to the planner's)
+            output_base: Base file name (defaults to the request's output_base)
+        
+        Returns:
+            Paths of the written files by kind ('map', 'data', 'gpx', 'summary'),
+            also stored on result.output_files (the trip's checkpoint is then removed)
+        """
+        output_files = export_trip(result, output_dir, progress or self.progress, output_base)
+        # The trip is safely on disk; nothing left to resume
+        TripCheckpoint.for_request(result.request).clear()
+        return output_files
+
+
+def export_trip(result: TripResult, output_dir: Path, log: Callable[[str], None] = print,
+                output_base: Optional[str] = None) -> Dict[str, str]:
+    """
+    Write the exports enabled in the request's config (map, data, GPX, summary).
+    
+    Needs nothing but the result, so it also runs in worker processes
+    (see planner.batch), given a TripResult.export_payload().
+    
+    Args:
+        result: Successful trip result
+        output_dir: Directory to write into (created if missing)
+        log: Progress callback
+        output_base: Base file name (defaults to the request's output_base)
+    
+    Returns:
+        Paths of the written files by kind ('map', 'data', 'gpx', 'summary'),
+        also stored on result.output_files
+    """
+    request = result.request
+    trip_config = request.config
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_base = output_base or request.output_base
+    # [lat, lon] view of the route's [lon, lat] coordinate array, shared by the map and GPX
+    map_route_geometry = np.asarray(result.route_data['geometry']['coordinates'], dtype=float)[:, ::-1]
+    output_files = {}
+    
+    # Create map if enabled
+    if trip_config.export_map:
+        log(f"🗺️  Generating interactive map...")
+        trip_map = create_trip_map(
+            map_route_geometry,
+            result.major_stops,
+            result.waypoint_cities,
+            result.hotels,
+            result.waypoint_hotels,
+            result.vets,
+            result.attractions,
+            request.trip_name,
+            result.route_data
+        )
+        
+        output_path = output_dir / (output_base + ".html")
+        trip_map.save(str(output_path))
+        output_files['map'] = str(output_path)
+        log(f"  ✓ Map saved: {output_path}")
+        log('')
+    else:
+        log(f"⊘ Map generation disabled")
+        log('')
+    
+    # Save data if enabled
+    if trip_config.export_data:
+        data_file = output_dir / (output_base + "_data.json")
+        with open(data_file, 'w') as f:
+            json.dump(result.to_dict(), f, indent=2)
+        output_files['data'] = str(data_file)
+        log(f"  ✓ Trip data saved: {data_file}")
+    
+    # Generate GPX file for navigation apps if enabled
+    if trip_config.export_gpx:
+        log(f"🗺️  Generating GPX file for navigation apps...")
+        gpx_file = output_dir / (output_base + ".gpx")
+        create_gpx_file(
+            map_route_geometry,
+            result.major_stops,
+            result.waypoint_cities,
+            result.hotels,
+            result.waypoint_hotels,
+            result.vets,
+            result.attractions,
+            request.trip_name,
+            str(gpx_file)
+        )
+        output_files['gpx'] = str(gpx_file)
+        log('')
+    else:
+        log(f"⊘ GPX generation disabled")
+        log('')
+    
+    # Generate summary if enabled
+    if trip_config.export_summary:
+        summary_file = output_dir / (output_base + '_summary.md')
+        write_summary(result, summary_file)
+        output_files['summary'] = str(summary_file)
+        log(f"  ✓ Summary saved: {summary_file}")
+        log('')
+    else:
+        log(f"⊘ Summary generation disabled")
+        log('')
+    
+    result.output_files = output_files
+    return output_files
+
+
+def write_summary(result: TripResult, summary_file: Path) -> None:
+    """Write the Markdown trip summary."""
+    major_stops = result.major_stops
+    waypoint_cities = result.waypoint_cities
+    hotels = result.hotels
+    waypoint_hotels = result.waypoint_hotels
+    vets = result.vets
+    all_attractions = result.attractions
+    total_distance_mi = result.total_distance_mi
+    total_duration_h = result.total_duration_h
+    generated_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    with open(summary_file, 'w') as f:
+        f.write(f"# {result.request.trip_name}\n\n")
+        f.write(f"*Generated: {generated_time}*\n\n")
+        f.write(f"## Trip Overview\n\n")
+        f.write(f"- **Distance**: {total_distance_mi:.1f} miles\n")
+        f.write(f"- **Estimated Driving Time**: {int(total_duration_h)}h {int((total_duration_h % 1) * 60)}m\n")
+        f.write(f"- **Number of Major Stops**: {len(major_stops)}\n")
+        f.write(f"- **Number of Waypoint Cities**: {len(waypoint_cities)}\n\n")
+        
+        f.write(f"## Major Stops\n\n")
+        for i, stop in enumerate(major_stops, 1):
+            f.write(f"{i}. {stop['name']}\n")
+        f.write("\n")
+        
+        f.write(f"## Waypoint Cities\n\n")
+        for i, waypoint in enumerate(waypoint_cities, 1):
+            f.write(f"{i}. {waypoint['name']}\n")
+        f.write("\n")
+        
+        f.write(f"## Hotels at Major Stops ({len(hotels)} found)\n\n")
+        for city, hotel in hotels.items():
+            f.write(f"### {city}\n\n")
+            f.write(f"**{hotel.name}**\n\n")
+            f.write(f"- Rating: {hotel.rating}⭐ ({hotel.user_ratings_total:,} reviews)\n")
+            f.write(f"- Address: {hotel.address}\n")
+            if hotel.phone:
+                f.write(f"- Phone: {hotel.phone}\n")
+            if hotel.website:
+                f.write(f"- Website: {hotel.website}\n")
+            f.write("\n")
+        
+        f.write(f"## Hotels at Waypoint Cities ({len(waypoint_hotels)} found)\n\n")
+        for city, hotel in waypoint_hotels.items():
+            f.write(f"### {city}\n\n")
+            f.write(f"**{hotel.name}**\n\n")
+            f.write(f"- Rating: {hotel.rating}⭐ ({hotel.user_ratings_total:,} reviews)\n")
+            f.write(f"- Address: {hotel.address}\n")
+            if hotel.phone:
+                f.write(f"- Phone: {hotel.phone}\n")
+            if hotel.website:
+                f.write(f"- Website: {hotel.website}\n")
+            f.write("\n")
+        
+        f.write(f"## Emergency Veterinarians ({len(vets)} found)\n\n")
+        for city, vet in vets.items():
+            f.write(f"### {city}\n\n")
+            f.write(f"**{vet.name}**")
+            if vet.is_24_hours:
+                f.write(f" ⏰ **24/7**")
+            f.write("\n\n")
+            f.write(f"- Rating: {vet.rating}⭐ ({vet.user_ratings_total:,} reviews)\n")
+            f.write(f"- Address: {vet.address}\n")
+            if vet.phone:
+                f.write(f"- Phone: {vet.phone}\n")
+            if vet.website:
+                f.write(f"- Website: {vet.website}\n")
+            f.write("\n")
+        
+        # Write attraction sections
+        if all_attractions['national_parks']:
+            f.write(f"## 🏞️ Major National Parks ({len(all_attractions['national_parks'])} found)\n\n")
+            for park in all_attractions['national_parks']:
+                f.write(f"- **{park.name}** ({park.rating}⭐, {park.user_ratings_total:,} reviews) - {park.state}\n")
+                if park.website:
+                    f.write(f"  - Website: {park.website}\n")
+            f.write("\n")
+        
+        if all_attractions['monuments']:
+            f.write(f"## 🗿 Monuments & Memorials ({len(all_attractions['monuments'])} found)\n\n")
+            for monument in all_attractions['monuments']:
+                f.write(f"- **{monument.name}** ({monument.rating}⭐, {monument.user_ratings_total:,} reviews) - {monument.location}\n")
+            f.write("\n")
+        
+        if all_attractions['parks']:
+            f.write(f"## 🌲 Parks ({len(all_attractions['parks'])} found)\n\n")
+            for park in all_attractions['parks'][:20]:  # Top 20
+                f.write(f"- **{park.name}** ({park.rating}⭐, {park.user_ratings_total:,} reviews) - {park.location}\n")
+            f.write("\n")
+        
+        if all_attractions['museums']:
+            f.write(f"## 🏛️ Museums & Cultural Attractions ({len(all_attractions['museums'])} found)\n\n")
+            for museum in all_attractions['museums']:
+                f.write(f"- **{museum.name}** ({museum.rating}⭐, {museum.user_ratings_total:,} reviews) - {museum.location}\n")
+            f.write("\n")
+        
+        if all_attractions['restaurants']:
+            f.write(f"## 🍽️ Dog-Friendly Restaurants ({len(all_attractions['restaurants'])} found)\n\n")
+            for restaurant in all_attractions['restaurants']:
+                f.write(f"- **{restaurant.name}** ({restaurant.rating}⭐, {restaurant.user_ratings_total:,} reviews) - {restaurant.location}\n")
+            f.write("\n")
+        
+        if all_attractions['dog_parks']:
+            f.write(f"## 🐾 Dog Parks ({len(all_attractions['dog_parks'])} found)\n\n")
+            for dog_park in all_attractions['dog_parks']:
+                f.write(f"- **{dog_park.name}** ({dog_park.rating}⭐, {dog_park.user_ratings_total:,} reviews) - {dog_park.location}\n")
+            f.write("\n")
+        
+        if all_attractions['viewpoints']:
+            f.write(f"## 📸 Scenic Viewpoints ({len(all_attractions['viewpoints'])} found)\n\n")
+            for viewpoint in all_attractions['viewpoints']:
+                f.write(f"- **{viewpoint.name}** ({viewpoint.rating}⭐, {viewpoint.user_ratings_total:,} reviews) - {viewpoint.location}\n")
+            f.write("\n")
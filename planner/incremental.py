@@ -0,0 +1,98 @@
+"""What a previous TripResult contributes when an edited trip is planned again.
+
+TripPlanner.plan(previous=...) keeps everything an edit didn't touch: route
+legs between unchanged waypoints, hotel, vet and attraction searches for stops
+still on the trip, national park and monument searches for states still
+visited, and route scan results along unchanged legs. These helpers work out
+which parts of the previous result still apply.
+"""
+
+from dataclasses import replace
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from services.router import Leg, leg_key
+from utils import RouteGeometry
+
+# Location labels route scans give their results, from miles along the route
+ROUTE_SCAN_LABELS = {'ev_chargers': "Mile {miles}"}
+DEFAULT_ROUTE_SCAN_LABEL = "~{miles} mi from start"
+
+
+def previous_legs(previous) -> Dict[Tuple[float, ...], Leg]:
+    """
+    Split a previous TripResult's route into its legs.
+    
+    Args:
+        previous: Earlier TripResult (or None)
+    
+    Returns:
+        Legs by leg_key(); empty if the result has no per-leg route information
+    """
+    if previous is None or not previous.success or not previous.leg_bounds:
+        return {}
+    waypoints = previous.waypoints
+    bounds = previous.leg_bounds
+    osrm_legs = previous.route_data.get('legs', [])
+    if len(osrm_legs) != len(waypoints) - 1 or len(bounds) != len(waypoints):
+        return {}
+    
+    coordinates = previous.route_data['geometry']['coordinates']
+    legs = {}
+    for k, (start, end) in enumerate(zip(waypoints, waypoints[1:])):
+        legs.setdefault(leg_key(start, end), (coordinates[bounds[k]:bounds[k + 1] + 1], osrm_legs[k]))
+    return legs
+
+
+def previous_stop_results(stops: List[Dict], results: Dict,
+                          stop_types: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Results of a previous per-stop search, including stops where it found nothing.
+    
+    Args:
+        stops: The previous plan's stops (or waypoint cities)
+        results: The search's results by stop name
+        stop_types: Stop types the search ran for (default: every stop)
+    
+    Returns:
+        Result (or None) by name of every stop that was searched
+    """
+    return {
+        stop['name']: results.get(stop['name']) for stop in stops
+        if stop_types is None or stop['type'] in stop_types
+    }
+
+
+def kept_route_attractions(previous, category: str, reused_legs: Set[Tuple[float, ...]],
+                           route: RouteGeometry) -> Optional[List]:
+    """
+    Route scan results of a previous plan that lie along legs the new route keeps.
+    
+    Each attraction belongs to the previous leg it is closest to; it is kept if
+    that leg is still part of the route. Kept attractions are relabeled with
+    their distance along the new route, since an edit before a kept leg moves it.
+    
+    Args:
+        previous: Earlier TripResult
+        category: Route scan category
+        reused_legs: leg_key() of every leg carried over unchanged
+        route: The new route
+    
+    Returns:
+        Attractions to keep, or None if the previous plan didn't scan this category
+    """
+    if category not in previous.route_attractions:
+        return None
+    attractions = previous.route_attractions[category]
+    legs = list(previous_legs(previous).items())
+    if not attractions or not legs:
+        return []
+    
+    geometries = [RouteGeometry(coordinates) for _, (coordinates, _) in legs]
+    label = ROUTE_SCAN_LABELS.get(category, DEFAULT_ROUTE_SCAN_LABEL)
+    kept = []
+    for attraction in attractions:
+        distances = [geometry.nearest_vertex(attraction.lat, attraction.lon)[1] for geometry in geometries]
+        if legs[distances.index(min(distances))][0] in reused_legs:
+            vertex, _ = route.nearest_vertex(attraction.lat, attraction.lon)
+            miles = int(route.distance_at(vertex) / 1609.34)
+            kept.append(replace(attraction, location=label.format(miles=miles)))
+    return kept
@@ -0,0 +1,233 @@
+"""Stop selection and other pure planning steps shared by the sync and async planners."""
+
+import numpy as np
+from typing import Callable, List, Dict, Optional, Tuple
+from utils.distance import calculate_popularity_score
+from utils.route_geometry import RouteGeometry
+from config import STATE_ABBREV_TO_NAME
+
+# Stop types that get each kind of search
+HOTEL_STOP_TYPES = ['start', 'major_stop', 'destination', 'via', 'return']
+VET_STOP_TYPES = ['start', 'major_stop', 'destination', 'via']
+ATTRACTION_STOP_TYPES = ['start', 'stop', 'destination', 'via']
+
+
+def build_waypoints(
+    origin: Tuple[float, float],
+    destination: Tuple[float, float],
+    via_cities: List[Dict],
+    roundtrip: bool
+) -> List[Tuple[float, float]]:
+    """
+    Build the OSRM waypoint list for a trip.
+    
+    Multi-city routes go origin -> destination -> via cities -> origin;
+    round trips return to the origin the same way.
+    
+    Returns:
+        List of (lat, lon) tuples
+    """
+    waypoints = [origin, destination]
+    
+    if via_cities:
+        for via in via_cities:
+            waypoints.append((via['lat'], via['lon']))
+        waypoints.append(origin)
+    elif roundtrip:
+        # Same route back
+        waypoints.append(origin)
+    return waypoints
+
+
+def select_stops(
+    origin: Dict,
+    destination: Dict,
+    via_cities: List[Dict],
+    roundtrip: bool,
+    all_cities: List[Dict],
+    target_hours: int,
+    waypoint_interval: int,
+    log: Callable[[str], None] = print,
+    route: Optional[RouteGeometry] = None
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Pick major stops (about target_hours apart) and hotel-only waypoint cities.
+    
+    Spacing is measured along the route: a city becomes a major stop once the
+    driving time from the last one reaches 80% of target_hours, otherwise a
+    waypoint once the route distance from the last waypoint (or major stop)
+    reaches 80% of waypoint_interval. Each next stop is found by binary search
+    over the cities' cumulative distance and time.
+    
+    Args:
+        origin: Dict with 'name', 'lat', 'lon'
+        destination: Dict with 'name', 'lat', 'lon'
+        via_cities: Geocoded via cities (dicts with 'name', 'lat', 'lon')
+        roundtrip: Whether the trip returns to the origin the same way
+        all_cities: Cities along the route from find_cities_along_route()
+        target_hours: Target driving hours between major stops
+        waypoint_interval: Miles between waypoint cities
+        log: Receives the progress lines (defaults to print)
+        route: The route with its driving time index (RouteGeometry.from_route);
+            without it the route is assumed to average 65 mph
+    
+    Returns:
+        (major_stops, waypoint_cities); wikivoyage_url is left as None, see assign_wikivoyage_urls()
+    """
+    major_stops = [{
+        'name': origin['name'],
+        'lat': origin['lat'],
+        'lon': origin['lon'],
+        'type': 'start',
+        'stop_number': 0,
+        'wikivoyage_url': None,
+        'is_major_stop': True
+    }]
+    
+    # Select major stops from cities found along route
+    waypoint_cities = []
+    if all_cities:
+        # Cumulative route distance and driving time of each city (nondecreasing, in route order)
+        city_m = np.array([city['distance_mi'] * 1609.34 for city in all_cities])
+        if route is not None:
+            city_s = route.time_at(city_m)
+        else:
+            city_s = city_m / 1609.34 / 65 * 3600  # Average highway speed ~65 mph
+        target_s = target_hours * 3600 * 0.8  # At least 80% of target
+        waypoint_distance_m = waypoint_interval * 1609.34 * 0.8
+        last_major_m = last_major_s = last_waypoint_m = 0.0
+        stop_num = 1
+        i = 0
+        
+        while i < len(all_cities):
+            # First remaining city far enough (in time) from the last major stop,
+            # and first far enough (in distance) from the last waypoint
+            major_i = i + int(np.searchsorted(city_s[i:], last_major_s + target_s, side='left'))
+            waypoint_i = i + int(np.searchsorted(city_m[i:], last_waypoint_m + waypoint_distance_m, side='left'))
+            
+            if major_i <= waypoint_i and major_i < len(all_cities):
+                city = all_cities[major_i]
+                major_stops.append({
+                    'name': city['name'],
+                    'lat': city['lat'],
+                    'lon': city['lon'],
+                    'type': 'major_stop',
+                    'stop_number': stop_num,
+                    'wikivoyage_url': None,
+                    'is_major_stop': True
+                })
+                drive_h = (city_s[major_i] - last_major_s) / 3600
+                log(f"  Major Stop {stop_num}: {city['name']} "
+                    f"(~{(city_m[major_i] - last_major_m) / 1609.34:.0f} mi, "
+                    f"{int(drive_h)}h {int((drive_h % 1) * 60)}m from last major stop)")
+                last_major_m, last_major_s = city_m[major_i], city_s[major_i]
+                last_waypoint_m = city_m[major_i]  # Reset waypoint tracker
+                stop_num += 1
+                i = major_i + 1
+            # Add as waypoint if far enough from last waypoint but not a major stop
+            elif waypoint_i < len(all_cities):
+                city = all_cities[waypoint_i]
+                waypoint_cities.append({
+                    'name': city['name'],
+                    'lat': city['lat'],
+                    'lon': city['lon'],
+                    'type': 'waypoint',
+                    'is_major_stop': False
+                })
+                last_waypoint_m = city_m[waypoint_i]
+                i = waypoint_i + 1
+            else:
+                break
+    
+    major_stops.append({
+        'name': destination['name'],
+        'lat': destination['lat'],
+        'lon': destination['lon'],
+        'type': 'destination',
+        'stop_number': len(major_stops),
+        'wikivoyage_url': None,
+        'is_major_stop': True
+    })
+    log(f"  Destination: {destination['name']}")
+    
+    # Add via cities and return if multi-city route
+    if via_cities:
+        for via in via_cities:
+            major_stops.append({
+                'name': via['name'],
+                'lat': via['lat'],
+                'lon': via['lon'],
+                'type': 'via',
+                'stop_number': len(major_stops),
+                'wikivoyage_url': None,
+                'is_major_stop': True
+            })
+            log(f"  Via: {via['name']}")
+    
+    if via_cities or roundtrip:
+        major_stops.append({
+            'name': f"{origin['name']} (return)",
+            'lat': origin['lat'],
+            'lon': origin['lon'],
+            'type': 'return',
+            'stop_number': len(major_stops),
+            'wikivoyage_url': None,
+            'is_major_stop': True
+        })
+        log(f"  Return to: {origin['name']}")
+    
+    return major_stops, waypoint_cities
+
+
+def wikivoyage_queries(major_stops: List[Dict]) -> List[str]:
+    """City names to look up on Wikivoyage, one per non-return stop."""
+    return [stop['name'].split(',')[0].strip() for stop in major_stops if stop['type'] != 'return']
+
+
+def assign_wikivoyage_urls(major_stops: List[Dict], urls: List[Optional[str]]) -> None:
+    """Store Wikivoyage URLs (aligned with wikivoyage_queries()); return stops reuse the origin's."""
+    lookup_stops = [stop for stop in major_stops if stop['type'] != 'return']
+    for stop, url in zip(lookup_stops, urls):
+        stop['wikivoyage_url'] = url
+    for stop in major_stops:
+        if stop['type'] == 'return':
+            stop['wikivoyage_url'] = major_stops[0]['wikivoyage_url']
+
+
+def states_along_route(all_cities: List[Dict], major_stops: List[Dict]) -> List[str]:
+    """
+    Full names of the states a trip passes through, sorted by abbreviation.
+    
+    Uses the cities found along the route plus the stop cities themselves.
+    """
+    states_visited = set()
+    
+    # Get states from cities found along route
+    for city in all_cities:
+        if ', ' in city['name']:
+            state_abbrev = city['name'].split(', ')[-1]
+            states_visited.add(state_abbrev)
+    
+    # ALSO get states from our actual stop cities (origin, destination, via cities)
+    for stop in major_stops:
+        if ', ' in stop['name']:
+            state_abbrev = stop['name'].split(', ')[-1].strip()
+            # Only add if it looks like a state abbreviation (2 uppercase letters)
+            if len(state_abbrev) == 2 and state_abbrev.isupper():
+                states_visited.add(state_abbrev)
+    
+    return [STATE_ABBREV_TO_NAME.get(abbrev, abbrev) for abbrev in sorted(states_visited)]
+
+
+def dedupe_attractions(all_attractions: Dict[str, List]) -> None:
+    """Deduplicate each category by name (first wins) and re-sort by popularity, in place."""
+    for category in all_attractions:
+        seen_names = set()
+        unique_attractions = []
+        for attraction in all_attractions[category]:
+            if attraction.name not in seen_names:
+                unique_attractions.append(attraction)
+                seen_names.add(attraction.name)
+        # Re-sort by score
+        unique_attractions.sort(key=lambda a: calculate_popularity_score(a.rating, a.user_ratings_total), reverse=True)
+        all_attractions[category] = unique_attractions
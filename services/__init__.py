@@ -4,10 +4,17 @@ from .wikipedia import WikipediaHelper
 from .geocoder import NominatimGeocoder
 from .router import OSRMRouter
 from .places import GooglePlacesFinder
+from .cache import ResponseCache, LocationCache
+from .poi_store import POIStore
+from .offline_geocoder import OfflineReverseGeocoder
 
 __all__ = [
     'WikipediaHelper',
     'NominatimGeocoder',
     'OSRMRouter',
     'GooglePlacesFinder',
+    'ResponseCache',
+    'LocationCache',
+    'POIStore',
+    'OfflineReverseGeocoder',
 ]
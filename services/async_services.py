@@ -0,0 +1,509 @@
+"""Asyncio-native service clients.
+
+These mirror the synchronous services with the same method names as
+coroutines. Where the synchronous services write a lookup as request steps
+(see services.http_client.ServiceClient.run), the async clients run the same
+steps, awaiting requests and moving cache and POI store access off the event
+loop. Requires aiohttp, so this module is not imported by services/__init__
+and the synchronous planner works without it.
+"""
+
+import asyncio
+import aiohttp
+from urllib.parse import urlsplit
+from typing import List, Optional, Dict, Tuple, Any, Callable
+from models import Hotel, Veterinarian, Attraction, NationalPark
+from services.geocoder import NominatimGeocoder
+from services.router import OSRMRouter
+from services.places import GooglePlacesFinder
+from services.wikipedia import WikipediaHelper
+from services.cache import ResponseCache, LocationCache
+from services.poi_store import POIStore
+from services.http_client import Blocking, RequestSteps
+from services.rate_limiter import get_rate_limiter
+from services.single_flight import AsyncSingleFlight, request_key
+from utils.route_geometry import RouteGeometry, RouteLike
+from config import ASYNC_MAX_IN_FLIGHT, ASYNC_DEFAULT_IN_FLIGHT
+
+
+class AsyncHTTPPool:
+    """One aiohttp session plus a per-host in-flight semaphore, bound to one event loop.
+    
+    Share a single pool between every client (and every trip) running on the
+    loop so the per-host limits hold across all of them.
+    """
+    
+    def __init__(self, max_in_flight: Optional[Dict[str, int]] = None,
+                 default_in_flight: int = ASYNC_DEFAULT_IN_FLIGHT):
+        """
+        Args:
+            max_in_flight: Concurrent requests allowed per host (defaults to config.ASYNC_MAX_IN_FLIGHT)
+            default_in_flight: Limit for hosts not listed in max_in_flight
+        """
+        self.max_in_flight = max_in_flight if max_in_flight is not None else ASYNC_MAX_IN_FLIGHT
+        self.default_in_flight = default_in_flight
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Identical requests in flight on this loop share one call
+        self.flight = AsyncSingleFlight()
+    
+    async def __aenter__(self) -> 'AsyncHTTPPool':
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared session, created on first use inside the running loop."""
+        if self._session is None or self._session.closed:
+            # Concurrency is bounded by the per-host semaphores, not the connector
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0))
+        return self._session
+    
+    def semaphore(self, url: str) -> asyncio.Semaphore:
+        """Get the in-flight semaphore for a URL's host."""
+        host = urlsplit(url).hostname or ''
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_in_flight.get(host, self.default_in_flight))
+            self._semaphores[host] = semaphore
+        return semaphore
+    
+    async def close(self) -> None:
+        """Close the underlying session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class AsyncServiceClient:
+    """Async counterpart of ServiceClient: default headers and timeout over a shared AsyncHTTPPool.
+    
+    Requests wait for their host's semaphore and token bucket, then return the
+    decoded JSON body (raising on HTTP errors).
+    """
+    
+    def __init__(self, pool: AsyncHTTPPool, headers: Optional[Dict[str, str]] = None, timeout: float = 10):
+        """
+        Args:
+            pool: Session and per-host limits shared with other clients
+            headers: Headers sent with every request (per-call headers override them)
+            timeout: Default request timeout in seconds
+        """
+        self.pool = pool
+        self.headers = headers or {}
+        self.timeout = timeout
+    
+    @staticmethod
+    def _query(params: Optional[Dict]) -> Optional[Dict[str, str]]:
+        """Stringify query values the way requests does (aiohttp rejects bools)."""
+        if params is None:
+            return None
+        return {key: str(value) for key, value in params.items()}
+    
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      timeout: Optional[float] = None, params: Optional[Dict] = None, **kwargs) -> Any:
+        """
+        Send a request within the host's in-flight and rate limits and return its JSON.
+        
+        Identical requests already in flight on the pool share that call and its
+        parsed result, which callers must treat as read-only.
+        """
+        merged_headers = {**self.headers, **(headers or {})}
+        client_timeout = aiohttp.ClientTimeout(total=timeout if timeout is not None else self.timeout)
+        query = self._query(params)
+        
+        async def send() -> Any:
+            async with self.pool.semaphore(url):
+                limiter = get_rate_limiter(url)
+                if limiter is not None:
+                    await limiter.acquire_async()
+                
+                async with self.pool.session.request(
+                    method,
+                    url,
+                    headers=merged_headers,
+                    params=query,
+                    timeout=client_timeout,
+                    **kwargs
+                ) as response:
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+        
+        key = request_key(method, url, query, kwargs.get('json'), merged_headers)
+        return await self.pool.flight.do(key, send)
+    
+    async def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> Any:
+        """Send a GET request."""
+        return await self.request('GET', url, params=params, **kwargs)
+    
+    async def post(self, url: str, json: Optional[Dict] = None, **kwargs) -> Any:
+        """Send a POST request with a JSON body."""
+        return await self.request('POST', url, json=json, **kwargs)
+    
+    async def run(self, steps: RequestSteps) -> Any:
+        """
+        Execute a request generator (see ServiceClient.run) and return its result.
+        
+        Requests are awaited on the pool; Blocking steps (SQLite and JSON cache
+        access) run in a worker thread so they never stall the event loop.
+        """
+        value, error = None, None
+        while True:
+            try:
+                step = steps.throw(error) if error is not None else steps.send(value)
+            except StopIteration as done:
+                return done.value
+            
+            value, error = None, None
+            try:
+                if isinstance(step, Blocking):
+                    value = await asyncio.to_thread(step)
+                else:
+                    value = await self.request(step.method, step.url, headers=step.headers,
+                                               params=step.params, json=step.json)
+            except Exception as e:
+                error = e
+
+
+class AsyncWikipediaHelper:
+    """Async Wikipedia and Wikivoyage lookups."""
+    
+    def __init__(self, pool: AsyncHTTPPool):
+        self.http = AsyncServiceClient(pool, headers={'User-Agent': WikipediaHelper.USER_AGENT}, timeout=5)
+    
+    async def search_wikipedia(self, query: str) -> Optional[Dict[str, str]]:
+        """Search Wikipedia and return article URL and summary (see WikipediaHelper)."""
+        return await self.http.run(WikipediaHelper._wikipedia_steps(query))
+    
+    async def search_wikivoyage(self, city_name: str) -> Optional[str]:
+        """Get Wikivoyage URL for a city."""
+        return await self.http.run(WikipediaHelper._wikivoyage_steps(city_name))
+
+
+class AsyncNominatimGeocoder(NominatimGeocoder):
+    """Async geocoder sharing NominatimGeocoder's caches and parsing."""
+    
+    def __init__(self, pool: AsyncHTTPPool, cache: Optional[LocationCache] = None,
+                 reverse_cache: Optional[LocationCache] = None):
+        super().__init__(cache=cache, reverse_cache=reverse_cache)
+        self.http = AsyncServiceClient(pool, headers=self.headers, timeout=10)
+    
+    async def geocode(self, address: str) -> Optional[Tuple[float, float, str]]:
+        """Geocode an address to (lat, lon, display_name) or None."""
+        return await self.http.run(self._geocode_steps(address))
+    
+    async def reverse_geocode(self, lat: float, lon: float) -> Optional[str]:
+        """Reverse geocode coordinates to city name."""
+        return await self.http.run(self._reverse_geocode_steps(lat, lon))
+
+
+class AsyncOSRMRouter(OSRMRouter):
+    """Async router sharing OSRMRouter's request building and parsing."""
+    
+    def __init__(self, pool: AsyncHTTPPool, cache: Optional[ResponseCache] = None, **options):
+        super().__init__(cache=cache, **options)
+        self.http = AsyncServiceClient(pool, timeout=30)
+    
+    async def get_route(self, waypoints: List[Tuple[float, float]]) -> Dict:
+        """Get route through multiple (lat, lon) waypoints."""
+        return (await self.get_route_legs(waypoints))[0]
+    
+    async def get_route_legs(self, waypoints: List[Tuple[float, float]],
+                             known_legs: Optional[Dict] = None) -> Tuple[Dict, List[int]]:
+        """Route assembled from known, cached and fetched legs (see OSRMRouter.get_route_legs)."""
+        return await self.http.run(self._route_legs_steps(waypoints, known_legs))
+    
+    async def find_cities_along_route(self, route_data: Dict, geocoder,
+                                      route: Optional[RouteGeometry] = None) -> List[Dict]:
+        """
+        Find cities along a route, reverse geocoding every sample point concurrently.
+        
+        Args:
+            route_data: Route data from get_route()
+            geocoder: AsyncNominatimGeocoder, or OfflineReverseGeocoder (queried synchronously)
+            route: Chainage index of the route, built from route_data if omitted
+        """
+        if not route_data['success']:
+            return []
+        
+        sample_points = self._city_sample_points(route or RouteGeometry.from_route(route_data))
+        coords = [(lat, lon) for lat, lon, _ in sample_points]
+        
+        if hasattr(geocoder, 'reverse_geocode_many'):
+            # Offline lookups are CPU-only, no point in awaiting them
+            city_names = geocoder.reverse_geocode_many(coords)
+        else:
+            city_names = await asyncio.gather(*(geocoder.reverse_geocode(lat, lon) for lat, lon in coords))
+        
+        return self._collect_cities(sample_points, city_names)
+
+
+class AsyncGooglePlacesFinder(GooglePlacesFinder):
+    """Async Places finder: same searches and filters as GooglePlacesFinder, as coroutines.
+    
+    Route scans issue every sample-point request at once and parse the
+    responses in route order, so results match the synchronous scans.
+    """
+    
+    def __init__(self, api_key: str, pool: AsyncHTTPPool, cache: Optional[ResponseCache] = None,
+                 wikipedia: Optional[AsyncWikipediaHelper] = None, corridor_search: bool = False,
+                 poi_store: Optional[POIStore] = None):
+        super().__init__(api_key, cache=cache, corridor_search=corridor_search, poi_store=poi_store)
+        self.http = AsyncServiceClient(pool, headers=self.headers, timeout=10)
+        self.wikipedia = wikipedia or AsyncWikipediaHelper(pool)
+    
+    async def _post(self, url: str, request_body: Dict, category: str, field_mask: Optional[str] = None) -> Dict:
+        """POST a Places request, serving it from the response cache or POI store when possible."""
+        return await self.http.run(self._post_steps(url, request_body, category, field_mask))
+    
+    async def _add_wikipedia_info(self, attractions: List) -> None:
+        """Fill in Wikipedia URL and summary for each attraction concurrently."""
+        wiki_infos = await asyncio.gather(*(self.wikipedia.search_wikipedia(a.name) for a in attractions))
+        for attraction, wiki_info in zip(attractions, wiki_infos):
+            if wiki_info:
+                attraction.wikipedia_url = wiki_info.get('url')
+                attraction.wikipedia_summary = wiki_info.get('summary')
+    
+    async def _scan_route(self, route_geometry: RouteLike, sample_interval_miles: Optional[float],
+                          url: str, build_request, category: str, log: Callable[[str], None] = print):
+        """Post one request per sample point concurrently; returns [(lat, lon, distance_m, data or exception)]."""
+        points, radius_m = self._route_search_points(route_geometry, category, sample_interval_miles, log=log)
+        responses = await asyncio.gather(
+            *(self._post(url, build_request(lat, lon, radius_m), category,
+                         field_mask=self._field_mask(self.ROUTE_SCAN_KINDS[category]))
+              for lat, lon, _ in points),
+            return_exceptions=True
+        )
+        return [(lat, lon, distance_m, data) for (lat, lon, distance_m), data in zip(points, responses)]
+    
+    async def _corridor_scan(self, route_geometry: RouteLike, text_query: str, included_type: Optional[str],
+                             category: str, max_offset_m: float, parse_point,
+                             log: Callable[[str], None] = print) -> Optional[List]:
+        """Corridor scan with every segment searched concurrently (pages within a segment stay sequential)."""
+        polylines = self._corridor_polylines(route_geometry)
+        if polylines is None:
+            log(f"    ℹ Route too long for corridor search, sampling for {category} instead")
+            return None
+        
+        try:
+            segment_places = await asyncio.gather(
+                *(self.http.run(self._corridor_pages_steps(encoded, text_query, included_type, category))
+                  for encoded in polylines)
+            )
+        except Exception as e:
+            log(f"    ℹ Corridor search failed ({e}), sampling for {category} instead")
+            return None
+        places = [place for segment in segment_places for place in segment]
+        return self._parse_corridor(places, route_geometry, max_offset_m, parse_point)
+    
+    async def find_pet_friendly_hotel(self, city_name: str, lat: float, lon: float,
+                                      pet_friendly_only: bool = True) -> Optional[Hotel]:
+        try:
+            data = await self._post(self.NEARBY_SEARCH_URL, self._hotel_request(lat, lon), 'hotels', field_mask=self._field_mask('hotel'))
+            return self._parse_hotels(data, city_name, lat, lon, pet_friendly_only)
+        except Exception as e:
+            print(f"  Hotel search error for {city_name}: {e}")
+            return None
+    
+    async def find_emergency_vet(self, city_name: str, lat: float, lon: float) -> Optional[Veterinarian]:
+        try:
+            data = await self._post(self.NEARBY_SEARCH_URL, self._vet_request(lat, lon), 'vets', field_mask=self._field_mask('vet'))
+            return self._parse_vets(data, city_name, lat, lon)
+        except Exception as e:
+            print(f"  Vet search error for {city_name}: {e}")
+            return None
+    
+    async def find_parks_along_route(self, route_geometry: RouteLike,
+                                     sample_interval_miles: Optional[int] = None,
+                                     log: Callable[[str], None] = print) -> List[Attraction]:
+        all_parks = []
+        seen_parks = set()
+        
+        route = RouteGeometry.wrap(route_geometry)
+        if self.corridor_search:
+            log(f"  Searching route corridor for parks...")
+            corridor_parks = await self._corridor_scan(
+                route, "park", None, 'parks', 5000,
+                lambda data, lat, lon, distance_m: self._parse_route_parks(data, lat, lon, distance_m, seen_parks),
+                log
+            )
+            if corridor_parks is not None:
+                self._sort_by_popularity(corridor_parks)
+                return corridor_parks
+        
+        log(f"  Scanning route for parks...")
+        
+        scan = await self._scan_route(route, sample_interval_miles,
+                                      self.NEARBY_SEARCH_URL, self._route_park_request, 'parks', log)
+        for lat, lon, distance_m, data in scan:
+            if isinstance(data, Exception):
+                continue  # Continue on error
+            data = {'places': self._places_within(data.get('places', []), route, self.SAMPLING_RADIUS_M['parks'])}
+            all_parks.extend(self._parse_route_parks(data, lat, lon, distance_m, seen_parks))
+        
+        self._sort_by_popularity(all_parks)
+        return all_parks
+    
+    async def find_parks_nearby(self, city_name: str, lat: float, lon: float, limit: int = 3) -> List[Attraction]:
+        try:
+            data = await self._post(self.NEARBY_SEARCH_URL, self._city_park_request(lat, lon), 'parks', field_mask=self._field_mask('city_park'))
+            return self._parse_city_parks(data, city_name, lat, lon, limit)
+        except Exception as e:
+            print(f"  Park search error for {city_name}: {e}")
+            return []
+    
+    async def find_museums_in_city(self, city_name: str, lat: float, lon: float, limit: int = 3) -> List[Attraction]:
+        try:
+            data = await self._post(self.NEARBY_SEARCH_URL, self._museum_request(lat, lon), 'museums', field_mask=self._field_mask('museum'))
+            museums = self._parse_museums(data, city_name, lat, lon, limit)
+            await self._add_wikipedia_info(museums)
+            return museums
+        except Exception as e:
+            print(f"  Museum search error for {city_name}: {e}")
+            return []
+    
+    async def find_dog_friendly_restaurants(self, city_name: str, lat: float, lon: float,
+                                            limit: int = 5) -> List[Attraction]:
+        try:
+            data = await self._post(self.TEXT_SEARCH_URL, self._restaurant_request(city_name, lat, lon), 'restaurants', field_mask=self._field_mask('restaurant'))
+            return self._parse_restaurants(data, city_name, lat, lon, limit)
+        except Exception as e:
+            print(f"  Restaurant search error for {city_name}: {e}")
+            return []
+    
+    async def find_dog_parks_in_city(self, city_name: str, lat: float, lon: float, limit: int = 2) -> List[Attraction]:
+        try:
+            data = await self._post(self.TEXT_SEARCH_URL, self._dog_park_request(city_name, lat, lon), 'dog_parks', field_mask=self._field_mask('dog_park'))
+            return self._parse_dog_parks(data, city_name, lat, lon, limit)
+        except Exception as e:
+            print(f"  Dog park search error for {city_name}: {e}")
+            return []
+    
+    async def find_scenic_viewpoints_along_route(self, route_geometry: RouteLike,
+                                                 sample_interval_miles: Optional[int] = None,
+                                                 log: Callable[[str], None] = print) -> List[Attraction]:
+        viewpoints = []
+        seen_viewpoints = set()
+        
+        route = RouteGeometry.wrap(route_geometry)
+        if self.corridor_search:
+            corridor_viewpoints = await self._corridor_scan(
+                route, self.VIEWPOINT_QUERY, None, 'viewpoints', 25000,
+                lambda data, lat, lon, distance_m: self._parse_viewpoints(data, lat, lon, distance_m, seen_viewpoints),
+                log
+            )
+            if corridor_viewpoints is not None:
+                self._sort_by_popularity(corridor_viewpoints)
+                return corridor_viewpoints
+        
+        scan = await self._scan_route(route, sample_interval_miles,
+                                      self.TEXT_SEARCH_URL, self._viewpoint_request, 'viewpoints', log)
+        for lat, lon, distance_m, data in scan:
+            if isinstance(data, Exception):
+                log(f"    ⚠ Viewpoint search error at mile {int(distance_m/1609.34)}: {data}")
+                continue
+            viewpoints.extend(self._parse_viewpoints(data, lat, lon, distance_m, seen_viewpoints))
+        
+        self._sort_by_popularity(viewpoints)
+        return viewpoints
+    
+    async def find_national_parks_by_state(self, state_name: str, limit: int = None) -> List[NationalPark]:
+        try:
+            data = await self._post(self.TEXT_SEARCH_URL, self._national_park_request(state_name), 'national_parks', field_mask=self._field_mask('national_park'))
+            national_parks = self._parse_national_parks(data, state_name)
+            
+            # Additional search for USDA National Forests
+            try:
+                forest_data = await self._post(self.TEXT_SEARCH_URL, self._national_forest_request(state_name), 'national_parks', field_mask=self._field_mask('national_forest'))
+                national_parks.extend(self._parse_national_forests(forest_data, state_name, national_parks))
+            except Exception as forest_error:
+                print(f"    ℹ Note: Could not search USDA forests: {forest_error}")
+            
+            self._sort_by_popularity(national_parks)
+            if limit:
+                national_parks = national_parks[:limit]
+            
+            await self._add_wikipedia_info(national_parks)
+            return national_parks
+        
+        except Exception as e:
+            print(f"    ⚠ Error searching for national parks in {state_name}: {e}")
+            return []
+    
+    async def find_monuments_by_state(self, state_name: str, limit: int = None) -> List[Attraction]:
+        try:
+            data = await self._post(self.TEXT_SEARCH_URL, self._monument_request(state_name), 'monuments', field_mask=self._field_mask('monument'))
+            monuments = self._parse_monuments(data, state_name, limit)
+            await self._add_wikipedia_info(monuments)
+            return monuments
+        except Exception as e:
+            print(f"    ⚠ Error searching for monuments in {state_name}: {e}")
+            return []
+    
+    async def find_ev_chargers_in_city(self, city_name: str, lat: float, lon: float, limit: int = 5) -> List[Attraction]:
+        try:
+            data = await self._post(self.NEARBY_SEARCH_URL, self._city_charger_request(lat, lon), 'ev_chargers', field_mask=self._field_mask('city_charger'))
+            chargers = self._parse_chargers(data, city_name, lat, lon)
+            self._sort_by_popularity(chargers)
+            return chargers[:limit] if limit else chargers
+        except Exception as e:
+            print(f"    ⚠ Error searching for EV chargers in {city_name}: {e}")
+            return []
+    
+    async def find_ev_chargers_along_route(self, route_geometry: RouteLike,
+                                           sample_interval_miles: Optional[int] = None,
+                                           log: Callable[[str], None] = print) -> List[Attraction]:
+        route = RouteGeometry.wrap(route_geometry)
+        if self.corridor_search:
+            corridor_chargers = await self._corridor_scan(
+                route, "EV charging station", "electric_vehicle_charging_station", 'ev_chargers', 20000,
+                lambda data, lat, lon, distance_m: self._parse_chargers(data, f"Mile {int(distance_m / 1609.34)}", lat, lon),
+                log
+            )
+            if corridor_chargers is not None:
+                return self._dedupe_by_name(corridor_chargers)
+        
+        chargers = []
+        
+        scan = await self._scan_route(route, sample_interval_miles,
+                                      self.NEARBY_SEARCH_URL, self._route_charger_request, 'ev_chargers', log)
+        for lat, lon, distance_m, data in scan:
+            if isinstance(data, Exception):
+                log(f"    ⚠ Error searching chargers at mile {int(distance_m / 1609.34)}: {data}")
+                continue
+            chargers.extend(self._parse_chargers(data, f"Mile {int(distance_m / 1609.34)}", lat, lon))
+        
+        return self._dedupe_by_name(chargers)
+    
+    async def scan_route(self, route_geometry: RouteLike, categories: Optional[List[str]] = None,
+                         sample_interval_miles: Optional[int] = None,
+                         log: Callable[[str], None] = print) -> Dict[str, List[Attraction]]:
+        """Multi-category route scan (see GooglePlacesFinder.scan_route) with every request in flight at once."""
+        route = RouteGeometry.wrap(route_geometry)
+        if categories is None:
+            categories = self.ROUTE_SCAN_CATEGORIES
+        categories = [c for c in self.ROUTE_SCAN_CATEGORIES if c in categories]
+        if not categories:
+            return {}
+        
+        if self.corridor_search:
+            finders = self._route_scan_finders()
+            results = await asyncio.gather(*(finders[category](route, sample_interval_miles, log) for category in categories))
+            return dict(zip(categories, results))
+        
+        async def run(batch):
+            return await asyncio.gather(
+                *(self._post(request['url'], request['body'], request['category'], field_mask=request['field_mask'])
+                  for request in batch),
+                return_exceptions=True
+            )
+        
+        requests = self._route_scan_requests(route, categories, sample_interval_miles, log)
+        responses = await run(requests)
+        followups = self._route_scan_followups(route, requests, responses)
+        followup_responses = await run([request for _, request in followups])
+        
+        log(f"    {len(requests) + len(followups)} route scan requests for {', '.join(categories)}")
+        return self._parse_route_scan(route, requests, responses, followups, followup_responses, log)
@@ -0,0 +1,183 @@
+"""Persistent caches for external API responses."""
+
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any
+from config import LOCATION_CACHE_FLUSH_EVERY
+
+
+def _normalize(value: Any) -> Any:
+    """Round floats so near-identical coordinates share a cache key."""
+    if isinstance(value, float):
+        return round(value, 5)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class ResponseCache:
+    """SQLite-backed response cache with per-category TTLs and LRU eviction."""
+
+    def __init__(self, path: str, max_entries: int = 20000, ttls: Optional[Dict[str, int]] = None,
+                 default_ttl: int = 7 * 86400):
+        """
+        Args:
+            path: SQLite database file (':memory:' for a throwaway cache)
+            max_entries: Size cap; least recently used entries are evicted beyond it
+            ttls: Seconds to keep a response, keyed by request category
+            default_ttl: TTL for categories not listed in ttls
+        """
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, category TEXT, value TEXT, '
+            'expires_at REAL, last_access REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(url: str, body: Dict, field_mask: str = '') -> str:
+        """Build a cache key from the normalized request."""
+        payload = json.dumps([url, _normalize(body), field_mask], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a cached response, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Dict, category: str = 'default') -> None:
+        """Store a response and evict least recently used entries over the size cap."""
+        now = time.time()
+        ttl = self.ttls.get(category, self.default_ttl)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, category, value, expires_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, category, json.dumps(value), now + ttl, now)
+            )
+            count = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    'DELETE FROM responses WHERE key IN ('
+                    'SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)',
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            size = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': size}
+
+
+class LocationCache:
+    """JSON-file cache for geocoding results, including negative results.
+
+    New entries are written in batches: the file is rewritten every
+    flush_every inserts and by flush(), which the planners call when a trip
+    finishes, rather than on every insert.
+    """
+
+    def __init__(self, path: str, flush_every: int = LOCATION_CACHE_FLUSH_EVERY):
+        """
+        Args:
+            path: JSON file to load from and persist to
+            flush_every: Unsaved entries that trigger a write
+        """
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Any] = {}
+        self._unsaved = 0
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️  Ignoring unreadable location cache {self.path}: {e}")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for key (None for a cached negative result)."""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, writing the cache file once flush_every entries are unsaved."""
+        with self._lock:
+            self._entries[key] = value
+            self._unsaved += 1
+            if self._unsaved >= self.flush_every:
+                self._save()
+
+    def flush(self) -> None:
+        """Write the cache file if any entries are unsaved."""
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    def clear(self) -> None:
+        """Remove every entry and the cache file."""
+        with self._lock:
+            self._entries = {}
+            self._unsaved = 0
+            if self.path.exists():
+                self.path.unlink()
+
+    def _save(self) -> None:
+        """Write entries atomically so an interrupted run can't corrupt the file."""
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._entries, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self._unsaved = 0
+        except OSError as e:
+            print(f"  ⚠️  Could not save location cache {self.path}: {e}")
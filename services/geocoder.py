@@ -1,19 +1,44 @@
 """Geocoding service using OpenStreetMap Nominatim."""
 
-import requests
-from typing import Optional, Tuple
+import re
+from typing import Any, Optional, Tuple, Dict
 from config import STATE_NAME_TO_ABBREV
+from services.cache import LocationCache
+from services.http_client import ServiceClient, JSONRequest, Blocking, RequestSteps
+from utils.geohash import encode_geohash
 
 
 class NominatimGeocoder:
     """Geocode city names to coordinates."""
     
     BASE_URL = "https://nominatim.openstreetmap.org/search"
+    REVERSE_URL = "https://nominatim.openstreetmap.org/reverse"
+    REVERSE_CACHE_PRECISION = 5  # Geohash cells of ~4.9 km, about city level
     
-    def __init__(self):
+    def __init__(self, cache: Optional[LocationCache] = None, reverse_cache: Optional[LocationCache] = None):
+        """
+        Args:
+            cache: Forward geocoding cache keyed on normalized queries
+            reverse_cache: Reverse geocoding cache keyed on geohash cells
+        """
+        self.cache = cache
+        self.reverse_cache = reverse_cache
         self.headers = {
             'User-Agent': 'RoadTripPlanner/2.0 (Personal trip planning)'
         }
+        self.http = ServiceClient(headers=self.headers, timeout=10)
+    
+    @staticmethod
+    def normalize_query(address: str) -> str:
+        """Normalize a query so "Atlanta, GA", "atlanta ga" and "Atlanta,GA" match."""
+        return ' '.join(re.sub(r'[^\w\s]', ' ', address.lower()).split())
+    
+    @staticmethod
+    def _cached(cache: LocationCache, key: str) -> Tuple[bool, Any]:
+        """(found, value) for key; a cached None is a negative result."""
+        if key in cache:
+            return True, cache.get(key)
+        return False, None
     
     def geocode(self, address: str) -> Optional[Tuple[float, float, str]]:
         """
@@ -22,59 +47,97 @@ class NominatimGeocoder:
         Returns:
             (lat, lon, display_name) or None
         """
-        params = {
+        return self.http.run(self._geocode_steps(address))
+    
+    def _geocode_steps(self, address: str) -> RequestSteps:
+        """geocode() as request steps, shared with the async geocoder."""
+        cache_key = self.normalize_query(address)
+        if self.cache is not None:
+            found, cached = yield Blocking(self._cached, self.cache, cache_key)
+            if found:
+                return tuple(cached) if cached else None
+        
+        try:
+            data = yield JSONRequest('GET', self.BASE_URL, params=self._geocode_params(address))
+        except Exception as e:
+            # Don't cache transient failures
+            print(f"Geocoding error: {e}")
+            return None
+        
+        result = self._parse_geocode(data)
+        if self.cache is not None:
+            yield Blocking(self.cache.set, cache_key, list(result) if result else None)
+        return result
+    
+    @staticmethod
+    def _geocode_params(address: str) -> Dict:
+        return {
             'q': address,
             'format': 'json',
             'limit': 1
         }
+    
+    @staticmethod
+    def _parse_geocode(data) -> Optional[Tuple[float, float, str]]:
+        if not data:
+            return None
+        return (float(data[0]['lat']), float(data[0]['lon']), data[0]['display_name'])
+    
+    def reverse_geocode(self, lat: float, lon: float) -> Optional[str]:
+        """Reverse geocode coordinates to city name."""
+        return self.http.run(self._reverse_geocode_steps(lat, lon))
+    
+    def _reverse_geocode_steps(self, lat: float, lon: float) -> RequestSteps:
+        """reverse_geocode() as request steps, shared with the async geocoder."""
+        cache_key = self._reverse_cache_key(lat, lon)
+        if self.reverse_cache is not None:
+            found, cached = yield Blocking(self._cached, self.reverse_cache, cache_key)
+            if found:
+                return cached
         
         try:
-            response = requests.get(self.BASE_URL, params=params, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data:
-                result = data[0]
-                return (float(result['lat']), float(result['lon']), result['display_name'])
-            return None
+            data = yield JSONRequest('GET', self.REVERSE_URL, params=self._reverse_params(lat, lon))
         except Exception as e:
-            print(f"Geocoding error: {e}")
+            # Don't cache transient failures
+            print(f"Reverse geocoding error: {e}")
             return None
+        
+        city_name = self._parse_reverse(data)
+        if self.reverse_cache is not None:
+            yield Blocking(self.reverse_cache.set, cache_key, city_name)
+        return city_name
     
-    def reverse_geocode(self, lat: float, lon: float) -> Optional[str]:
-        """Reverse geocode coordinates to city name."""
-        url = "https://nominatim.openstreetmap.org/reverse"
-        params = {
+    def _reverse_cache_key(self, lat: float, lon: float) -> str:
+        return encode_geohash(lat, lon, self.REVERSE_CACHE_PRECISION)
+    
+    @staticmethod
+    def _reverse_params(lat: float, lon: float) -> Dict:
+        return {
             'lat': lat,
             'lon': lon,
             'format': 'json',
             'zoom': 10  # City level
         }
+    
+    def _parse_reverse(self, data: Dict) -> Optional[str]:
+        """Build "City, ST" from a reverse geocoding response."""
+        address = data.get('address', {})
         
-        try:
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            address = data.get('address', {})
-            
-            # Try to get city/town name and state - NEVER use county
-            city = (address.get('city') or address.get('town') or 
-                   address.get('village') or address.get('hamlet'))
-            state = address.get('state')
-            
-            if city and state:
-                # Get state abbreviation if possible
-                state_abbrev = self._get_state_abbrev(state)
-                return f"{city}, {state_abbrev if state_abbrev else state}"
-            elif city:
-                return city
-            # Don't return county names - skip this location if no actual city found
-            return None
-        except Exception as e:
-            print(f"Reverse geocoding error: {e}")
-            return None
+        # Try to get city/town name and state - NEVER use county
+        city = (address.get('city') or address.get('town') or 
+               address.get('village') or address.get('hamlet'))
+        state = address.get('state')
+        
+        if city and state:
+            # Get state abbreviation if possible
+            state_abbrev = self._get_state_abbrev(state)
+            return f"{city}, {state_abbrev if state_abbrev else state}"
+        elif city:
+            return city
+        # Don't return county names - skip this location if no actual city found
+        return None
     
     def _get_state_abbrev(self, state_name: str) -> Optional[str]:
         """Convert state name to abbreviation."""
         return STATE_NAME_TO_ABBREV.get(state_name.lower())
+
@@ -0,0 +1,167 @@
+"""Shared pooled HTTP sessions for the external API services."""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from typing import Any, Callable, Dict, Generator, NamedTuple, Optional, Union
+from config import HTTP_POOL_SIZE
+from services.rate_limiter import get_rate_limiter
+from services.single_flight import SingleFlight, request_key
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+# Process-wide, so duplicate requests coalesce across clients, threads and trips
+_flight = SingleFlight()
+
+
+class JSONRequest(NamedTuple):
+    """An HTTP request yielded by a request generator; the decoded JSON body is sent back."""
+    method: str
+    url: str
+    params: Optional[Dict] = None
+    json: Optional[Dict] = None
+    headers: Optional[Dict[str, str]] = None
+
+
+class Blocking:
+    """Blocking local I/O (a cache or store call) yielded by a request generator; its result is sent back."""
+    
+    def __init__(self, func: Callable, *args):
+        self.func = func
+        self.args = args
+    
+    def __call__(self) -> Any:
+        return self.func(*self.args)
+
+
+# Service logic written once as a generator of JSONRequest and Blocking steps,
+# returning its result; ServiceClient.run and AsyncServiceClient.run execute it
+RequestSteps = Generator[Union[JSONRequest, Blocking], Any, Any]
+
+
+def get_session(url: str, pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """
+    Get the keep-alive session for a URL's host, creating it on first use.
+    
+    Args:
+        url: Any URL on the host
+        pool_size: Maximum pooled connections to the host (used on creation only)
+        
+    Returns:
+        requests.Session shared by every client talking to that host
+    """
+    parts = urlsplit(url)
+    host_key = f"{parts.scheme}://{parts.netloc}"
+    
+    with _sessions_lock:
+        session = _sessions.get(host_key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount(host_key, adapter)
+            _sessions[host_key] = session
+        return session
+
+
+def close_sessions() -> None:
+    """Close every pooled session (e.g. at application shutdown)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+class ServiceClient:
+    """HTTP client carrying one service's default headers and timeout over the shared pools.
+    
+    Every request first acquires from its host's token bucket, so callers never
+    need to sleep between requests themselves. The *_json methods also coalesce
+    identical requests that are in flight at the same time into one call.
+    """
+    
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: float = 10):
+        """
+        Args:
+            headers: Headers sent with every request (per-call headers override them)
+            timeout: Default request timeout in seconds
+        """
+        self.headers = headers or {}
+        self.timeout = timeout
+    
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """Send a request through the host's pooled session, within its rate limit."""
+        limiter = get_rate_limiter(url)
+        if limiter is not None:
+            limiter.acquire()
+        
+        merged_headers = {**self.headers, **(headers or {})}
+        return get_session(url).request(
+            method,
+            url,
+            headers=merged_headers,
+            timeout=timeout if timeout is not None else self.timeout,
+            **kwargs
+        )
+    
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> requests.Response:
+        """Send a GET request."""
+        return self.request('GET', url, params=params, **kwargs)
+    
+    def post(self, url: str, json: Optional[Dict] = None, **kwargs) -> requests.Response:
+        """Send a POST request with a JSON body."""
+        return self.request('POST', url, json=json, **kwargs)
+    
+    def request_json(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                     params: Optional[Dict] = None, json: Optional[Dict] = None, **kwargs) -> Any:
+        """
+        Send a request and return its decoded JSON body (raises on HTTP errors).
+        
+        Concurrent callers sending the same request share one network call and
+        the same parsed result, which they must treat as read-only.
+        """
+        merged_headers = {**self.headers, **(headers or {})}
+        key = request_key(method, url, params, json, merged_headers)
+        
+        def send():
+            response = self.request(method, url, headers=headers, params=params, json=json, **kwargs)
+            response.raise_for_status()
+            return response.json()
+        
+        return _flight.do(key, send)
+    
+    def get_json(self, url: str, params: Optional[Dict] = None, **kwargs) -> Any:
+        """GET and return the JSON body, coalescing identical in-flight requests."""
+        return self.request_json('GET', url, params=params, **kwargs)
+    
+    def post_json(self, url: str, json: Optional[Dict] = None, **kwargs) -> Any:
+        """POST a JSON body and return the JSON response, coalescing identical in-flight requests."""
+        return self.request_json('POST', url, json=json, **kwargs)
+    
+    def run(self, steps: RequestSteps) -> Any:
+        """
+        Execute a request generator and return its result.
+        
+        Services yield their requests and cache accesses instead of performing
+        them, so the same caching, parsing and error handling runs here and on
+        the async client (services.async_services.AsyncServiceClient.run). A
+        step that raises has its exception thrown into the generator.
+        """
+        value, error = None, None
+        while True:
+            try:
+                step = steps.throw(error) if error is not None else steps.send(value)
+            except StopIteration as done:
+                return done.value
+            
+            value, error = None, None
+            try:
+                if isinstance(step, Blocking):
+                    value = step()
+                else:
+                    value = self.request_json(step.method, step.url, headers=step.headers,
+                                              params=step.params, json=step.json)
+            except Exception as e:
+                error = e
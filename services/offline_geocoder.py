@@ -0,0 +1,138 @@
+"""Offline reverse geocoding from a bundled US places gazetteer."""
+
+import csv
+import sys
+import numpy as np
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+# PyInstaller unpacks bundled data under sys._MEIPASS
+_BASE_DIR = Path(getattr(sys, '_MEIPASS', Path(__file__).parent.parent))
+GAZETTEER_FILE = _BASE_DIR / 'resources' / 'us_places.csv'
+
+
+class OfflineReverseGeocoder:
+    """
+    Resolve route points to gazetteer cities without network calls.
+    
+    A point resolves to the most populous place within max_distance_miles, so
+    neighborhoods listed in the gazetteer (GeoNames has entries such as
+    "Times Square" or "Chicago Loop") give way to the city around them, as
+    Nominatim's city-level names do. Cities are stored as unit vectors on the
+    sphere, so a batch of points is one matrix product per chunk. Forward
+    geocoding, and reverse geocoding when the gazetteer can't be loaded, is
+    delegated to the fallback geocoder (normally NominatimGeocoder).
+    """
+    
+    EARTH_RADIUS_MILES = 3959
+    CHUNK_SIZE = 256  # Query points per matrix product, bounds peak memory
+    
+    def __init__(
+        self,
+        fallback=None,
+        min_population: int = 1000,
+        max_distance_miles: float = 15,
+        gazetteer_path: Path = GAZETTEER_FILE
+    ):
+        """
+        Args:
+            fallback: Geocoder used when the gazetteer is unavailable
+            min_population: Ignore places smaller than this
+            max_distance_miles: Search radius; points with no place this close resolve to None
+            gazetteer_path: CSV with name, state, lat, lon, population columns
+        """
+        self.fallback = fallback
+        self.min_population = min_population
+        self.max_distance_miles = max_distance_miles
+        self.names: List[str] = []
+        self.population = np.empty(0, dtype=np.int64)
+        self._unit_vectors = np.empty((0, 3))
+        
+        try:
+            self._load(gazetteer_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  ⚠️  Offline gazetteer unavailable ({e}), using online reverse geocoding")
+    
+    @property
+    def available(self) -> bool:
+        """True when the gazetteer loaded and offline lookups are possible."""
+        return len(self.names) > 0
+    
+    def _load(self, path: Path):
+        """Load the gazetteer CSV into name and coordinate arrays."""
+        lats, lons, population = [], [], []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                self.names.append(f"{row['name']}, {row['state']}")
+                lats.append(float(row['lat']))
+                lons.append(float(row['lon']))
+                population.append(int(row['population']))
+        
+        self.population = np.array(population, dtype=np.int64)
+        self._unit_vectors = self._to_unit_vectors(np.array(lats), np.array(lons))
+    
+    @staticmethod
+    def _to_unit_vectors(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Convert lat/lon degrees to 3D unit vectors, shape (n, 3)."""
+        lat_rad = np.radians(lats)
+        lon_rad = np.radians(lons)
+        cos_lat = np.cos(lat_rad)
+        return np.column_stack((cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)))
+    
+    def geocode(self, address: str) -> Optional[Tuple[float, float, str]]:
+        """Forward geocoding isn't available offline; delegate to the fallback."""
+        return self.fallback.geocode(address) if self.fallback else None
+    
+    def reverse_geocode(self, lat: float, lon: float) -> Optional[str]:
+        """Reverse geocode a single point to "City, ST"."""
+        return self.reverse_geocode_many([(lat, lon)])[0]
+    
+    def reverse_geocode_many(
+        self,
+        points: Sequence[Tuple[float, float]],
+        min_population: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """
+        Find the most populous place of at least min_population near every point.
+        
+        Args:
+            points: (lat, lon) tuples
+            min_population: Override the instance population threshold
+            
+        Returns:
+            "City, ST" strings (None where no place is within max_distance_miles),
+            in the same order as points
+        """
+        if not points:
+            return []
+        
+        if not self.available:
+            if self.fallback is None:
+                return [None] * len(points)
+            return [self.fallback.reverse_geocode(lat, lon) for lat, lon in points]
+        
+        threshold = self.min_population if min_population is None else min_population
+        candidate_idx = np.flatnonzero(self.population >= threshold)
+        if candidate_idx.size == 0:
+            return [None] * len(points)
+        candidates = self._unit_vectors[candidate_idx]
+        
+        coords = np.asarray(points, dtype=np.float64)
+        queries = self._to_unit_vectors(coords[:, 0], coords[:, 1])
+        max_angle = self.max_distance_miles / self.EARTH_RADIUS_MILES
+        
+        candidate_population = self.population[candidate_idx]
+        min_dot = np.cos(max_angle)
+        
+        results: List[Optional[str]] = []
+        for start in range(0, len(queries), self.CHUNK_SIZE):
+            dots = queries[start:start + self.CHUNK_SIZE] @ candidates.T
+            # Population of each place in range, -1 elsewhere; ties go to the nearer place
+            in_range = dots >= min_dot
+            scores = np.where(in_range, candidate_population, -1)
+            best_population = scores.max(axis=1)
+            best = np.argmax(np.where(scores == best_population[:, None], dots, -2.0), axis=1)
+            for idx, population in zip(best, best_population):
+                results.append(self.names[candidate_idx[idx]] if population >= 0 else None)
+        
+        return results
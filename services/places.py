@@ -1,38 +1,409 @@
 """Google Places API service for finding hotels, vets, and attractions."""
 
-import time
-import requests
-from typing import List, Optional
+import threading
+import numpy as np
+from typing import List, Optional, Dict, Tuple, Callable
 from models import Hotel, Veterinarian, Attraction, NationalPark
 from services.wikipedia import WikipediaHelper
+from services.cache import ResponseCache
+from services.poi_store import POIStore
+from services.http_client import ServiceClient, JSONRequest, Blocking, RequestSteps
 from utils.distance import haversine_distance, calculate_popularity_score
-from config import PET_FRIENDLY_CHAINS
+from utils.polyline import encode_polyline, simplify_polyline
+from utils.coverage import plan_corridor_coverage
+from utils.route_geometry import RouteGeometry, RouteLike
+from utils.spatial_hash import SpatialHash
+from config import (
+    PET_FRIENDLY_CHAINS, PLACES_CACHE_TTL, ROUTE_SCAN_COVERAGE, PLACES_CORRIDOR_SEGMENT_MILES, PLACES_CORRIDOR_SIMPLIFY_METERS,
+    PLACES_CORRIDOR_MAX_POLYLINE_CHARS, PLACES_CORRIDOR_MAX_PAGES
+)
 
 
 class GooglePlacesFinder:
-    """Find hotels, vets, and attractions using Google Places API."""
+    """Find hotels, vets, and attractions using Google Places API.
+    
+    Each finder is split into a request builder (``_*_request``) and a
+    response parser (``_parse_*``) around a single transport call, so the
+    async client in services/async_services.py reuses the same logic.
+    """
     
     NEARBY_SEARCH_URL = "https://places.googleapis.com/v1/places:searchNearby"
     TEXT_SEARCH_URL = "https://places.googleapis.com/v1/places:searchText"
     
-    def __init__(self, api_key: str):
+    VIEWPOINT_QUERY = "scenic viewpoint OR overlook OR vista OR observation point"
+    
+    VIEWPOINT_KEYWORDS = [
+        'overlook', 'viewpoint', 'scenic', 'vista', 'lookout',
+        'observation', 'panorama', 'view point', 'viewing area',
+        'summit', 'peak', 'point', 'rim', 'canyon view', 'valley view'
+    ]
+    
+    NATIONAL_PARK_KEYWORDS = [
+        'national park', 'national monument', 'national recreation area',
+        'national memorial', 'national historic', 'national historical',
+        'national military park', 'national battlefield', 'national seashore',
+        'national lakeshore', 'national preserve', 'national parkway',
+        'national river', 'national wild', 'national scenic', 'national forest'
+    ]
+    
+    # Response fields each request kind's parser reads, by request builder name
+    # (_<kind>_request). Requests ask for nothing more, which keeps responses
+    # small and most searches out of the pricier Places SKUs.
+    BASE_FIELDS = ('displayName', 'formattedAddress', 'location', 'rating', 'userRatingCount', 'websiteUri')
+    REQUEST_FIELDS = {
+        'hotel': BASE_FIELDS + ('id', 'priceLevel', 'internationalPhoneNumber', 'allowsDogs'),
+        'vet': BASE_FIELDS + ('id', 'internationalPhoneNumber', 'regularOpeningHours'),
+        'route_park': BASE_FIELDS + ('id',),
+        'city_park': BASE_FIELDS,
+        'museum': BASE_FIELDS,
+        'restaurant': BASE_FIELDS,
+        'dog_park': BASE_FIELDS,
+        'viewpoint': BASE_FIELDS + ('id',),
+        'national_park': BASE_FIELDS,
+        'national_forest': BASE_FIELDS,
+        'monument': BASE_FIELDS,
+        'city_charger': BASE_FIELDS,
+        'route_charger': BASE_FIELDS,
+    }
+    
+    # Request kind used for each route scan category
+    ROUTE_SCAN_KINDS = {'parks': 'route_park', 'viewpoints': 'viewpoint', 'ev_chargers': 'route_charger'}
+    
+    def __init__(self, api_key: str, cache: Optional[ResponseCache] = None, corridor_search: bool = False,
+                 poi_store: Optional[POIStore] = None):
+        """
+        Args:
+            api_key: Google Places API key
+            cache: Response cache, or None to always query
+            corridor_search: Scan routes with search-along-route requests instead of fixed-interval sampling
+            poi_store: Local POI store answering Nearby Searches in already-searched areas, or None
+        """
         self.api_key = api_key
+        self.cache = cache
+        self.poi_store = poi_store
+        self.corridor_search = corridor_search
         self.headers = {
             'Content-Type': 'application/json',
             'X-Goog-Api-Key': api_key,
             'X-Goog-FieldMask': 'places.displayName,places.formattedAddress,places.location,places.rating,places.userRatingCount,places.priceLevel,places.id,places.internationalPhoneNumber,places.websiteUri,places.currentOpeningHours,places.regularOpeningHours,places.allowsDogs'
         }
+        self.http = ServiceClient(headers=self.headers, timeout=10)
+        
+        # Route scan search points used and skipped as repeats of earlier stretches
+        self.route_scan_stats = {'search_points': 0, 'repeat_points_skipped': 0}
+        self._stats_lock = threading.Lock()
     
-    def find_pet_friendly_hotel(self, city_name: str, lat: float, lon: float, pet_friendly_only: bool = True) -> Optional[Hotel]:
-        """Find the top hotel in a city.
+    def _post(self, url: str, request_body: Dict, category: str, field_mask: Optional[str] = None) -> Dict:
+        """
+        POST a Places request, serving it from the response cache or POI store when possible.
         
         Args:
-            city_name: Name of the city
-            lat: Latitude
-            lon: Longitude
-            pet_friendly_only: If True, filter to pet-friendly hotels only. If False, return any hotel.
+            url: Places endpoint
+            request_body: JSON request body
+            category: Request category, used for the cache TTL
+            field_mask: Fields to return (see _field_mask); defaults to every field any finder reads
+        
+        Returns:
+            Parsed JSON response (raises on HTTP errors)
+        """
+        return self.http.run(self._post_steps(url, request_body, category, field_mask))
+    
+    def _post_steps(self, url: str, request_body: Dict, category: str, field_mask: Optional[str]) -> RequestSteps:
+        """_post() as request steps, shared with the async finder."""
+        field_mask = self._store_field_mask(url, field_mask or self.headers['X-Goog-FieldMask'])
+        cache_key = None
+        if self.cache is not None:
+            cache_key = ResponseCache.make_key(url, request_body, field_mask)
+            cached = yield Blocking(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+        
+        if self._uses_store(url):
+            stored = yield Blocking(self.poi_store.lookup, request_body, field_mask, category)
+            if stored is not None:
+                return stored
+        
+        data = yield JSONRequest('POST', url, json=request_body, headers={'X-Goog-FieldMask': field_mask})
+        
+        if cache_key is not None:
+            yield Blocking(self.cache.set, cache_key, data, category)
+        if self._uses_store(url):
+            yield Blocking(self.poi_store.record, request_body, field_mask, data)
+        return data
+    
+    # Local POI store
+    
+    def _uses_store(self, url: str) -> bool:
+        # Nearby Search only: text search results can't be bounded by area
+        return self.poi_store is not None and url == self.NEARBY_SEARCH_URL
+    
+    def _store_field_mask(self, url: str, field_mask: str) -> str:
+        # The store keys places by ID, so Nearby Searches must return it
+        if not self._uses_store(url) or 'places.id' in field_mask.split(','):
+            return field_mask
+        return field_mask + ',places.id'
+    
+    @staticmethod
+    def _add_wikipedia_info(attractions: List) -> None:
+        """Fill in Wikipedia URL and summary for each attraction."""
+        for attraction in attractions:
+            wiki_info = WikipediaHelper.search_wikipedia(attraction.name)
+            if wiki_info:
+                attraction.wikipedia_url = wiki_info.get('url')
+                attraction.wikipedia_summary = wiki_info.get('summary')
+    
+    @staticmethod
+    def _route_sample_points(
+        route_geometry: RouteLike,
+        sample_interval_miles: float
+    ) -> List[Tuple[float, float, float]]:
+        """
+        Pick a route vertex every sample_interval_miles.
+        
+        Args:
+            route_geometry: RouteGeometry or list of [lon, lat] coordinates (GeoJSON order)
+            sample_interval_miles: Distance between sample points
+        
+        Returns:
+            (lat, lon, distance_from_start_m) tuples
+        """
+        return RouteGeometry.wrap(route_geometry).sample_points(sample_interval_miles * 1609.34)
+    
+    # Each route scan category's own search radius: fixed-interval sampling searches
+    # at it, and wider coverage circles only keep the places within it of the route
+    SAMPLING_RADIUS_M = {'parks': 5000, 'viewpoints': 25000, 'ev_chargers': 20000}
+    # Original sampling interval by route scan category, the call count coverage plans are logged against
+    SAMPLING_INTERVAL_MILES = {'parks': 25, 'viewpoints': 75, 'ev_chargers': 15}
+    
+    def _route_search_points(
+        self,
+        route_geometry: RouteLike,
+        category: str,
+        sample_interval_miles: Optional[float] = None,
+        label: Optional[str] = None,
+        log: Callable[[str], None] = print,
+        categories: Optional[List[str]] = None
+    ) -> Tuple[List[Tuple[float, float, float]], float]:
+        """
+        Choose where to search along the route for a scan category.
+        
+        By default search circles come from a coverage plan over the corridor
+        in config.ROUTE_SCAN_COVERAGE; passing sample_interval_miles restores
+        fixed-interval sampling at the category's original radius.
+        
+        Args:
+            route_geometry: RouteGeometry or list of [lon, lat] coordinates
+            category: Route scan category (key of config.ROUTE_SCAN_COVERAGE)
+            sample_interval_miles: Sample every N miles instead of planning coverage
+            label: Name shown with the coverage summary (defaults to category)
+            log: Progress callback for the coverage and skip summaries
+            categories: Categories the points are shared by, whose fixed-interval
+                call counts the coverage plan is logged against (defaults to [category])
+        
+        Returns:
+            ((lat, lon, distance_from_start_m) points, search radius in meters)
+        """
+        if sample_interval_miles:
+            radius_m = self.SAMPLING_RADIUS_M[category]
+            points = self._route_sample_points(route_geometry, sample_interval_miles)
+        else:
+            radius_m, corridor_m = ROUTE_SCAN_COVERAGE[category]
+            plan = plan_corridor_coverage(route_geometry, radius_m, corridor_m)
+            sampling_calls = sum(
+                len(self._route_sample_points(route_geometry, self.SAMPLING_INTERVAL_MILES[c]))
+                for c in categories or [category]
+            )
+            log(f"    Coverage plan for {label or category}: {plan.calls} searches "
+                f"(fixed-interval sampling: {sampling_calls}) cover "
+                f"{plan.coverage_pct:.1f}% of the ±{corridor_m / 1000:g} km corridor")
+            points = plan.centers
+        return self._skip_repeat_points(points, radius_m, label or category, log), radius_m
+    
+    def _skip_repeat_points(
+        self,
+        points: List[Tuple[float, float, float]],
+        radius_m: float,
+        label: str,
+        log: Callable[[str], None] = print
+    ) -> List[Tuple[float, float, float]]:
+        """
+        Drop search points that repeat an earlier stretch of the route.
+        
+        A point is skipped when it lies within radius_m of a point already kept
+        at least two radii earlier along the route: the return leg of a round
+        trip, or a stretch shared by a via-city loop. Neighbouring points on the
+        same stretch are never skipped, so coverage of new road is unchanged.
+        
+        Args:
+            points: (lat, lon, distance_from_start_m) in route order
+            radius_m: Search radius of each point
+            label: Category name for the skip summary
+            log: Progress callback for the skip summary
+        
+        Returns:
+            Points to search, in route order
+        """
+        queried = SpatialHash(radius_m)
+        kept = []
+        for lat, lon, distance_m in points:
+            if any(distance_m - earlier > 2 * radius_m for earlier in queried.nearby(lat, lon, radius_m)):
+                continue
+            queried.add(lat, lon, distance_m)
+            kept.append((lat, lon, distance_m))
+        
+        skipped = len(points) - len(kept)
+        with self._stats_lock:
+            self.route_scan_stats['search_points'] += len(kept)
+            self.route_scan_stats['repeat_points_skipped'] += skipped
+        if skipped:
+            log(f"    ↩ {label}: skipped {skipped} search points already covered earlier on the route")
+        return kept
+    
+    def _field_mask(self, *kinds: str, extra: Tuple[str, ...] = ()) -> str:
+        """
+        X-Goog-FieldMask covering the fields parsed for the given request kinds.
+        
+        Args:
+            kinds: REQUEST_FIELDS keys (several for combined requests)
+            extra: Additional place fields, e.g. 'types'
+        """
+        fields = []
+        for kind in kinds:
+            fields.extend(field for field in self.REQUEST_FIELDS[kind] if field not in fields)
+        fields.extend(field for field in extra if field not in fields)
+        return ','.join(f"places.{field}" for field in fields)
+    
+    @staticmethod
+    def _sort_by_popularity(items: List) -> None:
+        """Sort places in place by rating * log(reviews), best first."""
+        items.sort(key=lambda p: calculate_popularity_score(p.rating, p.user_ratings_total), reverse=True)
+    
+    # Search-along-route corridor mode
+    
+    def _corridor_polylines(self, route_geometry: RouteLike) -> Optional[List[str]]:
+        """
+        Split the route into segments and encode each as a simplified polyline.
+        
+        Returns:
+            Encoded polylines in route order, or None if a segment is still too long to send
         """
+        polylines = []
+        for segment in RouteGeometry.wrap(route_geometry).split(PLACES_CORRIDOR_SEGMENT_MILES * 1609.34):
+            points = simplify_polyline([(lat, lon) for lon, lat in np.asarray(segment).tolist()],
+                                       PLACES_CORRIDOR_SIMPLIFY_METERS)
+            encoded = encode_polyline(points)
+            if len(encoded) > PLACES_CORRIDOR_MAX_POLYLINE_CHARS:
+                return None
+            polylines.append(encoded)
+        return polylines
+    
+    def _corridor_field_mask(self, category: str) -> str:
+        # Paging needs the token alongside the places
+        return self._field_mask(self.ROUTE_SCAN_KINDS[category]) + ',nextPageToken'
+    
+    @staticmethod
+    def _corridor_request(text_query: str, included_type: Optional[str], encoded_polyline: str,
+                          page_token: Optional[str] = None) -> Dict:
         request_body = {
+            "textQuery": text_query,
+            "searchAlongRouteParameters": {
+                "polyline": {"encodedPolyline": encoded_polyline}
+            },
+            "pageSize": 20
+        }
+        if included_type:
+            request_body["includedType"] = included_type
+        if page_token:
+            request_body["pageToken"] = page_token
+        return request_body
+    
+    def _corridor_places(self, polylines: List[str], text_query: str, included_type: Optional[str],
+                         category: str) -> List[Dict]:
+        """Run a search-along-route text search per segment, following result pages."""
+        places = []
+        for encoded in polylines:
+            places.extend(self.http.run(self._corridor_pages_steps(encoded, text_query, included_type, category)))
+        return places
+    
+    def _corridor_pages_steps(self, encoded: str, text_query: str, included_type: Optional[str],
+                              category: str) -> RequestSteps:
+        """Places from every result page of one segment's search, as request steps."""
+        places = []
+        page_token = None
+        for _ in range(PLACES_CORRIDOR_MAX_PAGES):
+            request_body = self._corridor_request(text_query, included_type, encoded, page_token)
+            data = yield from self._post_steps(self.TEXT_SEARCH_URL, request_body, category,
+                                               self._corridor_field_mask(category))
+            places.extend(data.get('places', []))
+            page_token = data.get('nextPageToken')
+            if not page_token:
+                break
+        return places
+    
+    @staticmethod
+    def _nearest_route_points(route_geometry: RouteLike,
+                              places: List[Dict]) -> List[Tuple[float, float, float, float]]:
+        """
+        Snap each place to its nearest route vertex.
+        
+        Returns:
+            (vertex_lat, vertex_lon, distance_from_start_m, offset_m) for each place
+        """
+        route = RouteGeometry.wrap(route_geometry)
+        nearest = []
+        for place in places:
+            location = place.get('location', {})
+            i, offset_m = route.nearest_vertex(location.get('latitude', 0.0), location.get('longitude', 0.0))
+            nearest.append((float(route.lats[i]), float(route.lons[i]), route.distance_at(i), offset_m))
+        return nearest
+    
+    def _parse_corridor(self, places: List[Dict], route_geometry: RouteLike, max_offset_m: float,
+                        parse_point: Callable[[Dict, float, float, float], List]) -> List:
+        """
+        Run a per-sample-point parser over corridor results, in route order.
+        
+        Each place is parsed as if it came from a search at its nearest route
+        vertex, so the sampling filters and "~N mi from start" labels still apply.
+        """
+        located = sorted(
+            zip(places, self._nearest_route_points(route_geometry, places)),
+            key=lambda item: item[1][2]
+        )
+        results = []
+        for place, (lat, lon, distance_m, offset_m) in located:
+            if offset_m <= max_offset_m:
+                results.extend(parse_point({'places': [place]}, lat, lon, distance_m))
+        return results
+    
+    def _corridor_scan(self, route_geometry: RouteLike, text_query: str, included_type: Optional[str],
+                       category: str, max_offset_m: float,
+                       parse_point: Callable[[Dict, float, float, float], List],
+                       log: Callable[[str], None] = print) -> Optional[List]:
+        """
+        Scan the route with corridor searches.
+        
+        Args:
+            log: Progress callback for the sampling fallback notices
+        
+        Returns:
+            Parsed results, or None if the caller should fall back to sampling
+        """
+        polylines = self._corridor_polylines(route_geometry)
+        if polylines is None:
+            log(f"    ℹ Route too long for corridor search, sampling for {category} instead")
+            return None
+        
+        try:
+            places = self._corridor_places(polylines, text_query, included_type, category)
+        except Exception as e:
+            log(f"    ℹ Corridor search failed ({e}), sampling for {category} instead")
+            return None
+        return self._parse_corridor(places, route_geometry, max_offset_m, parse_point)
+    
+    # Hotels
+    
+    def _hotel_request(self, lat: float, lon: float) -> Dict:
+        return {
             "includedTypes": ["lodging"],
             "locationRestriction": {
                 "circle": {
@@ -43,79 +414,84 @@ class GooglePlacesFinder:
             "rankPreference": "POPULARITY",
             "maxResultCount": 20
         }
+    
+    def _parse_hotels(self, data: Dict, city_name: str, lat: float, lon: float,
+                      pet_friendly_only: bool) -> Optional[Hotel]:
+        pet_friendly_hotels = []
+        chain_hotels = []
+        all_hotels = []
         
-        try:
-            response = requests.post(
-                self.NEARBY_SEARCH_URL,
-                headers=self.headers,
-                json=request_body,
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            rating = place.get('rating', 0.0)
+            reviews = place.get('userRatingCount', 0)
+            allows_dogs = place.get('allowsDogs', False)
             
-            pet_friendly_hotels = []
-            chain_hotels = []
-            all_hotels = []
+            # Keep good quality standards
+            if rating < 3.5 or reviews < 50:
+                continue
             
-            for place in data.get('places', []):
-                name = place.get('displayName', {}).get('text', '')
-                rating = place.get('rating', 0.0)
-                reviews = place.get('userRatingCount', 0)
-                allows_dogs = place.get('allowsDogs', False)
-                
-                # Keep good quality standards
-                if rating < 3.5 or reviews < 50:
-                    continue
-                
-                hotel = Hotel(
-                    name=name,
-                    address=place.get('formattedAddress', ''),
-                    location=city_name,
-                    rating=rating,
-                    user_ratings_total=reviews,
-                    price_level=place.get('priceLevel', None),
-                    place_id=place.get('id', ''),
-                    lat=place.get('location', {}).get('latitude', lat),
-                    lon=place.get('location', {}).get('longitude', lon),
-                    phone=place.get('internationalPhoneNumber', None),
-                    website=place.get('websiteUri', None)
-                )
-                hotel.score = calculate_popularity_score(rating, reviews)
-                
-                # Add to all hotels list
-                all_hotels.append(hotel)
-                
-                # Prioritize hotels that explicitly allow dogs
-                if allows_dogs:
-                    pet_friendly_hotels.append(hotel)
-                # Fallback to known pet-friendly chains
-                elif any(chain in name.lower() for chain in PET_FRIENDLY_CHAINS):
-                    chain_hotels.append(hotel)
-            
-            # If not filtering for pet-friendly, return best hotel overall
-            if not pet_friendly_only:
-                if all_hotels:
-                    all_hotels.sort(key=lambda h: h.score, reverse=True)
-                    return all_hotels[0]
-                return None
+            hotel = Hotel(
+                name=name,
+                address=place.get('formattedAddress', ''),
+                location=city_name,
+                rating=rating,
+                user_ratings_total=reviews,
+                price_level=place.get('priceLevel', None),
+                place_id=place.get('id', ''),
+                lat=place.get('location', {}).get('latitude', lat),
+                lon=place.get('location', {}).get('longitude', lon),
+                phone=place.get('internationalPhoneNumber', None),
+                website=place.get('websiteUri', None)
+            )
+            hotel.score = calculate_popularity_score(rating, reviews)
             
-            # Return best pet-friendly hotel, or best chain hotel if no explicit pet-friendly found
-            if pet_friendly_hotels:
-                pet_friendly_hotels.sort(key=lambda h: h.score, reverse=True)
-                return pet_friendly_hotels[0]
-            elif chain_hotels:
-                chain_hotels.sort(key=lambda h: h.score, reverse=True)
-                return chain_hotels[0]
-            return None
+            # Add to all hotels list
+            all_hotels.append(hotel)
             
+            # Prioritize hotels that explicitly allow dogs
+            if allows_dogs:
+                pet_friendly_hotels.append(hotel)
+            # Fallback to known pet-friendly chains
+            elif any(chain in name.lower() for chain in PET_FRIENDLY_CHAINS):
+                chain_hotels.append(hotel)
+        
+        # If not filtering for pet-friendly, return best hotel overall
+        if not pet_friendly_only:
+            if all_hotels:
+                all_hotels.sort(key=lambda h: h.score, reverse=True)
+                return all_hotels[0]
+            return None
+        
+        # Return best pet-friendly hotel, or best chain hotel if no explicit pet-friendly found
+        if pet_friendly_hotels:
+            pet_friendly_hotels.sort(key=lambda h: h.score, reverse=True)
+            return pet_friendly_hotels[0]
+        elif chain_hotels:
+            chain_hotels.sort(key=lambda h: h.score, reverse=True)
+            return chain_hotels[0]
+        return None
+    
+    def find_pet_friendly_hotel(self, city_name: str, lat: float, lon: float, pet_friendly_only: bool = True) -> Optional[Hotel]:
+        """Find the top hotel in a city.
+        
+        Args:
+            city_name: Name of the city
+            lat: Latitude
+            lon: Longitude
+            pet_friendly_only: If True, filter to pet-friendly hotels only. If False, return any hotel.
+        """
+        try:
+            data = self._post(self.NEARBY_SEARCH_URL, self._hotel_request(lat, lon), 'hotels', field_mask=self._field_mask('hotel'))
+            return self._parse_hotels(data, city_name, lat, lon, pet_friendly_only)
         except Exception as e:
             print(f"  Hotel search error for {city_name}: {e}")
             return None
     
-    def find_emergency_vet(self, city_name: str, lat: float, lon: float) -> Optional[Veterinarian]:
-        """Find the top-rated 24/7 emergency vet in a city."""
-        request_body = {
+    # Veterinarians
+    
+    def _vet_request(self, lat: float, lon: float) -> Dict:
+        return {
             "includedTypes": ["veterinary_care"],
             "locationRestriction": {
                 "circle": {
@@ -125,187 +501,180 @@ class GooglePlacesFinder:
             },
             "maxResultCount": 20
         }
+    
+    def _parse_vets(self, data: Dict, city_name: str, lat: float, lon: float) -> Optional[Veterinarian]:
+        vets = []
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            rating = place.get('rating', 0.0)
+            reviews = place.get('userRatingCount', 0)
+            
+            if rating < 3.0 or reviews < 10:
+                continue
+            
+            # Check if it's truly 24/7 by examining the schedule
+            is_24_hours = False
+            opening_hours = place.get('regularOpeningHours', {})
+            
+            if opening_hours:
+                # Check weekday texts for "Open 24 hours" or similar
+                weekday_texts = opening_hours.get('weekdayDescriptions', [])
+                if weekday_texts and len(weekday_texts) == 7:
+                    # ALL 7 days must explicitly say "Open 24 hours"
+                    open_24_count = sum(1 for day in weekday_texts if 'open 24 hours' in day.lower())
+                    is_24_hours = open_24_count == 7
+                
+                # Also check the periods structure if available
+                if not is_24_hours and 'periods' in opening_hours:
+                    periods = opening_hours.get('periods', [])
+                    # A true 24/7 place often has a single period with no close time
+                    if len(periods) == 1:
+                        period = periods[0]
+                        # Check if it has open but no close (indicating always open)
+                        if 'open' in period and 'close' not in period:
+                            is_24_hours = True
+            
+            # Name check as fallback ONLY if we have no hours data at all
+            if not opening_hours:
+                name_lower = name.lower()
+                # Be very strict - only trust explicit 24/7 or 24-hour in name
+                if '24/7' in name_lower or '24-hour emergency' in name_lower or '24 hour emergency' in name_lower:
+                    is_24_hours = True
+            
+            vet = Veterinarian(
+                name=name,
+                address=place.get('formattedAddress', ''),
+                location=city_name,
+                rating=rating,
+                user_ratings_total=reviews,
+                place_id=place.get('id', ''),
+                lat=place.get('location', {}).get('latitude', lat),
+                lon=place.get('location', {}).get('longitude', lon),
+                phone=place.get('internationalPhoneNumber', None),
+                website=place.get('websiteUri', None),
+                is_24_hours=is_24_hours
+            )
+            vet.score = calculate_popularity_score(rating, reviews)
+            # Boost score for 24-hour vets
+            if vet.is_24_hours:
+                vet.score *= 1.5
+            
+            vets.append(vet)
         
+        if vets:
+            vets.sort(key=lambda v: v.score, reverse=True)
+            return vets[0]
+        return None
+    
+    def find_emergency_vet(self, city_name: str, lat: float, lon: float) -> Optional[Veterinarian]:
+        """Find the top-rated 24/7 emergency vet in a city."""
         try:
-            response = requests.post(
-                self.NEARBY_SEARCH_URL,
-                headers=self.headers,
-                json=request_body,
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
+            data = self._post(self.NEARBY_SEARCH_URL, self._vet_request(lat, lon), 'vets', field_mask=self._field_mask('vet'))
+            return self._parse_vets(data, city_name, lat, lon)
+        except Exception as e:
+            print(f"  Vet search error for {city_name}: {e}")
+            return None
+    
+    # Parks along the route
+    
+    def _route_park_request(self, lat: float, lon: float, radius_m: float = 5000) -> Dict:
+        # Find parks near this point - TIGHTER radius for route scanning
+        return {
+            "includedTypes": ["park", "national_park", "state_park"],
+            "locationRestriction": {
+                "circle": {
+                    "center": {"latitude": lat, "longitude": lon},
+                    "radius": radius_m
+                }
+            },
+            "maxResultCount": 10
+        }
+    
+    def _parse_route_parks(self, data: Dict, lat: float, lon: float, distance_m: float,
+                           seen_parks: set) -> List[Attraction]:
+        parks = []
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            place_id = place.get('id', '')
             
-            vets = []
-            for place in data.get('places', []):
-                name = place.get('displayName', {}).get('text', '')
-                rating = place.get('rating', 0.0)
-                reviews = place.get('userRatingCount', 0)
-                
-                if rating < 3.0 or reviews < 10:
-                    continue
-                
-                # Check if it's truly 24/7 by examining the schedule
-                is_24_hours = False
-                opening_hours = place.get('regularOpeningHours', {})
-                
-                if opening_hours:
-                    # Check weekday texts for "Open 24 hours" or similar
-                    weekday_texts = opening_hours.get('weekdayDescriptions', [])
-                    if weekday_texts and len(weekday_texts) == 7:
-                        # ALL 7 days must explicitly say "Open 24 hours"
-                        open_24_count = sum(1 for day in weekday_texts if 'open 24 hours' in day.lower())
-                        is_24_hours = open_24_count == 7
-                    
-                    # Also check the periods structure if available
-                    if not is_24_hours and 'periods' in opening_hours:
-                        periods = opening_hours.get('periods', [])
-                        # A true 24/7 place often has a single period with no close time
-                        if len(periods) == 1:
-                            period = periods[0]
-                            # Check if it has open but no close (indicating always open)
-                            if 'open' in period and 'close' not in period:
-                                is_24_hours = True
-                
-                # Name check as fallback ONLY if we have no hours data at all
-                if not opening_hours:
-                    name_lower = name.lower()
-                    # Be very strict - only trust explicit 24/7 or 24-hour in name
-                    if '24/7' in name_lower or '24-hour emergency' in name_lower or '24 hour emergency' in name_lower:
-                        is_24_hours = True
+            # Skip if we've seen this park
+            if place_id in seen_parks:
+                continue
+            
+            rating = place.get('rating', 0.0)
+            reviews = place.get('userRatingCount', 0)
+            
+            # Only include MAJOR parks along route (stricter criteria)
+            if rating >= 4.5 and reviews >= 500:
+                location = place.get('location', {})
                 
-                vet = Veterinarian(
+                park = Attraction(
                     name=name,
                     address=place.get('formattedAddress', ''),
-                    location=city_name,
+                    location=f"~{int(distance_m/1609.34)} mi from start",
+                    type='park',
                     rating=rating,
                     user_ratings_total=reviews,
-                    place_id=place.get('id', ''),
-                    lat=place.get('location', {}).get('latitude', lat),
-                    lon=place.get('location', {}).get('longitude', lon),
-                    phone=place.get('internationalPhoneNumber', None),
-                    website=place.get('websiteUri', None),
-                    is_24_hours=is_24_hours
+                    lat=location.get('latitude', lat),
+                    lon=location.get('longitude', lon),
+                    website=place.get('websiteUri', None)
                 )
-                vet.score = calculate_popularity_score(rating, reviews)
-                # Boost score for 24-hour vets
-                if vet.is_24_hours:
-                    vet.score *= 1.5
-                
-                vets.append(vet)
-            
-            if vets:
-                vets.sort(key=lambda v: v.score, reverse=True)
-                return vets[0]
-            return None
-            
-        except Exception as e:
-            print(f"  Vet search error for {city_name}: {e}")
-            return None
+                parks.append(park)
+                seen_parks.add(place_id)
+        return parks
     
     def find_parks_along_route(
         self,
-        route_geometry: List[List[float]],
-        sample_interval_miles: int = 25
+        route_geometry: RouteLike,
+        sample_interval_miles: Optional[int] = None,
+        log: Callable[[str], None] = print
     ) -> List[Attraction]:
         """
         Find ALL parks and attractions along the entire route.
-        Uses tighter radius and more frequent sampling along the route.
+        Search circles are planned to cover the route corridor.
         
         Args:
-            route_geometry: List of [lat, lon] coordinates from route
-            sample_interval_miles: How often to check for parks along route (default: 25 miles)
-            
+            route_geometry: RouteGeometry or list of [lon, lat] coordinates from route
+            sample_interval_miles: Sample every N miles (5km radius) instead of using the coverage plan
+            log: Progress callback (defaults to print)
+        
         Returns:
             List of Attraction objects
         """
         all_parks = []
         seen_parks = set()
-        cumulative_distance = 0
-        last_check_distance = 0
-        check_interval_m = sample_interval_miles * 1609.34
         
-        print(f"  Scanning route for parks (every {sample_interval_miles} miles, 5km radius)...")
+        route = RouteGeometry.wrap(route_geometry)
+        if self.corridor_search:
+            log(f"  Searching route corridor for parks...")
+            corridor_parks = self._corridor_scan(
+                route, "park", None, 'parks', 5000,
+                lambda data, lat, lon, distance_m: self._parse_route_parks(data, lat, lon, distance_m, seen_parks),
+                log
+            )
+            if corridor_parks is not None:
+                self._sort_by_popularity(corridor_parks)
+                return corridor_parks
         
-        for i in range(len(route_geometry) - 1):
-            coord1 = route_geometry[i]
-            coord2 = route_geometry[i + 1]
-            
-            # Calculate distance (coordinates are [lon, lat] in GeoJSON format)
-            segment_dist = haversine_distance(coord1[1], coord1[0], coord2[1], coord2[0], 'meters')
-            
-            cumulative_distance += segment_dist
-            
-            # Check for parks at intervals
-            if cumulative_distance - last_check_distance >= check_interval_m:
-                lat, lon = coord2[1], coord2[0]
-                
-                # Find parks near this point - TIGHTER radius for route scanning
-                request_body = {
-                    "includedTypes": ["park", "national_park", "state_park"],
-                    "locationRestriction": {
-                        "circle": {
-                            "center": {"latitude": lat, "longitude": lon},
-                            "radius": 5000  # 5km radius - stay close to route
-                        }
-                    },
-                    "maxResultCount": 10
-                }
-                
-                try:
-                    response = requests.post(
-                        self.NEARBY_SEARCH_URL,
-                        headers=self.headers,
-                        json=request_body,
-                        timeout=10
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        for place in data.get('places', []):
-                            name = place.get('displayName', {}).get('text', '')
-                            place_id = place.get('id', '')
-                            
-                            # Skip if we've seen this park
-                            if place_id in seen_parks:
-                                continue
-                            
-                            rating = place.get('rating', 0.0)
-                            reviews = place.get('userRatingCount', 0)
-                            
-                            # Only include MAJOR parks along route (stricter criteria)
-                            if rating >= 4.5 and reviews >= 500:
-                                location = place.get('location', {})
-                                
-                                park = Attraction(
-                                    name=name,
-                                    address=place.get('formattedAddress', ''),
-                                    location=f"~{int(cumulative_distance/1609.34)} mi from start",
-                                    type='park',
-                                    rating=rating,
-                                    user_ratings_total=reviews,
-                                    lat=location.get('latitude', lat),
-                                    lon=location.get('longitude', lon),
-                                    website=place.get('websiteUri', None)
-                                )
-                                all_parks.append(park)
-                                seen_parks.add(place_id)
-                    
-                    time.sleep(0.5)  # Rate limiting
-                    
-                except Exception as e:
-                    pass  # Continue on error
-                
-                last_check_distance = cumulative_distance
+        log(f"  Scanning route for parks...")
+        points, radius_m = self._route_search_points(route, 'parks', sample_interval_miles, log=log)
+        
+        for lat, lon, distance_m in points:
+            try:
+                data = self._post(self.NEARBY_SEARCH_URL, self._route_park_request(lat, lon, radius_m), 'parks', field_mask=self._field_mask('route_park'))
+                data = {'places': self._places_within(data.get('places', []), route, self.SAMPLING_RADIUS_M['parks'])}
+                all_parks.extend(self._parse_route_parks(data, lat, lon, distance_m, seen_parks))
+            except Exception:
+                pass  # Continue on error
         
         # Sort by rating * log(reviews) and return unique parks
-        all_parks.sort(key=lambda p: calculate_popularity_score(p.rating, p.user_ratings_total), reverse=True)
+        self._sort_by_popularity(all_parks)
         return all_parks
     
-    def find_parks_nearby(self, city_name: str, lat: float, lon: float, limit: int = 3) -> List[Attraction]:
-        """Find parks and attractions near a city - larger radius for stop exploration."""
-        request_body = {
+    # Parks near a city
+    
+    def _city_park_request(self, lat: float, lon: float) -> Dict:
+        return {
             "includedTypes": ["park", "national_park", "tourist_attraction"],
             "locationRestriction": {
                 "circle": {
@@ -315,50 +684,47 @@ class GooglePlacesFinder:
             },
             "maxResultCount": 20
         }
-        
-        try:
-            response = requests.post(
-                self.NEARBY_SEARCH_URL,
-                headers=self.headers,
-                json=request_body,
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            attractions = []
-            for place in data.get('places', []):
-                name = place.get('displayName', {}).get('text', '')
-                rating = place.get('rating', 0.0)
-                reviews = place.get('userRatingCount', 0)
-                
-                if rating < 3.5 or reviews < 20:
-                    continue
-                
-                attraction = Attraction(
-                    name=name,
-                    address=place.get('formattedAddress', ''),
-                    location=city_name,
-                    type='park',
-                    rating=rating,
-                    user_ratings_total=reviews,
-                    lat=place.get('location', {}).get('latitude', lat),
-                    lon=place.get('location', {}).get('longitude', lon),
-                    website=place.get('websiteUri', None)
-                )
-                attractions.append(attraction)
+    
+    def _parse_city_parks(self, data: Dict, city_name: str, lat: float, lon: float, limit: int) -> List[Attraction]:
+        attractions = []
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            rating = place.get('rating', 0.0)
+            reviews = place.get('userRatingCount', 0)
             
-            # Sort by rating * log(reviews) and return top N
-            attractions.sort(key=lambda a: calculate_popularity_score(a.rating, a.user_ratings_total), reverse=True)
-            return attractions[:limit]
+            if rating < 3.5 or reviews < 20:
+                continue
             
+            attraction = Attraction(
+                name=name,
+                address=place.get('formattedAddress', ''),
+                location=city_name,
+                type='park',
+                rating=rating,
+                user_ratings_total=reviews,
+                lat=place.get('location', {}).get('latitude', lat),
+                lon=place.get('location', {}).get('longitude', lon),
+                website=place.get('websiteUri', None)
+            )
+            attractions.append(attraction)
+        
+        # Sort by rating * log(reviews) and return top N
+        self._sort_by_popularity(attractions)
+        return attractions[:limit]
+    
+    def find_parks_nearby(self, city_name: str, lat: float, lon: float, limit: int = 3) -> List[Attraction]:
+        """Find parks and attractions near a city - larger radius for stop exploration."""
+        try:
+            data = self._post(self.NEARBY_SEARCH_URL, self._city_park_request(lat, lon), 'parks', field_mask=self._field_mask('city_park'))
+            return self._parse_city_parks(data, city_name, lat, lon, limit)
         except Exception as e:
             print(f"  Park search error for {city_name}: {e}")
             return []
     
-    def find_museums_in_city(self, city_name: str, lat: float, lon: float, limit: int = 3) -> List[Attraction]:
-        """Find museums and cultural attractions in a city."""
-        request_body = {
+    # Museums
+    
+    def _museum_request(self, lat: float, lon: float) -> Dict:
+        return {
             "includedTypes": ["museum", "art_gallery", "historical_landmark"],
             "locationRestriction": {
                 "circle": {
@@ -368,54 +734,52 @@ class GooglePlacesFinder:
             },
             "maxResultCount": 20
         }
-        
-        try:
-            response = requests.post(
-                self.NEARBY_SEARCH_URL,
-                headers=self.headers,
-                json=request_body,
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
+    
+    def _parse_museums(self, data: Dict, city_name: str, lat: float, lon: float, limit: int) -> List[Attraction]:
+        """Parse museums; Wikipedia info is added afterwards, for the top results only."""
+        museums = []
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            rating = place.get('rating', 0.0)
+            reviews = place.get('userRatingCount', 0)
             
-            museums = []
-            for place in data.get('places', []):
-                name = place.get('displayName', {}).get('text', '')
-                rating = place.get('rating', 0.0)
-                reviews = place.get('userRatingCount', 0)
-                
-                if rating < 4.0 or reviews < 100:
-                    continue
-                
-                # Get Wikipedia info for museums
-                wiki_info = WikipediaHelper.search_wikipedia(name)
-                
-                museum = Attraction(
-                    name=name,
-                    address=place.get('formattedAddress', ''),
-                    location=city_name,
-                    type='museum',
-                    rating=rating,
-                    user_ratings_total=reviews,
-                    lat=place.get('location', {}).get('latitude', lat),
-                    lon=place.get('location', {}).get('longitude', lon),
-                    website=place.get('websiteUri', None),
-                    wikipedia_url=wiki_info['url'] if wiki_info else None,
-                    wikipedia_summary=wiki_info['summary'] if wiki_info else None
-                )
-                museums.append(museum)
+            if rating < 4.0 or reviews < 100:
+                continue
             
-            museums.sort(key=lambda m: calculate_popularity_score(m.rating, m.user_ratings_total), reverse=True)
-            return museums[:limit]
+            museum = Attraction(
+                name=name,
+                address=place.get('formattedAddress', ''),
+                location=city_name,
+                type='museum',
+                rating=rating,
+                user_ratings_total=reviews,
+                lat=place.get('location', {}).get('latitude', lat),
+                lon=place.get('location', {}).get('longitude', lon),
+                website=place.get('websiteUri', None)
+            )
+            museums.append(museum)
+        
+        self._sort_by_popularity(museums)
+        return museums[:limit]
+    
+    def find_museums_in_city(self, city_name: str, lat: float, lon: float, limit: int = 3) -> List[Attraction]:
+        """Find museums and cultural attractions in a city."""
+        try:
+            data = self._post(self.NEARBY_SEARCH_URL, self._museum_request(lat, lon), 'museums', field_mask=self._field_mask('museum'))
+            museums = self._parse_museums(data, city_name, lat, lon, limit)
             
+            # Get Wikipedia info for museums
+            self._add_wikipedia_info(museums)
+            return museums
+        
         except Exception as e:
             print(f"  Museum search error for {city_name}: {e}")
             return []
     
-    def find_dog_friendly_restaurants(self, city_name: str, lat: float, lon: float, limit: int = 5) -> List[Attraction]:
-        """Find dog-friendly restaurants with outdoor seating."""
-        request_body = {
+    # Dog-friendly restaurants
+    
+    def _restaurant_request(self, city_name: str, lat: float, lon: float) -> Dict:
+        return {
             "textQuery": f"dog friendly restaurant {city_name}",
             "locationBias": {
                 "circle": {
@@ -425,56 +789,53 @@ class GooglePlacesFinder:
             },
             "maxResultCount": 20
         }
-        
-        try:
-            response = requests.post(
-                self.TEXT_SEARCH_URL,
-                headers=self.headers,
-                json=request_body,
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
+    
+    def _parse_restaurants(self, data: Dict, city_name: str, lat: float, lon: float, limit: int) -> List[Attraction]:
+        restaurants = []
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            rating = place.get('rating', 0.0)
+            reviews = place.get('userRatingCount', 0)
+            place_lat = place.get('location', {}).get('latitude', lat)
+            place_lon = place.get('location', {}).get('longitude', lon)
             
-            restaurants = []
-            for place in data.get('places', []):
-                name = place.get('displayName', {}).get('text', '')
-                rating = place.get('rating', 0.0)
-                reviews = place.get('userRatingCount', 0)
-                place_lat = place.get('location', {}).get('latitude', lat)
-                place_lon = place.get('location', {}).get('longitude', lon)
-                
-                if rating < 4.0 or reviews < 50:
-                    continue
-                
-                # VERIFY restaurant is actually within reasonable distance (50km max)
-                distance_km = haversine_distance(lat, lon, place_lat, place_lon, unit='km')
-                if distance_km > 50:
-                    continue
-                
-                restaurant = Attraction(
-                    name=name,
-                    address=place.get('formattedAddress', ''),
-                    location=city_name,
-                    type='restaurant',
-                    rating=rating,
-                    user_ratings_total=reviews,
-                    lat=place_lat,
-                    lon=place_lon,
-                    website=place.get('websiteUri', None)
-                )
-                restaurants.append(restaurant)
+            if rating < 4.0 or reviews < 50:
+                continue
             
-            restaurants.sort(key=lambda r: calculate_popularity_score(r.rating, r.user_ratings_total), reverse=True)
-            return restaurants[:limit]
+            # VERIFY restaurant is actually within reasonable distance (50km max)
+            distance_km = haversine_distance(lat, lon, place_lat, place_lon, unit='km')
+            if distance_km > 50:
+                continue
             
+            restaurant = Attraction(
+                name=name,
+                address=place.get('formattedAddress', ''),
+                location=city_name,
+                type='restaurant',
+                rating=rating,
+                user_ratings_total=reviews,
+                lat=place_lat,
+                lon=place_lon,
+                website=place.get('websiteUri', None)
+            )
+            restaurants.append(restaurant)
+        
+        self._sort_by_popularity(restaurants)
+        return restaurants[:limit]
+    
+    def find_dog_friendly_restaurants(self, city_name: str, lat: float, lon: float, limit: int = 5) -> List[Attraction]:
+        """Find dog-friendly restaurants with outdoor seating."""
+        try:
+            data = self._post(self.TEXT_SEARCH_URL, self._restaurant_request(city_name, lat, lon), 'restaurants', field_mask=self._field_mask('restaurant'))
+            return self._parse_restaurants(data, city_name, lat, lon, limit)
         except Exception as e:
             print(f"  Restaurant search error for {city_name}: {e}")
             return []
     
-    def find_dog_parks_in_city(self, city_name: str, lat: float, lon: float, limit: int = 2) -> List[Attraction]:
-        """Find dog parks in a city."""
-        request_body = {
+    # Dog parks
+    
+    def _dog_park_request(self, city_name: str, lat: float, lon: float) -> Dict:
+        return {
             "textQuery": f"dog park {city_name}",
             "locationBias": {
                 "circle": {
@@ -484,357 +845,349 @@ class GooglePlacesFinder:
             },
             "maxResultCount": 15
         }
-        
-        try:
-            response = requests.post(
-                self.TEXT_SEARCH_URL,
-                headers=self.headers,
-                json=request_body,
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
+    
+    def _parse_dog_parks(self, data: Dict, city_name: str, lat: float, lon: float, limit: int) -> List[Attraction]:
+        dog_parks = []
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            rating = place.get('rating', 0.0)
+            reviews = place.get('userRatingCount', 0)
+            place_lat = place.get('location', {}).get('latitude', lat)
+            place_lon = place.get('location', {}).get('longitude', lon)
             
-            dog_parks = []
-            for place in data.get('places', []):
-                name = place.get('displayName', {}).get('text', '')
-                rating = place.get('rating', 0.0)
-                reviews = place.get('userRatingCount', 0)
-                place_lat = place.get('location', {}).get('latitude', lat)
-                place_lon = place.get('location', {}).get('longitude', lon)
-                
-                if rating < 4.0:
-                    continue
-                
-                # VERIFY dog park is actually within reasonable distance (50km max)
-                distance_km = haversine_distance(lat, lon, place_lat, place_lon, unit='km')
-                if distance_km > 50:
-                    continue
-                
-                dog_park = Attraction(
-                    name=name,
-                    address=place.get('formattedAddress', ''),
-                    location=city_name,
-                    type='dog_park',
-                    rating=rating,
-                    user_ratings_total=reviews,
-                    lat=place_lat,
-                    lon=place_lon,
-                    website=place.get('websiteUri', None)
-                )
-                dog_parks.append(dog_park)
+            if rating < 4.0:
+                continue
             
-            dog_parks.sort(key=lambda d: calculate_popularity_score(d.rating, d.user_ratings_total), reverse=True)
-            return dog_parks[:limit]
+            # VERIFY dog park is actually within reasonable distance (50km max)
+            distance_km = haversine_distance(lat, lon, place_lat, place_lon, unit='km')
+            if distance_km > 50:
+                continue
             
+            dog_park = Attraction(
+                name=name,
+                address=place.get('formattedAddress', ''),
+                location=city_name,
+                type='dog_park',
+                rating=rating,
+                user_ratings_total=reviews,
+                lat=place_lat,
+                lon=place_lon,
+                website=place.get('websiteUri', None)
+            )
+            dog_parks.append(dog_park)
+        
+        self._sort_by_popularity(dog_parks)
+        return dog_parks[:limit]
+    
+    def find_dog_parks_in_city(self, city_name: str, lat: float, lon: float, limit: int = 2) -> List[Attraction]:
+        """Find dog parks in a city."""
+        try:
+            data = self._post(self.TEXT_SEARCH_URL, self._dog_park_request(city_name, lat, lon), 'dog_parks', field_mask=self._field_mask('dog_park'))
+            return self._parse_dog_parks(data, city_name, lat, lon, limit)
         except Exception as e:
             print(f"  Dog park search error for {city_name}: {e}")
             return []
     
+    # Scenic viewpoints along the route
+    
+    def _viewpoint_request(self, lat: float, lon: float, radius_m: float = 25000) -> Dict:
+        # Use text search with location restriction for viewpoints
+        return {
+            "textQuery": self.VIEWPOINT_QUERY,
+            "locationBias": {
+                "circle": {
+                    "center": {"latitude": lat, "longitude": lon},
+                    "radius": radius_m
+                }
+            },
+            "maxResultCount": 5
+        }
+    
+    def _parse_viewpoints(self, data: Dict, lat: float, lon: float, distance_m: float,
+                          seen_viewpoints: set) -> List[Attraction]:
+        viewpoints = []
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            place_id = place.get('id', '')
+            location_data = place.get('location', {})
+            place_lat = location_data.get('latitude', 0)
+            place_lon = location_data.get('longitude', 0)
+            
+            if place_id in seen_viewpoints:
+                continue
+            
+            # Verify the viewpoint is actually within 25km of the route point
+            distance_to_route = haversine_distance(lat, lon, place_lat, place_lon, 'meters')
+            if distance_to_route > 25000:
+                continue
+            
+            # Look for viewpoint keywords
+            name_lower = name.lower()
+            address_lower = place.get('formattedAddress', '').lower()
+            combined = name_lower + ' ' + address_lower
+            
+            if any(keyword in combined for keyword in self.VIEWPOINT_KEYWORDS):
+                rating = place.get('rating', 0.0)
+                reviews = place.get('userRatingCount', 0)
+                
+                if rating >= 4.3 and reviews >= 100:
+                    viewpoint = Attraction(
+                        name=name,
+                        address=place.get('formattedAddress', ''),
+                        location=f"~{int(distance_m/1609.34)} mi from start",
+                        type='viewpoint',
+                        rating=rating,
+                        user_ratings_total=reviews,
+                        lat=place_lat,
+                        lon=place_lon,
+                        website=place.get('websiteUri', None)
+                    )
+                    viewpoints.append(viewpoint)
+                    seen_viewpoints.add(place_id)
+        return viewpoints
+    
     def find_scenic_viewpoints_along_route(
         self,
-        route_geometry: List[List[float]],
-        sample_interval_miles: int = 75
+        route_geometry: RouteLike,
+        sample_interval_miles: Optional[int] = None,
+        log: Callable[[str], None] = print
     ) -> List[Attraction]:
-        """Find scenic viewpoints and overlooks along the route."""
+        """Find scenic viewpoints and overlooks along the route.
+        
+        Args:
+            route_geometry: RouteGeometry or list of [lon, lat] coordinates
+            sample_interval_miles: Sample every N miles instead of using the coverage plan
+            log: Progress callback (defaults to print)
+        """
         viewpoints = []
         seen_viewpoints = set()
-        cumulative_distance = 0
-        last_check_distance = 0
-        check_interval_m = sample_interval_miles * 1609.34
-        
-        for i in range(len(route_geometry) - 1):
-            coord1 = route_geometry[i]
-            coord2 = route_geometry[i + 1]
-            segment_dist = haversine_distance(coord1[1], coord1[0], coord2[1], coord2[0], 'meters')
-            cumulative_distance += segment_dist
-            
-            if cumulative_distance - last_check_distance >= check_interval_m:
-                lat, lon = coord2[1], coord2[0]
-                
-                # Use text search with location restriction for viewpoints
-                request_body = {
-                    "textQuery": "scenic viewpoint OR overlook OR vista OR observation point",
-                    "locationBias": {
-                        "circle": {
-                            "center": {"latitude": lat, "longitude": lon},
-                            "radius": 25000  # 25km radius
-                        }
-                    },
-                    "maxResultCount": 5
-                }
-                
-                try:
-                    response = requests.post(
-                        self.TEXT_SEARCH_URL,
-                        headers=self.headers,
-                        json=request_body,
-                        timeout=10
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        for place in data.get('places', []):
-                            name = place.get('displayName', {}).get('text', '')
-                            place_id = place.get('id', '')
-                            location_data = place.get('location', {})
-                            place_lat = location_data.get('latitude', 0)
-                            place_lon = location_data.get('longitude', 0)
-                            
-                            if place_id in seen_viewpoints:
-                                continue
-                            
-                            # Verify the viewpoint is actually within 25km of the route point
-                            distance_to_route = haversine_distance(lat, lon, place_lat, place_lon, 'meters')
-                            if distance_to_route > 25000:
-                                continue
-                            
-                            # Look for viewpoint keywords
-                            name_lower = name.lower()
-                            address_lower = place.get('formattedAddress', '').lower()
-                            combined = name_lower + ' ' + address_lower
-                            
-                            viewpoint_keywords = [
-                                'overlook', 'viewpoint', 'scenic', 'vista', 'lookout', 
-                                'observation', 'panorama', 'view point', 'viewing area',
-                                'summit', 'peak', 'point', 'rim', 'canyon view', 'valley view'
-                            ]
-                            
-                            if any(keyword in combined for keyword in viewpoint_keywords):
-                                rating = place.get('rating', 0.0)
-                                reviews = place.get('userRatingCount', 0)
-                                
-                                if rating >= 4.3 and reviews >= 100:
-                                    viewpoint = Attraction(
-                                        name=name,
-                                        address=place.get('formattedAddress', ''),
-                                        location=f"~{int(cumulative_distance/1609.34)} mi from start",
-                                        type='viewpoint',
-                                        rating=rating,
-                                        user_ratings_total=reviews,
-                                        lat=place_lat,
-                                        lon=place_lon,
-                                        website=place.get('websiteUri', None)
-                                    )
-                                    viewpoints.append(viewpoint)
-                                    seen_viewpoints.add(place_id)
-                    
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    print(f"    ⚠ Viewpoint search error at mile {int(cumulative_distance/1609.34)}: {e}")
-                
-                last_check_distance = cumulative_distance
         
-        viewpoints.sort(key=lambda v: calculate_popularity_score(v.rating, v.user_ratings_total), reverse=True)
+        route = RouteGeometry.wrap(route_geometry)
+        if self.corridor_search:
+            corridor_viewpoints = self._corridor_scan(
+                route, self.VIEWPOINT_QUERY, None, 'viewpoints', 25000,
+                lambda data, lat, lon, distance_m: self._parse_viewpoints(data, lat, lon, distance_m, seen_viewpoints),
+                log
+            )
+            if corridor_viewpoints is not None:
+                self._sort_by_popularity(corridor_viewpoints)
+                return corridor_viewpoints
+        
+        points, radius_m = self._route_search_points(route, 'viewpoints', sample_interval_miles, log=log)
+        for lat, lon, distance_m in points:
+            try:
+                data = self._post(self.TEXT_SEARCH_URL, self._viewpoint_request(lat, lon, radius_m), 'viewpoints', field_mask=self._field_mask('viewpoint'))
+                viewpoints.extend(self._parse_viewpoints(data, lat, lon, distance_m, seen_viewpoints))
+            except Exception as e:
+                log(f"    ⚠ Viewpoint search error at mile {int(distance_m/1609.34)}: {e}")
+        
+        self._sort_by_popularity(viewpoints)
         return viewpoints
     
-    def find_national_parks_by_state(self, state_name: str, limit: int = None) -> List[NationalPark]:
-        """Find all National Park Service sites in a given state."""
-        search_query = f"national forest OR national park OR national historic OR national monument {state_name}"
-        
-        request_body = {
-            "textQuery": search_query,
+    # National parks by state
+    
+    def _national_park_request(self, state_name: str) -> Dict:
+        return {
+            "textQuery": f"national forest OR national park OR national historic OR national monument {state_name}",
             "maxResultCount": 20
         }
-        
-        try:
-            response = requests.post(
-                self.TEXT_SEARCH_URL,
-                headers=self.headers,
-                json=request_body,
-                timeout=10
+    
+    def _national_forest_request(self, state_name: str) -> Dict:
+        return {"textQuery": f"National Forest {state_name}", "maxResultCount": 10}
+    
+    def _parse_national_parks(self, data: Dict, state_name: str) -> List[NationalPark]:
+        national_parks = []
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            name_lower = name.lower()
+            address = place.get('formattedAddress', '')
+            
+            if state_name not in address:
+                continue
+            
+            if not any(keyword in name_lower for keyword in self.NATIONAL_PARK_KEYWORDS):
+                continue
+            
+            if any(skip in name_lower for skip in ['state park', 'city park', 'county park', 'regional park']):
+                continue
+            
+            rating = place.get('rating', 0.0)
+            reviews = place.get('userRatingCount', 0)
+            location_data = place.get('location', {})
+            
+            park = NationalPark(
+                name=name,
+                address=address,
+                state=state_name,
+                rating=rating,
+                user_ratings_total=reviews,
+                lat=location_data.get('latitude', 0),
+                lon=location_data.get('longitude', 0),
+                website=place.get('websiteUri', None)
             )
+            national_parks.append(park)
+        
+        self._sort_by_popularity(national_parks)
+        return national_parks
+    
+    def _parse_national_forests(self, data: Dict, state_name: str,
+                                national_parks: List[NationalPark]) -> List[NationalPark]:
+        """Parse USDA National Forests not already in national_parks."""
+        forests = []
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            address = place.get('formattedAddress', '')
             
-            if response.status_code != 200:
-                return []
+            if state_name not in address or 'national forest' not in name.lower():
+                continue
             
-            data = response.json()
-            national_parks = []
+            if any(p.name == name for p in national_parks + forests):
+                continue
             
-            for place in data.get('places', []):
-                name = place.get('displayName', {}).get('text', '')
-                name_lower = name.lower()
-                address = place.get('formattedAddress', '')
-                
-                if state_name not in address:
-                    continue
-                
-                if not any(keyword in name_lower for keyword in [
-                    'national park', 'national monument', 'national recreation area',
-                    'national memorial', 'national historic', 'national historical',
-                    'national military park', 'national battlefield', 'national seashore',
-                    'national lakeshore', 'national preserve', 'national parkway',
-                    'national river', 'national wild', 'national scenic', 'national forest'
-                ]):
-                    continue
-                
-                if any(skip in name_lower for skip in ['state park', 'city park', 'county park', 'regional park']):
-                    continue
-                
-                rating = place.get('rating', 0.0)
-                reviews = place.get('userRatingCount', 0)
-                location_data = place.get('location', {})
-                
-                wiki_info = WikipediaHelper.search_wikipedia(name)
-                
-                park = NationalPark(
-                    name=name,
-                    address=address,
-                    state=state_name,
-                    rating=rating,
-                    user_ratings_total=reviews,
-                    lat=location_data.get('latitude', 0),
-                    lon=location_data.get('longitude', 0),
-                    website=place.get('websiteUri', None),
-                    wikipedia_url=wiki_info['url'] if wiki_info else None,
-                    wikipedia_summary=wiki_info['summary'] if wiki_info else None
-                )
-                national_parks.append(park)
+            location = place.get('location', {})
+            rating = place.get('rating', 4.5)
+            reviews = place.get('userRatingCount', 10)
             
-            national_parks.sort(
-                key=lambda p: calculate_popularity_score(p.rating, p.user_ratings_total),
-                reverse=True
+            forest = NationalPark(
+                name=name,
+                address=address,
+                state=state_name,
+                rating=rating,
+                user_ratings_total=reviews,
+                lat=location.get('latitude', 0.0),
+                lon=location.get('longitude', 0.0),
+                website=place.get('websiteUri', '')
             )
+            forests.append(forest)
+        return forests
+    
+    def find_national_parks_by_state(self, state_name: str, limit: int = None) -> List[NationalPark]:
+        """Find all National Park Service sites in a given state."""
+        try:
+            data = self._post(self.TEXT_SEARCH_URL, self._national_park_request(state_name), 'national_parks', field_mask=self._field_mask('national_park'))
+            national_parks = self._parse_national_parks(data, state_name)
             
             # Additional search for USDA National Forests
             try:
-                forest_query = f"National Forest {state_name}"
-                forest_request = {"textQuery": forest_query, "maxResultCount": 10}
-                
-                forest_response = requests.post(
-                    self.TEXT_SEARCH_URL,
-                    headers=self.headers,
-                    json=forest_request,
-                    timeout=10
-                )
-                
-                if forest_response.status_code == 200:
-                    forest_data = forest_response.json()
-                    
-                    for place in forest_data.get('places', []):
-                        name = place.get('displayName', {}).get('text', '')
-                        address = place.get('formattedAddress', '')
-                        
-                        if state_name not in address or 'national forest' not in name.lower():
-                            continue
-                        
-                        if any(p.name == name for p in national_parks):
-                            continue
-                        
-                        location = place.get('location', {})
-                        rating = place.get('rating', 4.5)
-                        reviews = place.get('userRatingCount', 10)
-                        
-                        wiki_info = WikipediaHelper.search_wikipedia(name)
-                        
-                        forest = NationalPark(
-                            name=name,
-                            address=address,
-                            state=state_name,
-                            rating=rating,
-                            user_ratings_total=reviews,
-                            lat=location.get('latitude', 0.0),
-                            lon=location.get('longitude', 0.0),
-                            website=place.get('websiteUri', ''),
-                            wikipedia_url=wiki_info.get('url') if wiki_info else None,
-                            wikipedia_summary=wiki_info.get('summary') if wiki_info else None
-                        )
-                        national_parks.append(forest)
-                        
+                forest_data = self._post(self.TEXT_SEARCH_URL, self._national_forest_request(state_name), 'national_parks', field_mask=self._field_mask('national_forest'))
+                national_parks.extend(self._parse_national_forests(forest_data, state_name, national_parks))
             except Exception as forest_error:
                 print(f"    ℹ Note: Could not search USDA forests: {forest_error}")
             
-            national_parks.sort(
-                key=lambda p: calculate_popularity_score(p.rating, p.user_ratings_total),
-                reverse=True
-            )
-            
+            self._sort_by_popularity(national_parks)
             if limit:
-                return national_parks[:limit]
-            return national_parks
+                national_parks = national_parks[:limit]
             
+            self._add_wikipedia_info(national_parks)
+            return national_parks
+        
         except Exception as e:
             print(f"    ⚠ Error searching for national parks in {state_name}: {e}")
             return []
     
-    def find_monuments_by_state(self, state_name: str, limit: int = None) -> List[Attraction]:
-        """Find monuments and memorials in a given state - returns ALL monuments."""
-        search_query = f"monument OR memorial {state_name}"
-        
-        request_body = {
-            "textQuery": search_query
+    # Monuments by state
+    
+    def _monument_request(self, state_name: str) -> Dict:
+        return {
+            "textQuery": f"monument OR memorial {state_name}"
             # No maxResultCount - get ALL monuments in the state
         }
-        
-        try:
-            response = requests.post(
-                self.TEXT_SEARCH_URL,
-                headers=self.headers,
-                json=request_body,
-                timeout=10
-            )
+    
+    def _parse_monuments(self, data: Dict, state_name: str, limit: Optional[int]) -> List[Attraction]:
+        monuments = []
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            name_lower = name.lower()
+            address = place.get('formattedAddress', '')
             
-            if response.status_code != 200:
-                return []
+            if state_name not in address:
+                continue
             
-            data = response.json()
-            monuments = []
+            if not any(keyword in name_lower for keyword in [
+                'monument', 'memorial', 'statue', 'historic site',
+                'historical marker', 'commemorative'
+            ]):
+                continue
             
-            for place in data.get('places', []):
-                name = place.get('displayName', {}).get('text', '')
-                name_lower = name.lower()
-                address = place.get('formattedAddress', '')
-                
-                if state_name not in address:
-                    continue
-                
-                if not any(keyword in name_lower for keyword in [
-                    'monument', 'memorial', 'statue', 'historic site',
-                    'historical marker', 'commemorative'
-                ]):
-                    continue
-                
-                if any(skip in name_lower for skip in [
-                    'cemetery', 'funeral', 'pet memorial', 'plaque company'
-                ]):
-                    continue
-                
-                rating = place.get('rating', 0.0)
-                reviews = place.get('userRatingCount', 0)
-                location_data = place.get('location', {})
-                
-                wiki_info = WikipediaHelper.search_wikipedia(name)
-                
-                monument = Attraction(
-                    name=name,
-                    address=address,
-                    location=state_name,
-                    type='monument',
-                    rating=rating,
-                    user_ratings_total=reviews,
-                    lat=location_data.get('latitude', 0),
-                    lon=location_data.get('longitude', 0),
-                    website=place.get('websiteUri', None),
-                    wikipedia_url=wiki_info['url'] if wiki_info else None,
-                    wikipedia_summary=wiki_info['summary'] if wiki_info else None
-                )
-                monuments.append(monument)
+            if any(skip in name_lower for skip in [
+                'cemetery', 'funeral', 'pet memorial', 'plaque company'
+            ]):
+                continue
             
-            monuments.sort(
-                key=lambda m: calculate_popularity_score(m.rating, m.user_ratings_total),
-                reverse=True
-            )
+            rating = place.get('rating', 0.0)
+            reviews = place.get('userRatingCount', 0)
+            location_data = place.get('location', {})
             
-            if limit:
-                return monuments[:limit]
+            monument = Attraction(
+                name=name,
+                address=address,
+                location=state_name,
+                type='monument',
+                rating=rating,
+                user_ratings_total=reviews,
+                lat=location_data.get('latitude', 0),
+                lon=location_data.get('longitude', 0),
+                website=place.get('websiteUri', None)
+            )
+            monuments.append(monument)
+        
+        self._sort_by_popularity(monuments)
+        if limit:
+            return monuments[:limit]
+        return monuments
+    
+    def find_monuments_by_state(self, state_name: str, limit: int = None) -> List[Attraction]:
+        """Find monuments and memorials in a given state - returns ALL monuments."""
+        try:
+            data = self._post(self.TEXT_SEARCH_URL, self._monument_request(state_name), 'monuments', field_mask=self._field_mask('monument'))
+            monuments = self._parse_monuments(data, state_name, limit)
+            self._add_wikipedia_info(monuments)
             return monuments
-            
+        
         except Exception as e:
             print(f"    ⚠ Error searching for monuments in {state_name}: {e}")
             return []
     
+    # EV chargers
+    
+    def _city_charger_request(self, lat: float, lon: float) -> Dict:
+        return {
+            "includedTypes": ["electric_vehicle_charging_station"],
+            "locationRestriction": {
+                "circle": {
+                    "center": {"latitude": lat, "longitude": lon},
+                    "radius": 40000  # 40km radius for cities
+                }
+            },
+            "rankPreference": "POPULARITY",
+            "maxResultCount": 20
+        }
+    
+    def _parse_chargers(self, data: Dict, location_label: str, lat: float, lon: float) -> List[Attraction]:
+        chargers = []
+        for place in data.get('places', []):
+            name = place.get('displayName', {}).get('text', '')
+            rating = place.get('rating', 0.0)
+            reviews = place.get('userRatingCount', 0)
+            
+            location_data = place.get('location', {})
+            
+            charger = Attraction(
+                name=name,
+                address=place.get('formattedAddress', ''),
+                location=location_label,
+                type='ev_charger',
+                rating=rating,
+                user_ratings_total=reviews,
+                lat=location_data.get('latitude', lat),
+                lon=location_data.get('longitude', lon),
+                website=place.get('websiteUri', None),
+                wikipedia_url=None,
+                wikipedia_summary=None
+            )
+            chargers.append(charger)
+        return chargers
+    
     def find_ev_chargers_in_city(self, city_name: str, lat: float, lon: float, limit: int = 5) -> List[Attraction]:
         """Find EV charging stations in a city.
         
@@ -844,143 +1197,332 @@ class GooglePlacesFinder:
             lon: Longitude
             limit: Maximum number of results
         """
-        request_body = {
+        try:
+            data = self._post(self.NEARBY_SEARCH_URL, self._city_charger_request(lat, lon), 'ev_chargers', field_mask=self._field_mask('city_charger'))
+            chargers = self._parse_chargers(data, city_name, lat, lon)
+            self._sort_by_popularity(chargers)
+            return chargers[:limit] if limit else chargers
+        
+        except Exception as e:
+            print(f"    ⚠ Error searching for EV chargers in {city_name}: {e}")
+            return []
+    
+    def _route_charger_request(self, lat: float, lon: float, radius_m: float = 20000) -> Dict:
+        return {
             "includedTypes": ["electric_vehicle_charging_station"],
             "locationRestriction": {
                 "circle": {
                     "center": {"latitude": lat, "longitude": lon},
-                    "radius": 40000  # 40km radius for cities
+                    "radius": radius_m
                 }
             },
             "rankPreference": "POPULARITY",
-            "maxResultCount": 20
+            "maxResultCount": 5
         }
+    
+    @staticmethod
+    def _dedupe_by_name(items: List) -> List:
+        """Keep the first item for each name, preserving order."""
+        seen_names = set()
+        unique = []
+        for item in items:
+            if item.name not in seen_names:
+                seen_names.add(item.name)
+                unique.append(item)
+        return unique
+    
+    def find_ev_chargers_along_route(self, route_geometry: RouteLike,
+                                      sample_interval_miles: Optional[int] = None,
+                                      log: Callable[[str], None] = print) -> List[Attraction]:
+        """Find EV charging stations along a route.
         
-        try:
-            response = requests.post(
-                self.NEARBY_SEARCH_URL,
-                headers=self.headers,
-                json=request_body,
-                timeout=10
+        Args:
+            route_geometry: RouteGeometry or list of [lon, lat] coordinates
+            sample_interval_miles: Sample every N miles instead of using the coverage plan
+            log: Progress callback (defaults to print)
+        """
+        route = RouteGeometry.wrap(route_geometry)
+        if self.corridor_search:
+            corridor_chargers = self._corridor_scan(
+                route, "EV charging station", "electric_vehicle_charging_station", 'ev_chargers', 20000,
+                lambda data, lat, lon, distance_m: self._parse_chargers(data, f"Mile {int(distance_m / 1609.34)}", lat, lon),
+                log
             )
-            response.raise_for_status()
-            data = response.json()
+            if corridor_chargers is not None:
+                return self._dedupe_by_name(corridor_chargers)
+        
+        chargers = []
+        
+        # Search points along route
+        points, radius_m = self._route_search_points(route, 'ev_chargers', sample_interval_miles, log=log)
+        for lat, lon, distance_m in points:
+            try:
+                data = self._post(self.NEARBY_SEARCH_URL, self._route_charger_request(lat, lon, radius_m), 'ev_chargers', field_mask=self._field_mask('route_charger'))
+                chargers.extend(self._parse_chargers(data, f"Mile {int(distance_m / 1609.34)}", lat, lon))
+            except Exception as e:
+                log(f"    ⚠ Error searching chargers at mile {int(distance_m / 1609.34)}: {e}")
+        
+        # Deduplicate by name
+        return self._dedupe_by_name(chargers)
+    
+    # Single-pass route scan over several categories
+    
+    # Route scan categories answered by Nearby Search: (place types, results kept per point).
+    # Categories sharing search points are combined into one request.
+    ROUTE_NEARBY_TYPES = {
+        'parks': (["park", "national_park", "state_park"], 10),
+        'ev_chargers': (["electric_vehicle_charging_station"], 5),
+    }
+    ROUTE_SCAN_CATEGORIES = ['parks', 'viewpoints', 'ev_chargers']
+    
+    def _route_nearby_request(self, lat: float, lon: float, radius_m: float, categories: List[str]) -> Dict:
+        if len(categories) == 1:
+            # Same request as the single-category scan, so cached responses are shared
+            build_request = self._route_park_request if categories[0] == 'parks' else self._route_charger_request
+            return build_request(lat, lon, radius_m)
+        
+        return {
+            "includedTypes": [t for category in categories for t in self.ROUTE_NEARBY_TYPES[category][0]],
+            "locationRestriction": {
+                "circle": {
+                    "center": {"latitude": lat, "longitude": lon},
+                    "radius": radius_m
+                }
+            },
+            "rankPreference": "POPULARITY",
+            "maxResultCount": 20
+        }
+    
+    def _route_scan_requests(
+        self,
+        route: RouteGeometry,
+        categories: List[str],
+        sample_interval_miles: Optional[float] = None,
+        log: Callable[[str], None] = print
+    ) -> List[Dict]:
+        """
+        Build every request of a multi-category route scan, in route order per point group.
+        
+        The Nearby Search categories share one set of search points, planned for
+        the largest of their circles, and one request per point; each category
+        then keeps only the places within its own radius of the route.
+        
+        Returns:
+            Dicts with url, body, field_mask, category (for the cache TTL),
+            point (lat, lon, distance_m), categories answered and radii
+            (each category's own search radius)
+        """
+        nearby = [category for category in categories if category in self.ROUTE_NEARBY_TYPES]
+        groups = [group for group in (nearby, [c for c in categories if c not in nearby]) if group]
+        
+        requests = []
+        for group in groups:
+            lead = max(group, key=lambda c: self._route_scan_circle(c, sample_interval_miles))
+            points, radius_m = self._route_search_points(route, lead, sample_interval_miles, label=', '.join(group),
+                                                         log=log, categories=group)
+            radii = {category: self.SAMPLING_RADIUS_M[category] for category in group}
+            nearby = [category for category in group if category in self.ROUTE_NEARBY_TYPES]
+            kinds = [self.ROUTE_SCAN_KINDS[category] for category in nearby]
+            field_mask = self._field_mask(*kinds, extra=('types',) if len(nearby) > 1 else ())
+            ttl_category = min(nearby, key=lambda c: PLACES_CACHE_TTL.get(c, 0)) if nearby else None
             
-            chargers = []
-            for place in data.get('places', []):
-                name = place.get('displayName', {}).get('text', '')
-                rating = place.get('rating', 0.0)
-                reviews = place.get('userRatingCount', 0)
-                
-                location_data = place.get('location', {})
-                
-                charger = Attraction(
-                    name=name,
-                    address=place.get('formattedAddress', ''),
-                    location=city_name,
-                    type='ev_charger',
-                    rating=rating,
-                    user_ratings_total=reviews,
-                    lat=location_data.get('latitude', lat),
-                    lon=location_data.get('longitude', lon),
-                    website=place.get('websiteUri', None),
-                    wikipedia_url=None,
-                    wikipedia_summary=None
-                )
-                chargers.append(charger)
+            for point in points:
+                lat, lon, _ = point
+                if nearby:
+                    requests.append({
+                        'url': self.NEARBY_SEARCH_URL,
+                        'body': self._route_nearby_request(lat, lon, radius_m, nearby),
+                        'field_mask': field_mask,
+                        'category': ttl_category,
+                        'point': point,
+                        'categories': nearby,
+                        'radii': radii
+                    })
+                if 'viewpoints' in group:
+                    requests.append({
+                        'url': self.TEXT_SEARCH_URL,
+                        'body': self._viewpoint_request(lat, lon, radius_m),
+                        'field_mask': self._field_mask('viewpoint'),
+                        'category': 'viewpoints',
+                        'point': point,
+                        'categories': ['viewpoints'],
+                        'radii': radii
+                    })
+        return requests
+    
+    def _route_scan_circle(self, category: str, sample_interval_miles: Optional[float] = None) -> Tuple[float, float]:
+        """(search radius, corridor half-width) in meters that a route scan category is planned with."""
+        if sample_interval_miles:
+            return self.SAMPLING_RADIUS_M[category], 0
+        return ROUTE_SCAN_COVERAGE[category]
+    
+    def _route_scan_followups(self, route: RouteGeometry, requests: List[Dict],
+                              responses: List) -> List[Tuple[int, Dict]]:
+        """
+        Single-category retries for combined requests that came back full.
+        
+        A full combined response may have crowded out a category, so any
+        category with fewer results than it keeps (within its own radius) is
+        asked for on its own, at its own radius.
+        
+        Returns:
+            (index of the combined request, single-category request) pairs
+        """
+        followups = []
+        for i, (request, data) in enumerate(zip(requests, responses)):
+            if len(request['categories']) < 2 or isinstance(data, Exception):
+                continue
+            places = data.get('places', [])
+            if len(places) < request['body']['maxResultCount']:
+                continue
             
-            chargers.sort(
-                key=lambda c: calculate_popularity_score(c.rating, c.user_ratings_total),
-                reverse=True
-            )
+            by_category = self._split_route_places(route, places, request)
+            for category in request['categories']:
+                if len(by_category[category]) < self.ROUTE_NEARBY_TYPES[category][1]:
+                    lat, lon, _ = request['point']
+                    radius_m = request['radii'][category]
+                    followups.append((i, {
+                        'url': self.NEARBY_SEARCH_URL,
+                        'body': self._route_nearby_request(lat, lon, radius_m, [category]),
+                        'field_mask': self._field_mask(self.ROUTE_SCAN_KINDS[category]),
+                        'category': category,
+                        'point': request['point'],
+                        'categories': [category],
+                        'radii': {category: radius_m}
+                    }))
+        return followups
+    
+    def _split_route_places(self, route: RouteGeometry, places: List[Dict], request: Dict) -> Dict[str, List[Dict]]:
+        """
+        Assign a route scan request's Nearby Search results to its categories.
+        
+        Places are matched by type (for combined requests) and, when the search
+        circle is wider than the category's own radius, kept only within that
+        radius of the route, up to the category's cap.
+        """
+        radius_m = request['body']['locationRestriction']['circle']['radius']
+        by_category = {}
+        for category in request['categories']:
+            types = set(self.ROUTE_NEARBY_TYPES[category][0])
+            if len(request['categories']) > 1:
+                matches = [place for place in places if types.intersection(place.get('types', []))]
+            else:
+                matches = places
+            if request['radii'][category] < radius_m:
+                matches = self._places_within(matches, route, request['radii'][category])
+            by_category[category] = matches[:self.ROUTE_NEARBY_TYPES[category][1]]
+        return by_category
+    
+    @staticmethod
+    def _places_within(places: List[Dict], route: RouteGeometry, radius_m: float) -> List[Dict]:
+        """Places within radius_m of the nearest route vertex; places without a location are kept."""
+        return [
+            place for place in places
+            if 'location' not in place
+            or route.nearest_vertex(place['location']['latitude'], place['location']['longitude'])[1] <= radius_m
+        ]
+    
+    def _parse_route_scan(self, route: RouteGeometry, requests: List[Dict], responses: List,
+                          followups: List[Tuple[int, Dict]], followup_responses: List,
+                          log: Callable[[str], None] = print) -> Dict[str, List[Attraction]]:
+        """Dispatch route scan responses (or exceptions) to each category's parser, in request order."""
+        retried = {}
+        for (i, request), data in zip(followups, followup_responses):
+            retried[(i, request['categories'][0])] = (request, data)
+        
+        results = {category: [] for request in requests for category in request['categories']}
+        seen = {category: set() for category in results}
+        
+        for i, (request, data) in enumerate(zip(requests, responses)):
+            lat, lon, distance_m = request['point']
+            if isinstance(data, Exception):
+                log(f"    ⚠ Route scan error ({', '.join(request['categories'])}) at mile {int(distance_m / 1609.34)}: {data}")
+                continue
             
-            return chargers[:limit] if limit else chargers
+            if request['categories'] == ['viewpoints']:
+                results['viewpoints'].extend(self._parse_viewpoints(data, lat, lon, distance_m, seen['viewpoints']))
+                continue
             
-        except Exception as e:
-            print(f"    ⚠ Error searching for EV chargers in {city_name}: {e}")
-            return []
+            by_category = self._split_route_places(route, data.get('places', []), request)
+            for category, places in by_category.items():
+                retry, retry_data = retried.get((i, category), (None, None))
+                if retry is not None and not isinstance(retry_data, Exception):
+                    places = self._split_route_places(route, retry_data.get('places', []), retry)[category]
+                if category == 'parks':
+                    results['parks'].extend(self._parse_route_parks({'places': places}, lat, lon, distance_m, seen['parks']))
+                else:
+                    results['ev_chargers'].extend(
+                        self._parse_chargers({'places': places}, f"Mile {int(distance_m / 1609.34)}", lat, lon)
+                    )
+        
+        for category in ('parks', 'viewpoints'):
+            if category in results:
+                self._sort_by_popularity(results[category])
+        if 'ev_chargers' in results:
+            results['ev_chargers'] = self._dedupe_by_name(results['ev_chargers'])
+        return results
     
-    def find_ev_chargers_along_route(self, route_geometry: List[List[float]], 
-                                      sample_interval_miles: int = 15) -> List[Attraction]:
-        """Find EV charging stations along a route.
+    def _route_scan_finders(self) -> Dict[str, Callable]:
+        return {
+            'parks': self.find_parks_along_route,
+            'viewpoints': self.find_scenic_viewpoints_along_route,
+            'ev_chargers': self.find_ev_chargers_along_route,
+        }
+    
+    def scan_route(
+        self,
+        route_geometry: RouteLike,
+        categories: Optional[List[str]] = None,
+        sample_interval_miles: Optional[int] = None,
+        fan_out=None,
+        log: Callable[[str], None] = print
+    ) -> Dict[str, List[Attraction]]:
+        """
+        Scan the route for several categories in one pass.
+        
+        Search points are planned once per distinct search circle, and parks and
+        EV chargers sharing a point are fetched with one combined Nearby Search.
+        Results go through the same filters as the per-category finders. In
+        corridor mode each category runs its own corridor search instead.
         
         Args:
-            route_geometry: List of [lon, lat] coordinates
-            sample_interval_miles: Distance between sample points in miles
+            route_geometry: RouteGeometry or list of [lon, lat] coordinates
+            categories: Any of 'parks', 'viewpoints', 'ev_chargers' (default: all; an empty list scans nothing)
+            sample_interval_miles: Sample every N miles instead of using coverage plans
+            fan_out: OrderedFanOut to run the requests on (sequential if omitted)
+            log: Progress callback (defaults to print); passed per call because
+                one finder serves several trips at once
+        
+        Returns:
+            Attractions by category
         """
-        chargers = []
-        sample_interval_m = sample_interval_miles * 1609.34
-        
-        # Sample points along route
-        total_distance = 0
-        last_sample_distance = 0
-        
-        for i in range(len(route_geometry) - 1):
-            lon1, lat1 = route_geometry[i]
-            lon2, lat2 = route_geometry[i + 1]
-            
-            segment_distance = haversine_distance(lat1, lon1, lat2, lon2) * 1609.34
-            total_distance += segment_distance
-            
-            if total_distance - last_sample_distance >= sample_interval_m:
-                # Search for chargers at this point
-                request_body = {
-                    "includedTypes": ["electric_vehicle_charging_station"],
-                    "locationRestriction": {
-                        "circle": {
-                            "center": {"latitude": lat2, "longitude": lon2},
-                            "radius": 20000  # 20km radius along route
-                        }
-                    },
-                    "rankPreference": "POPULARITY",
-                    "maxResultCount": 5
-                }
-                
-                try:
-                    response = requests.post(
-                        self.NEARBY_SEARCH_URL,
-                        headers=self.headers,
-                        json=request_body,
-                        timeout=10
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    for place in data.get('places', []):
-                        name = place.get('displayName', {}).get('text', '')
-                        rating = place.get('rating', 0.0)
-                        reviews = place.get('userRatingCount', 0)
-                        
-                        location_data = place.get('location', {})
-                        
-                        charger = Attraction(
-                            name=name,
-                            address=place.get('formattedAddress', ''),
-                            location=f"Mile {int(total_distance / 1609.34)}",
-                            type='ev_charger',
-                            rating=rating,
-                            user_ratings_total=reviews,
-                            lat=location_data.get('latitude', lat2),
-                            lon=location_data.get('longitude', lon2),
-                            website=place.get('websiteUri', None),
-                            wikipedia_url=None,
-                            wikipedia_summary=None
-                        )
-                        chargers.append(charger)
-                    
-                    time.sleep(1)  # Rate limiting
-                    
-                except Exception as e:
-                    print(f"    ⚠ Error searching chargers at mile {int(total_distance / 1609.34)}: {e}")
-                
-                last_sample_distance = total_distance
+        route = RouteGeometry.wrap(route_geometry)
+        if categories is None:
+            categories = self.ROUTE_SCAN_CATEGORIES
+        categories = [c for c in self.ROUTE_SCAN_CATEGORIES if c in categories]
+        if not categories:
+            return {}
         
-        # Deduplicate by name
-        seen_names = set()
-        unique_chargers = []
-        for charger in chargers:
-            if charger.name not in seen_names:
-                seen_names.add(charger.name)
-                unique_chargers.append(charger)
+        if self.corridor_search:
+            finders = self._route_scan_finders()
+            if fan_out is None:
+                return {category: finders[category](route, sample_interval_miles, log) for category in categories}
+            futures = {category: fan_out.submit(finders[category], route, sample_interval_miles, log) for category in categories}
+            return {category: future.result() for category, future in futures.items()}
+        
+        def post(request):
+            try:
+                return self._post(request['url'], request['body'], request['category'], field_mask=request['field_mask'])
+            except Exception as e:
+                return e
+        
+        def run(batch):
+            return fan_out.map(post, batch) if fan_out is not None else [post(request) for request in batch]
+        
+        requests = self._route_scan_requests(route, categories, sample_interval_miles, log)
+        responses = run(requests)
+        followups = self._route_scan_followups(route, requests, responses)
+        followup_responses = run([request for _, request in followups])
         
-        return unique_chargers
+        log(f"    {len(requests) + len(followups)} route scan requests for {', '.join(categories)}")
+        return self._parse_route_scan(route, requests, responses, followups, followup_responses, log)
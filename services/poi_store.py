@@ -0,0 +1,276 @@
+"""Local spatial store of Places results, answering repeat nearby searches offline."""
+
+import json
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils.distance import haversine_distance, calculate_popularity_score
+
+# Same sphere as haversine_distance
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE = EARTH_RADIUS_M * math.pi / 180
+
+
+class POIStore:
+    """
+    SQLite store of every place Nearby Search has returned, indexed with R-trees.
+    
+    Places are keyed by place_id and remember which searches (place types and
+    filters, the "category") found them. A search that came back with fewer
+    results than it asked for returned every matching place in its circle, so
+    that circle is recorded as fully queried. A later search for the same
+    category and fields lying inside fully queried circles (within the TTL) is
+    answered from the stored places without a network call.
+    """
+    
+    def __init__(self, path: str, ttls: Optional[Dict[str, int]] = None, default_ttl: int = 7 * 86400):
+        """
+        Args:
+            path: SQLite database file (':memory:' for a throwaway store)
+            ttls: Seconds a search stays authoritative, keyed by request category (as in ResponseCache)
+            default_ttl: TTL for categories not listed in ttls
+        """
+        self.path = str(path)
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS places ('
+            'id INTEGER PRIMARY KEY, place_id TEXT UNIQUE, lat REAL, lon REAL, '
+            'rating REAL, reviews INTEGER, open_now INTEGER, has_hours INTEGER, '
+            'data TEXT, fetched_at REAL)'
+        )
+        self._conn.execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS places_index '
+            'USING rtree(id, min_lat, max_lat, min_lon, max_lon)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS place_categories ('
+            'place INTEGER, category TEXT, fetched_at REAL, PRIMARY KEY (place, category))'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS circles ('
+            'id INTEGER PRIMARY KEY, category TEXT, fields TEXT, '
+            'lat REAL, lon REAL, radius_m REAL, fetched_at REAL)'
+        )
+        self._conn.execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS circles_index '
+            'USING rtree(id, min_lat, max_lat, min_lon, max_lon)'
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def search_category(request_body: Dict) -> str:
+        """Identify which places a Nearby Search can return, ignoring where, how many and in what order."""
+        body = {
+            key: value for key, value in request_body.items()
+            if key not in ('locationRestriction', 'maxResultCount', 'rankPreference')
+        }
+        for key in ('includedTypes', 'excludedTypes', 'includedPrimaryTypes', 'excludedPrimaryTypes'):
+            if key in body:
+                body[key] = sorted(body[key])
+        return json.dumps(body, sort_keys=True, separators=(',', ':'))
+    
+    @staticmethod
+    def mask_fields(field_mask: str) -> List[str]:
+        """Top-level place fields named by an X-Goog-FieldMask."""
+        fields = []
+        for path in field_mask.split(','):
+            path = path.strip()
+            if path.startswith('places.'):
+                field = path[len('places.'):].split('.')[0]
+                if field not in fields:
+                    fields.append(field)
+        return fields
+    
+    @staticmethod
+    def _circle(request_body: Dict) -> Optional[Tuple[float, float, float]]:
+        circle = request_body.get('locationRestriction', {}).get('circle')
+        if not circle:
+            return None
+        center = circle.get('center', {})
+        return center.get('latitude', 0.0), center.get('longitude', 0.0), float(circle.get('radius', 0.0))
+    
+    @staticmethod
+    def _bbox(lat: float, lon: float, radius_m: float) -> Tuple[float, float, float, float]:
+        """(min_lat, max_lat, min_lon, max_lon) around a circle, with a little slack."""
+        dlat = 1.01 * radius_m / METERS_PER_DEGREE
+        dlon = dlat / max(math.cos(math.radians(abs(lat) + dlat)), 0.01)
+        return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+    
+    @staticmethod
+    def _probe_points(lat: float, lon: float, radius_m: float) -> Iterable[Tuple[float, float]]:
+        """The center plus rings at half and full radius, where coverage is checked."""
+        yield lat, lon
+        lat_r = math.radians(lat)
+        for fraction, count in ((0.5, 8), (1.0, 16)):
+            d = fraction * radius_m / EARTH_RADIUS_M
+            for k in range(count):
+                bearing = 2 * math.pi * k / count
+                lat2 = math.asin(math.sin(lat_r) * math.cos(d) + math.cos(lat_r) * math.sin(d) * math.cos(bearing))
+                dlon = math.atan2(math.sin(bearing) * math.sin(d) * math.cos(lat_r),
+                                  math.cos(d) - math.sin(lat_r) * math.sin(lat2))
+                yield math.degrees(lat2), lon + math.degrees(dlon)
+    
+    def lookup(self, request_body: Dict, field_mask: str, category: str = 'default') -> Optional[Dict]:
+        """
+        Answer a Nearby Search from the store if its circle has been fully queried.
+        
+        Args:
+            request_body: Nearby Search request body
+            field_mask: Fields the response must carry
+            category: Request category, used for the TTL
+        
+        Returns:
+            Response shaped like the API's ({'places': [...]}), or None to go to the network
+        """
+        circle = self._circle(request_body)
+        if circle is None:
+            return None
+        lat, lon, radius_m = circle
+        search = self.search_category(request_body)
+        fields = self.mask_fields(field_mask)
+        fresh_since = time.time() - self.ttls.get(category, self.default_ttl)
+        min_lat, max_lat, min_lon, max_lon = self._bbox(lat, lon, radius_m)
+        
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT c.lat, c.lon, c.radius_m, c.fields FROM circles c '
+                'JOIN circles_index i ON i.id = c.id '
+                'WHERE i.max_lat >= ? AND i.min_lat <= ? AND i.max_lon >= ? AND i.min_lon <= ? '
+                'AND c.category = ? AND c.fetched_at >= ?',
+                (min_lat, max_lat, min_lon, max_lon, search, fresh_since)
+            ).fetchall()
+            covering = [
+                (c_lat, c_lon, c_radius) for c_lat, c_lon, c_radius, c_fields in rows
+                if set(fields) <= set(c_fields.split(','))
+            ]
+            covered = covering and all(
+                any(haversine_distance(p_lat, p_lon, c_lat, c_lon, unit='meters') <= c_radius + 1.0
+                    for c_lat, c_lon, c_radius in covering)
+                for p_lat, p_lon in self._probe_points(lat, lon, radius_m)
+            )
+            if not covered:
+                self.misses += 1
+                return None
+            
+            candidates = self._conn.execute(
+                'SELECT p.lat, p.lon, p.rating, p.reviews, p.data FROM places p '
+                'JOIN places_index i ON i.id = p.id '
+                'JOIN place_categories pc ON pc.place = p.id '
+                'WHERE i.max_lat >= ? AND i.min_lat <= ? AND i.max_lon >= ? AND i.min_lon <= ? '
+                'AND pc.category = ? AND pc.fetched_at >= ?',
+                (min_lat, max_lat, min_lon, max_lon, search, fresh_since)
+            ).fetchall()
+            self.hits += 1
+        
+        matches = []
+        for p_lat, p_lon, rating, reviews, data in candidates:
+            distance_m = haversine_distance(lat, lon, p_lat, p_lon, unit='meters')
+            if distance_m <= radius_m:
+                matches.append((distance_m, rating or 0.0, reviews or 0, json.loads(data)))
+        
+        if request_body.get('rankPreference') == 'DISTANCE':
+            matches.sort(key=lambda m: m[0])
+        else:
+            matches.sort(key=lambda m: calculate_popularity_score(m[1], m[2]), reverse=True)
+        
+        places = [
+            {field: place[field] for field in fields if field in place}
+            for _, _, _, place in matches[:request_body.get('maxResultCount', 20)]
+        ]
+        return {'places': places}
+    
+    def record(self, request_body: Dict, field_mask: str, data: Dict) -> None:
+        """
+        Store a Nearby Search response's places, and its circle if it returned everything.
+        
+        Args:
+            request_body: Nearby Search request body
+            field_mask: Fields the response carries
+            data: Parsed response
+        """
+        circle = self._circle(request_body)
+        places = data.get('places', [])
+        # Without place IDs the results can't be keyed (the field mask must include places.id)
+        if circle is None or any('id' not in place for place in places):
+            return
+        lat, lon, radius_m = circle
+        search = self.search_category(request_body)
+        now = time.time()
+        
+        with self._lock:
+            for place in places:
+                self._upsert_place(place, search, now)
+            
+            if len(places) < request_body.get('maxResultCount', 20):
+                cursor = self._conn.execute(
+                    'INSERT INTO circles (category, fields, lat, lon, radius_m, fetched_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (search, ','.join(self.mask_fields(field_mask)), lat, lon, radius_m, now)
+                )
+                self._conn.execute(
+                    'INSERT INTO circles_index (id, min_lat, max_lat, min_lon, max_lon) VALUES (?, ?, ?, ?, ?)',
+                    (cursor.lastrowid,) + self._bbox(lat, lon, radius_m)
+                )
+            self._conn.commit()
+    
+    def _upsert_place(self, place: Dict, search: str, now: float) -> None:
+        """Insert or refresh one place (merging fields seen under other masks) and tag its category."""
+        location = place.get('location', {})
+        lat = location.get('latitude')
+        lon = location.get('longitude')
+        if lat is None or lon is None:
+            return
+        
+        row = self._conn.execute('SELECT id, data FROM places WHERE place_id = ?', (place['id'],)).fetchone()
+        merged = {**json.loads(row[1]), **place} if row is not None else dict(place)
+        hours = merged.get('currentOpeningHours') or {}
+        values = (
+            lat, lon, merged.get('rating'), merged.get('userRatingCount'),
+            None if 'openNow' not in hours else int(hours['openNow']),
+            int('regularOpeningHours' in merged or 'currentOpeningHours' in merged),
+            json.dumps(merged), now
+        )
+        
+        if row is None:
+            place_row = self._conn.execute(
+                'INSERT INTO places (lat, lon, rating, reviews, open_now, has_hours, data, fetched_at, place_id) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                values + (place['id'],)
+            ).lastrowid
+        else:
+            place_row = row[0]
+            self._conn.execute(
+                'UPDATE places SET lat = ?, lon = ?, rating = ?, reviews = ?, open_now = ?, has_hours = ?, '
+                'data = ?, fetched_at = ? WHERE id = ?',
+                values + (place_row,)
+            )
+            self._conn.execute('DELETE FROM places_index WHERE id = ?', (place_row,))
+        self._conn.execute(
+            'INSERT INTO places_index (id, min_lat, max_lat, min_lon, max_lon) VALUES (?, ?, ?, ?, ?)',
+            (place_row, lat, lat, lon, lon)
+        )
+        self._conn.execute(
+            'INSERT OR REPLACE INTO place_categories (place, category, fetched_at) VALUES (?, ?, ?)',
+            (place_row, search, now)
+        )
+    
+    def clear(self) -> None:
+        """Remove every stored place and queried circle."""
+        with self._lock:
+            for table in ('places', 'places_index', 'place_categories', 'circles', 'circles_index'):
+                self._conn.execute(f'DELETE FROM {table}')
+            self._conn.commit()
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and how many places and circles are stored."""
+        with self._lock:
+            places = self._conn.execute('SELECT COUNT(*) FROM places').fetchone()[0]
+            circles = self._conn.execute('SELECT COUNT(*) FROM circles').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'places': places, 'circles': circles}
@@ -0,0 +1,79 @@
+"""Per-host token-bucket rate limiting for the external API services."""
+
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+from typing import Dict, Optional
+from config import RATE_LIMITS
+
+
+class TokenBucket:
+    """Thread-safe token bucket: sleeps only when the request budget is exhausted."""
+    
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens (possibly going negative) and return how long to wait for them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+    
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens, waiting until they are available.
+        
+        Waiting callers reserve their tokens up front, so concurrent callers
+        are spaced out in arrival order instead of waking all at once.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """Like acquire(), but waits with asyncio.sleep so the event loop keeps running."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(url: str) -> Optional[TokenBucket]:
+    """
+    Get the shared token bucket for a URL's host.
+    
+    Returns:
+        TokenBucket configured from config.RATE_LIMITS, or None for unlimited hosts
+    """
+    host = urlsplit(url).hostname or ''
+    if host not in RATE_LIMITS:
+        return None
+    
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            rate, capacity = RATE_LIMITS[host]
+            limiter = TokenBucket(rate, capacity)
+            _limiters[host] = limiter
+        return limiter
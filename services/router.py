@@ -1,15 +1,71 @@
 """Route calculation service using OSRM."""
 
-import time
-import requests
-from typing import List, Dict, Tuple
-from utils.distance import haversine_distance
+import numpy as np
+from services.http_client import ServiceClient, JSONRequest, Blocking, RequestSteps
+from services.cache import ResponseCache
+from typing import List, Dict, Tuple, Optional
+from utils.polyline import encode_polyline_array, decode_polyline_array
+from utils.route_geometry import RouteGeometry
+from config import OSRM_GEOMETRIES
+
+# A route leg: its (N, 2) [lon, lat] coordinate array and its OSRM leg entry (distance, duration, steps)
+Leg = Tuple[np.ndarray, Dict]
+
+
+def leg_key(start: Tuple[float, float], end: Tuple[float, float]) -> Tuple[float, ...]:
+    """Identify a leg by its endpoints (rounded to about a meter)."""
+    return tuple(round(value, 5) for value in (*start, *end))
+
+
+def stitch_legs(legs: List[Leg]) -> Tuple[Dict, List[int]]:
+    """
+    Join legs into one route, shaped like OSRMRouter.get_route() output.
+    
+    Returns:
+        (route_data, leg bounds as in RouteGeometry.leg_bounds)
+    """
+    pieces = []
+    bounds = [0]
+    count = 0
+    for leg_coordinates, _ in legs:
+        # Consecutive legs share the waypoint vertex; keep it once
+        if count and len(leg_coordinates) and np.array_equal(pieces[-1][-1], leg_coordinates[0]):
+            leg_coordinates = leg_coordinates[1:]
+        if len(leg_coordinates):
+            pieces.append(leg_coordinates)
+        count += len(leg_coordinates)
+        bounds.append(count - 1)
+    
+    route_data = {
+        'distance_m': sum(osrm_leg['distance'] for _, osrm_leg in legs),
+        'duration_s': sum(osrm_leg['duration'] for _, osrm_leg in legs),
+        'geometry': {'type': 'LineString', 'coordinates': np.concatenate(pieces) if pieces else np.empty((0, 2))},
+        'legs': [osrm_leg for _, osrm_leg in legs],
+        'success': True
+    }
+    return route_data, bounds
 
 
 class OSRMRouter:
     """Calculate routes using OSRM."""
     
     BASE_URL = "http://router.project-osrm.org/route/v1/driving"
+    # Per-segment distance and driving time, for time-based stop selection and exact leg bounds
+    ANNOTATIONS = 'distance,duration'
+    
+    def __init__(self, cache: Optional[ResponseCache] = None, geometries: str = OSRM_GEOMETRIES,
+                 steps: bool = False):
+        """
+        Args:
+            cache: Per-leg route cache, or None to always query OSRM
+            geometries: Geometry transport, 'polyline6' (compact, decoded straight
+                into an array) or 'geojson'
+            steps: Include turn-by-turn steps in each leg (only needed for directions)
+        """
+        self.http = ServiceClient(timeout=30)
+        self.cache = cache
+        self.geometries = geometries
+        self.steps = steps
     
     def get_route(self, waypoints: List[Tuple[float, float]]) -> Dict:
         """
@@ -19,48 +75,172 @@ class OSRMRouter:
             waypoints: List of (lat, lon) tuples
             
         Returns:
-            Route data including distance, duration, and geometry
+            Route data including distance, duration, and geometry; the geometry's
+            coordinates are an (N, 2) float64 array of [lon, lat] rows
+        """
+        return self.get_route_legs(waypoints)[0]
+    
+    def get_route_legs(self, waypoints: List[Tuple[float, float]],
+                       known_legs: Optional[Dict[Tuple[float, ...], Leg]] = None) -> Tuple[Dict, List[int]]:
+        """
+        Get route through multiple waypoints, assembled leg by leg.
+        
+        Legs come from known_legs, then the cache; each run of consecutive
+        missing legs is fetched with one OSRM request and its legs are cached.
+        
+        Args:
+            waypoints: List of (lat, lon) tuples
+            known_legs: Legs already routed, by leg_key()
+        
+        Returns:
+            (route data as from get_route(), leg bounds as in RouteGeometry.leg_bounds;
+            empty if the route couldn't be split into legs)
         """
+        return self.http.run(self._route_legs_steps(waypoints, known_legs))
+    
+    def _route_legs_steps(self, waypoints: List[Tuple[float, float]],
+                          known_legs: Optional[Dict[Tuple[float, ...], Leg]]) -> RequestSteps:
+        """get_route_legs() as request steps, shared with the async router."""
+        legs = yield Blocking(self._lookup_legs, waypoints, known_legs)
+        for start, end in self._missing_runs(legs):
+            run_waypoints = waypoints[start:end + 1]
+            route_data = yield from self._fetch_route_steps(run_waypoints)
+            if len(run_waypoints) == len(waypoints):
+                # Nothing to stitch: return OSRM's route as is
+                bounds = yield Blocking(self._store_legs, route_data, run_waypoints, legs, start)
+                return route_data, bounds
+            if not route_data['success']:
+                return route_data, []
+            bounds = yield Blocking(self._store_legs, route_data, run_waypoints, legs, start)
+            if not bounds:
+                # No per-leg breakdown to stitch with: route the whole trip instead
+                route_data = yield from self._fetch_route_steps(waypoints)
+                bounds = yield Blocking(self._store_legs, route_data, waypoints, [None] * len(legs), 0)
+                return route_data, bounds
+        return stitch_legs(legs)
+    
+    def _fetch_route_steps(self, waypoints: List[Tuple[float, float]]) -> RequestSteps:
+        url, params = self._route_request(waypoints)
+        
+        try:
+            return self._parse_route((yield JSONRequest('GET', url, params=params)))
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    def _leg_cache_key(self, start: Tuple[float, float], end: Tuple[float, float]) -> str:
+        return ResponseCache.make_key(self.BASE_URL, {
+            'from': list(start), 'to': list(end), 'steps': self.steps, 'annotations': self.ANNOTATIONS
+        })
+    
+    def _lookup_legs(self, waypoints: List[Tuple[float, float]],
+                     known_legs: Optional[Dict[Tuple[float, ...], Leg]]) -> List[Optional[Leg]]:
+        """Each leg from known_legs or the cache, None where it still has to be fetched."""
+        legs = []
+        for start, end in zip(waypoints, waypoints[1:]):
+            leg = (known_legs or {}).get(leg_key(start, end))
+            if leg is None and self.cache is not None:
+                cached = self.cache.get(self._leg_cache_key(start, end))
+                if cached is not None:
+                    leg = (decode_polyline_array(cached['polyline6'], precision=6)[:, ::-1], cached['leg'])
+            legs.append(leg)
+        return legs
+    
+    @staticmethod
+    def _missing_runs(legs: List[Optional[Leg]]) -> List[Tuple[int, int]]:
+        """(first waypoint, last waypoint) of each run of consecutive missing legs."""
+        runs = []
+        for k, leg in enumerate(legs):
+            if leg is not None:
+                continue
+            if runs and runs[-1][1] == k:
+                runs[-1] = (runs[-1][0], k + 1)
+            else:
+                runs.append((k, k + 1))
+        return runs
+    
+    def _store_legs(self, route_data: Dict, waypoints: List[Tuple[float, float]],
+                    legs: List[Optional[Leg]], start: int) -> List[int]:
+        """
+        Split a fetched route into its legs, fill them in from index start and cache them.
+        
+        Returns:
+            The route's leg bounds, or [] if it has no per-leg breakdown
+        """
+        osrm_legs = route_data.get('legs', []) if route_data['success'] else []
+        if len(osrm_legs) != len(waypoints) - 1:
+            return []
+        
+        coordinates = route_data['geometry']['coordinates']
+        bounds = self._annotated_leg_bounds(osrm_legs, len(coordinates))
+        if bounds is None:
+            bounds = RouteGeometry(coordinates).leg_bounds([leg['distance'] for leg in osrm_legs], waypoints)
+        for i, osrm_leg in enumerate(osrm_legs):
+            leg_coordinates = coordinates[bounds[i]:bounds[i + 1] + 1]
+            legs[start + i] = (leg_coordinates, osrm_leg)
+            if self.cache is not None:
+                self.cache.set(
+                    self._leg_cache_key(waypoints[i], waypoints[i + 1]),
+                    {'polyline6': encode_polyline_array(leg_coordinates[:, ::-1], precision=6), 'leg': osrm_leg},
+                    category='route_legs'
+                )
+        return bounds
+    
+    @staticmethod
+    def _annotated_leg_bounds(osrm_legs: List[Dict], vertex_count: int) -> Optional[List[int]]:
+        """Exact leg bounds from the legs' annotations (one entry per segment), or None without them."""
+        segments = [len(leg.get('annotation', {}).get('distance', [])) for leg in osrm_legs]
+        if not all(segments) or sum(segments) != vertex_count - 1:
+            return None
+        return [0] + np.cumsum(segments).tolist()
+    
+    def _route_request(self, waypoints: List[Tuple[float, float]]) -> Tuple[str, Dict]:
+        """Build the OSRM route URL and query parameters."""
         # Convert to lon,lat format for OSRM
         coords_str = ";".join([f"{lon},{lat}" for lat, lon in waypoints])
         url = f"{self.BASE_URL}/{coords_str}"
         
         params = {
             'overview': 'full',
-            'geometries': 'geojson',
-            'steps': 'true'
+            'geometries': self.geometries,
+            'steps': 'true' if self.steps else 'false',
+            'annotations': self.ANNOTATIONS
         }
-        
-        try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data['code'] == 'Ok' and data['routes']:
-                route = data['routes'][0]
-                return {
-                    'distance_m': route['distance'],
-                    'duration_s': route['duration'],
-                    'geometry': route['geometry'],
-                    'legs': route.get('legs', []),
-                    'success': True
-                }
-            else:
-                return {'success': False, 'error': 'No route found'}
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        return url, params
+    
+    def _parse_geometry(self, geometry) -> Dict:
+        """GeoJSON-shaped LineString whose coordinates are an (N, 2) float64 [lon, lat] array."""
+        if self.geometries == 'polyline6':
+            # A [lon, lat] view of the decoded [lat, lon] buffer, not a copy
+            coordinates = decode_polyline_array(geometry, precision=6)[:, ::-1]
+        else:
+            coordinates = np.asarray(geometry['coordinates'], dtype=float).reshape(-1, 2)
+        return {'type': 'LineString', 'coordinates': coordinates}
+    
+    def _parse_route(self, data: Dict) -> Dict:
+        if data['code'] == 'Ok' and data['routes']:
+            route = data['routes'][0]
+            return {
+                'distance_m': route['distance'],
+                'duration_s': route['duration'],
+                'geometry': self._parse_geometry(route['geometry']),
+                'legs': route.get('legs', []),
+                'success': True
+            }
+        return {'success': False, 'error': 'No route found'}
     
     def find_cities_along_route(
         self,
         route_data: Dict,
-        geocoder
+        geocoder,
+        route: Optional[RouteGeometry] = None
     ) -> List[Dict]:
         """
         Find major cities along a route using existing route data and reverse geocoding.
         
         Args:
             route_data: Route data from get_route()
-            geocoder: NominatimGeocoder instance for reverse geocoding
+            geocoder: NominatimGeocoder or OfflineReverseGeocoder for reverse geocoding
+            route: Chainage index of the route, built from route_data if omitted
             
         Returns:
             List of dicts with 'name', 'lat', 'lon', 'distance_mi' keys
@@ -68,48 +248,36 @@ class OSRMRouter:
         if not route_data['success']:
             return []
         
-        geometry = route_data['geometry']['coordinates']
+        sample_points = self._city_sample_points(route or RouteGeometry.from_route(route_data))
+        
+        # Use reverse geocoding to find city names, in one batch when the geocoder supports it
+        coords = [(lat, lon) for lat, lon, _ in sample_points]
+        if hasattr(geocoder, 'reverse_geocode_many'):
+            city_names = geocoder.reverse_geocode_many(coords)
+        else:
+            city_names = [geocoder.reverse_geocode(lat, lon) for lat, lon in coords]
         
+        return self._collect_cities(sample_points, city_names)
+    
+    def _city_sample_points(self, route: RouteGeometry) -> List[Tuple[float, float, float]]:
+        """Return (lat, lon, distance_m) points to reverse geocode along the route."""
         # Sample points along the route every ~50 miles (more frequent for better coverage)
+        return route.sample_points(50 * 1609.34)
+    
+    @staticmethod
+    def _collect_cities(sample_points: List[Tuple[float, float, float]],
+                        city_names: List[Optional[str]]) -> List[Dict]:
+        """Pair sample points with their city names, keeping the first sighting of each city."""
         cities_found = []
         seen_cities = set()
-        cumulative_distance = 0
-        last_check_distance = 0
-        check_interval_m = 50 * 1609.34  # Check every 50 miles
-        
-        for i in range(len(geometry) - 1):
-            coord1 = geometry[i]
-            coord2 = geometry[i + 1]
-            
-            segment_dist = self._haversine_distance(
-                (coord1[1], coord1[0]),
-                (coord2[1], coord2[0])
-            ) * 1609.34  # meters
-            
-            cumulative_distance += segment_dist
-            
-            # Check for cities at this point if we've traveled enough
-            if cumulative_distance - last_check_distance >= check_interval_m:
-                lat, lon = coord2[1], coord2[0]
-                
-                # Use reverse geocoding to find city name
-                city_name = geocoder.reverse_geocode(lat, lon)
-                
-                if city_name and city_name not in seen_cities:
-                    distance_mi = cumulative_distance / 1609.34
-                    cities_found.append({
-                        'name': city_name,
-                        'lat': lat,
-                        'lon': lon,
-                        'distance_mi': distance_mi
-                    })
-                    seen_cities.add(city_name)
-                    time.sleep(1)  # Rate limiting for Nominatim
-                
-                last_check_distance = cumulative_distance
+        for (lat, lon, distance_m), city_name in zip(sample_points, city_names):
+            if city_name and city_name not in seen_cities:
+                cities_found.append({
+                    'name': city_name,
+                    'lat': lat,
+                    'lon': lon,
+                    'distance_mi': distance_m / 1609.34
+                })
+                seen_cities.add(city_name)
         
         return cities_found
-    
-    def _haversine_distance(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
-        """Calculate distance between two coordinates in miles."""
-        return haversine_distance(coord1[0], coord1[1], coord2[0], coord2[1], 'miles')
@@ -0,0 +1,103 @@
+"""Single-flight request coalescing: concurrent identical calls share one execution."""
+
+import json
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_coalesced = 0
+_coalesced_lock = threading.Lock()
+
+
+def _count_coalesced() -> None:
+    global _coalesced
+    with _coalesced_lock:
+        _coalesced += 1
+
+
+def coalesced_count() -> int:
+    """Number of calls in this process answered by another caller's in-flight call."""
+    return _coalesced
+
+
+def request_key(method: str, url: str, params: Optional[Dict] = None, json_body: Any = None,
+                headers: Optional[Dict[str, str]] = None) -> str:
+    """Key identifying an HTTP request by everything that can change its response."""
+    return json.dumps([method.upper(), url, params, json_body, headers], sort_keys=True, default=str)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Share one call among threads asking for the same key at the same time.
+    
+    The first caller runs the function; callers arriving while it is in flight
+    wait for it and get the same result (or exception). Nothing is kept once the
+    call finishes, so later calls run again (caching is the caches' job).
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+    
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run func(), or wait for the in-flight call with the same key.
+        
+        Args:
+            key: Identifies calls that are interchangeable
+            func: Zero-argument function doing the work
+        
+        Returns:
+            func()'s result, possibly computed for another caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        
+        if not leader:
+            _count_coalesced()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Single-flight for coroutines on one event loop (see SingleFlight)."""
+    
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+    
+    async def do(self, key: Hashable, coro_func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await coro_func(), or the in-flight task with the same key."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_func())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            _count_coalesced()
+        
+        # One waiter being cancelled must not cancel the shared request
+        return await asyncio.shield(task)
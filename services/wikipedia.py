@@ -1,6 +1,6 @@
 """Wikipedia and Wikivoyage service."""
 
-import requests
+from services.http_client import ServiceClient, JSONRequest, RequestSteps
 from typing import Optional, Dict
 
 
@@ -11,6 +11,9 @@ class WikipediaHelper:
     WIKIVOYAGE_API = "https://en.wikivoyage.org/w/api.php"
     USER_AGENT = "RoadTripPlanner/1.0 (https://github.com/KM4HQZ/road-trip-planner; Educational use)"
     
+    # Shared by the static methods below
+    http = ServiceClient(headers={'User-Agent': USER_AGENT}, timeout=5)
+    
     @staticmethod
     def search_wikipedia(query: str) -> Optional[Dict[str, str]]:
         """
@@ -22,63 +25,76 @@ class WikipediaHelper:
         Returns:
             Dict with 'url', 'title', 'summary' or None
         """
+        return WikipediaHelper.http.run(WikipediaHelper._wikipedia_steps(query))
+    
+    @staticmethod
+    def _wikipedia_steps(query: str) -> RequestSteps:
+        """search_wikipedia() as request steps, shared with the async helper."""
         try:
-            headers = {'User-Agent': WikipediaHelper.USER_AGENT}
-            
             # Search for article
-            search_params = {
-                'action': 'query',
-                'list': 'search',
-                'srsearch': query,
-                'format': 'json',
-                'srlimit': 1
-            }
-            
-            response = requests.get(WikipediaHelper.WIKI_API, params=search_params, headers=headers, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            data = yield JSONRequest('GET', WikipediaHelper.WIKI_API, params=WikipediaHelper._search_params(query))
+            page_title = WikipediaHelper._parse_search(data)
             
-            if not data.get('query', {}).get('search'):
+            if not page_title:
                 return None
             
-            page_title = data['query']['search'][0]['title']
-            
             # Get extract (summary)
-            extract_params = {
-                'action': 'query',
-                'titles': page_title,
-                'prop': 'extracts|info',
-                'exintro': True,
-                'explaintext': True,
-                'inprop': 'url',
-                'format': 'json'
-            }
-            
-            response = requests.get(WikipediaHelper.WIKI_API, params=extract_params, headers=headers, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            
-            pages = data.get('query', {}).get('pages', {})
-            if not pages:
-                return None
-            
-            page = list(pages.values())[0]
-            
-            # Get first 2-3 sentences for popup
-            extract = page.get('extract', '')
-            sentences = extract.split('. ')
-            short_summary = '. '.join(sentences[:2]) + '.' if len(sentences) >= 2 else extract
-            
-            return {
-                'url': page.get('fullurl', ''),
-                'title': page.get('title', ''),
-                'summary': short_summary[:300] + '...' if len(short_summary) > 300 else short_summary
-            }
+            data = yield JSONRequest('GET', WikipediaHelper.WIKI_API, params=WikipediaHelper._extract_params(page_title))
+            return WikipediaHelper._parse_extract(data)
             
         except Exception as e:
             print(f"  ⚠️  Wikipedia search failed for '{query}': {e}")
             return None
     
+    @staticmethod
+    def _search_params(query: str) -> Dict:
+        return {
+            'action': 'query',
+            'list': 'search',
+            'srsearch': query,
+            'format': 'json',
+            'srlimit': 1
+        }
+    
+    @staticmethod
+    def _parse_search(data: Dict) -> Optional[str]:
+        """Return the title of the top search hit, or None."""
+        if not data.get('query', {}).get('search'):
+            return None
+        return data['query']['search'][0]['title']
+    
+    @staticmethod
+    def _extract_params(page_title: str) -> Dict:
+        return {
+            'action': 'query',
+            'titles': page_title,
+            'prop': 'extracts|info',
+            'exintro': True,
+            'explaintext': True,
+            'inprop': 'url',
+            'format': 'json'
+        }
+    
+    @staticmethod
+    def _parse_extract(data: Dict) -> Optional[Dict[str, str]]:
+        """Build the url/title/summary dict from an extracts response."""
+        pages = data.get('query', {}).get('pages', {})
+        if not pages:
+            return None
+        
+        page = list(pages.values())[0]
+        
+        # Get first 2-3 sentences for popup
+        extract = page.get('extract', '')
+        sentences = extract.split('. ')
+        short_summary = '. '.join(sentences[:2]) + '.' if len(sentences) >= 2 else extract
+        
+        return {
+            'url': page.get('fullurl', ''),
+            'title': page.get('title', ''),
+            'summary': short_summary[:300] + '...' if len(short_summary) > 300 else short_summary
+        }
+    
     @staticmethod
     def search_wikivoyage(city_name: str) -> Optional[str]:
         """
@@ -90,34 +106,41 @@ class WikipediaHelper:
         Returns:
             Wikivoyage URL or None
         """
+        return WikipediaHelper.http.run(WikipediaHelper._wikivoyage_steps(city_name))
+    
+    @staticmethod
+    def _wikivoyage_steps(city_name: str) -> RequestSteps:
+        """search_wikivoyage() as request steps, shared with the async helper."""
         try:
-            headers = {'User-Agent': WikipediaHelper.USER_AGENT}
-            
             # Try exact match first
-            params = {
-                'action': 'query',
-                'titles': city_name,
-                'prop': 'info',
-                'inprop': 'url',
-                'format': 'json'
-            }
-            
-            response = requests.get(WikipediaHelper.WIKIVOYAGE_API, params=params, headers=headers, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            
-            pages = data.get('query', {}).get('pages', {})
-            if not pages:
-                return None
-            
-            page = list(pages.values())[0]
-            
-            # Check if page exists (missing=-1)
-            if page.get('missing'):
-                return None
-            
-            return page.get('fullurl')
+            data = yield JSONRequest('GET', WikipediaHelper.WIKIVOYAGE_API, params=WikipediaHelper._wikivoyage_params(city_name))
+            return WikipediaHelper._parse_wikivoyage(data)
             
         except Exception as e:
             print(f"  ⚠️  Wikivoyage search failed for '{city_name}': {e}")
             return None
+    
+    @staticmethod
+    def _wikivoyage_params(city_name: str) -> Dict:
+        return {
+            'action': 'query',
+            'titles': city_name,
+            'prop': 'info',
+            'inprop': 'url',
+            'format': 'json'
+        }
+    
+    @staticmethod
+    def _parse_wikivoyage(data: Dict) -> Optional[str]:
+        """Return the page URL, or None if the page doesn't exist."""
+        pages = data.get('query', {}).get('pages', {})
+        if not pages:
+            return None
+        
+        page = list(pages.values())[0]
+        
+        # Check if page exists (missing=-1)
+        if page.get('missing'):
+            return None
+        
+        return page.get('fullurl')
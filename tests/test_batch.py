@@ -0,0 +1,107 @@
+"""Reading batch JSONL files into trip requests, and where their exports go."""
+
+import json
+from dataclasses import replace
+
+import pytest
+
+from config import TripConfig
+from planner.batch import BatchEntry, batch_record, batch_request, read_batch_file, run_batch
+from planner.engine import TripRequest, TripResult, export_trip
+
+DEFAULTS = TripRequest('', '', target_hours=7, config=TripConfig(search_museums=False))
+
+
+def write_batch(tmp_path, *lines):
+    path = tmp_path / 'trips.jsonl'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+def test_lines_override_defaults_and_config():
+    request = batch_request({
+        'origin': 'Atlanta, GA', 'destination': 'Denver, CO', 'via': 'Nashville, TN',
+        'waypoint_interval': 50, 'search_vets': False,
+    }, DEFAULTS)
+    
+    assert request.via == ['Nashville, TN']
+    assert request.target_hours == 7
+    assert request.waypoint_interval == 50
+    assert request.config == replace(DEFAULTS.config, search_vets=False)
+    assert DEFAULTS.config.search_vets
+
+
+@pytest.mark.parametrize('data, message', [
+    (['Atlanta, GA'], 'must be a JSON object'),
+    ({'origin': 'Atlanta, GA'}, 'origin and destination are required'),
+    ({'origin': 'A', 'destination': 'B', 'search_musems': False}, 'Unknown fields: search_musems'),
+    ({'origin': 'A', 'destination': 'B', 'via': ['C'], 'roundtrip': True}, 'both via and roundtrip'),
+])
+def test_invalid_lines_are_rejected(data, message):
+    with pytest.raises(ValueError, match=message):
+        batch_request(data, DEFAULTS)
+
+
+def test_file_keeps_line_numbers_ids_and_errors(tmp_path):
+    path = write_batch(
+        tmp_path,
+        '# spring trips',
+        '{"origin": "Atlanta, GA", "destination": "Denver, CO", "id": 7}',
+        '',
+        '{"origin": "Atlanta, GA", "destination": ',
+        '{"id": "no-destination", "origin": "Austin, TX"}',
+        '{"origin": "Austin, TX", "destination": "Boise, ID", "roundtrip": true}',
+    )
+    
+    entries = read_batch_file(path, DEFAULTS)
+    
+    assert [entry.line for entry in entries] == [2, 4, 5, 6]
+    assert entries[0].trip_id == '7' and entries[0].request.destination == 'Denver, CO'
+    assert entries[1].request is None and entries[1].error.startswith('Invalid JSON')
+    assert entries[2].trip_id == 'no-destination'
+    assert entries[2].error == 'origin and destination are required'
+    assert entries[3].request.roundtrip and entries[3].error is None
+
+
+def test_failed_entry_record():
+    entry = BatchEntry(line=3, trip_id='x', error='origin and destination are required')
+    
+    assert batch_record(entry, None, 0.004) == {
+        'line': 3, 'id': 'x', 'origin': None, 'destination': None, 'via': [],
+        'success': False, 'error': 'origin and destination are required', 'elapsed_s': 0.0,
+    }
+
+
+class ExportingPlanner:
+    """Plans every request instantly and exports it for real."""
+    
+    def plan(self, request, progress=None, resume=False):
+        return TripResult(
+            request=request,
+            route_data={'success': True, 'distance_m': 1609.34 * request.target_hours * 60, 'duration_s': 3600.0,
+                        'geometry': {'coordinates': [[-100.0, 35.0], [-99.0, 35.0]]}},
+            attractions={category: [] for category in ('national_parks', 'monuments', 'parks', 'museums',
+                                                      'restaurants', 'dog_parks', 'viewpoints', 'ev_chargers')},
+        )
+    
+    def export(self, result, output_dir, progress=None, output_base=None):
+        return export_trip(result, output_dir, log=lambda line: None, output_base=output_base)
+
+
+def test_trips_differing_only_in_options_get_their_own_exports(tmp_path):
+    defaults = replace(DEFAULTS, config=TripConfig(export_map=False, export_gpx=False, export_summary=False))
+    path = write_batch(
+        tmp_path,
+        '{"origin": "Atlanta, GA", "destination": "Denver, CO", "target_hours": 6}',
+        '{"origin": "Atlanta, GA", "destination": "Denver, CO", "target_hours": 9, "id": "long days"}',
+    )
+    entries = read_batch_file(path, defaults)
+    
+    run_batch(ExportingPlanner(), entries, tmp_path / 'results.jsonl', tmp_path / 'out', log=lambda line: None)
+    
+    records = [json.loads(line) for line in (tmp_path / 'results.jsonl').read_text().splitlines()]
+    data_files = {record['line']: record['output_files']['data'] for record in records}
+    assert data_files[1].endswith('trip_Atlanta_GA_Denver_CO_line1_data.json')
+    assert data_files[2].endswith('trip_Atlanta_GA_Denver_CO_long_days_data.json')
+    assert json.loads(open(data_files[1]).read())['total_distance_miles'] == 360.0
+    assert json.loads(open(data_files[2]).read())['total_distance_miles'] == 540.0
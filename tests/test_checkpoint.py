@@ -0,0 +1,83 @@
+"""Resuming a StageGraph from a TripCheckpoint."""
+
+import pytest
+
+from planner.checkpoint import TripCheckpoint
+from planner.engine import TripRequest
+from utils.concurrency import StageGraph
+
+
+def build_graph(calls, lines, fail_stops=False):
+    def stage(name, value):
+        def run(results, log):
+            calls.append(name)
+            log(f"{name}: ran")
+            if name == 'stops' and fail_stops:
+                raise RuntimeError('interrupted')
+            return value
+        return run
+    
+    graph = StageGraph(log=lines.append)
+    graph.add('route', stage('route', {'distance_m': 1000}))
+    graph.add('cities', stage('cities', ['Amarillo, TX']), deps=['route'])
+    graph.add('stops', stage('stops', ['Amarillo, TX']), deps=['cities'])
+    return graph
+
+
+def test_resume_restores_finished_stages_and_replays_their_logs(tmp_path):
+    path = tmp_path / 'trip.pkl'
+    calls, lines = [], []
+    with pytest.raises(RuntimeError):
+        build_graph(calls, lines, fail_stops=True).run(checkpoint=TripCheckpoint(path))
+    assert calls == ['route', 'cities', 'stops']
+    
+    calls, lines = [], []
+    graph = build_graph(calls, lines)
+    results = graph.run(checkpoint=TripCheckpoint(path))
+    
+    assert calls == ['stops']
+    assert graph.restored == ['route', 'cities']
+    assert results['cities'] == ['Amarillo, TX']
+    assert lines == ['route: ran', 'cities: ran', 'stops: ran']
+    assert set(TripCheckpoint(path).completed()) == {'route', 'cities', 'stops'}
+
+
+def test_stage_is_rerun_when_a_dependency_was_not_saved(tmp_path):
+    checkpoint = TripCheckpoint(tmp_path / 'trip.pkl')
+    checkpoint.save('cities', ['Stale, TX'], ['cities: stale'])
+    
+    calls, lines = [], []
+    results = build_graph(calls, lines).run(checkpoint=checkpoint)
+    
+    assert calls == ['route', 'cities', 'stops']
+    assert results['cities'] == ['Amarillo, TX']
+
+
+def test_unreadable_checkpoint_starts_afresh(tmp_path, capsys):
+    path = tmp_path / 'trip.pkl'
+    path.write_bytes(b'not a pickle')
+    
+    assert TripCheckpoint(path).completed() == {}
+    assert 'Ignoring unreadable checkpoint' in capsys.readouterr().out
+
+
+def test_clear_removes_the_file(tmp_path):
+    checkpoint = TripCheckpoint(tmp_path / 'nested' / 'trip.pkl')
+    checkpoint.save('route', 1, [])
+    assert checkpoint.path.exists()
+    
+    checkpoint.clear()
+    assert not checkpoint.path.exists()
+    assert checkpoint.completed() == {}
+    checkpoint.clear()
+
+
+def test_changed_request_gets_its_own_checkpoint(tmp_path):
+    request = TripRequest('Atlanta, GA', 'Denver, CO')
+    same = TripCheckpoint.for_request(TripRequest('Atlanta, GA', 'Denver, CO'), tmp_path)
+    longer_days = TripCheckpoint.for_request(TripRequest('Atlanta, GA', 'Denver, CO', target_hours=10), tmp_path)
+    
+    assert TripCheckpoint.for_request(request, tmp_path).path == same.path
+    assert longer_days.path != same.path
+    assert same.path.parent == tmp_path
+    assert same.path.name.startswith(request.output_base)
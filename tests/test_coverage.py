@@ -0,0 +1,66 @@
+"""Corridor coverage planner on straight, winding and out-and-back routes."""
+
+import math
+
+import numpy as np
+import pytest
+
+from utils.coverage import corridor_coverage, plan_corridor_coverage
+from utils.route_geometry import RouteGeometry
+
+
+def straight_route(lon_end=-99.0, n=400, lat=35.0):
+    return [[float(lon), lat] for lon in np.linspace(-100.0, lon_end, n)]
+
+
+def zigzag_route(n=600):
+    """A road switching back and forth across a 3 km wide band."""
+    lons = np.linspace(-100.0, -99.5, n)
+    lats = 35.0 + 0.0135 * np.abs((np.arange(n) % 40) - 20) / 20
+    return np.column_stack((lons, lats)).tolist()
+
+
+@pytest.mark.parametrize('radius_m, corridor_m', [(5000, 0), (5000, 2500), (20000, 5000), (25000, 10000)])
+def test_straight_route_is_fully_covered(radius_m, corridor_m):
+    route = RouteGeometry(straight_route())
+    plan = plan_corridor_coverage(route, radius_m, corridor_m)
+    
+    assert plan.coverage_pct == pytest.approx(100.0)
+    # Circles overlap by no more than one candidate step plus the corridor's chord loss
+    spacing_m = 2 * math.sqrt(radius_m ** 2 - corridor_m ** 2) - max(radius_m / 4, 250.0)
+    assert plan.calls <= math.ceil(route.total_m / spacing_m) + 1
+
+
+def test_centers_lie_on_the_route_in_order():
+    route = RouteGeometry(zigzag_route())
+    plan = plan_corridor_coverage(route, 5000, 2500)
+    
+    stations = [center[2] for center in plan.centers]
+    assert stations == sorted(stations)
+    for lat, lon, station in plan.centers:
+        assert route.point_at(station) == pytest.approx((lat, lon), abs=1e-6)
+    assert plan.coverage_pct == pytest.approx(100.0)
+
+
+def test_return_leg_of_out_and_back_needs_no_circles():
+    out = straight_route()
+    one_way = plan_corridor_coverage(out, 20000, 5000)
+    round_trip = plan_corridor_coverage(out + out[::-1][1:], 20000, 5000)
+    
+    assert round_trip.coverage_pct == pytest.approx(100.0)
+    assert round_trip.calls <= one_way.calls + 1
+
+
+def test_corridor_is_clamped_below_radius():
+    plan = plan_corridor_coverage(straight_route(), 5000, 8000)
+    assert plan.corridor_m == pytest.approx(4500)
+    assert plan.coverage_pct == pytest.approx(100.0)
+
+
+def test_degenerate_routes_and_missing_centers():
+    assert plan_corridor_coverage([[-100.0, 35.0]], 5000).calls == 0
+    assert corridor_coverage(straight_route(), [], 5000, 0) == 0.0
+    
+    # One circle at the start covers only the first part of a ~91 km route
+    partial = corridor_coverage(straight_route(), [(35.0, -100.0)], 5000, 0)
+    assert 0 < partial < 10
@@ -0,0 +1,49 @@
+"""TripPlanner wiring that doesn't need network access."""
+
+import pytest
+
+import planner.engine as engine
+from planner.engine import TripPlanner, TripRequest
+from services.cache import LocationCache
+
+
+@pytest.fixture
+def planner(tmp_path, monkeypatch):
+    # Location caches are JSON files in the working directory
+    monkeypatch.chdir(tmp_path)
+    with TripPlanner('test-key', use_cache=False, workers=1) as planner:
+        yield planner
+
+
+def test_offline_geocoder_is_loaded_once_per_planner(planner, monkeypatch):
+    built = []
+    
+    class CountingGeocoder(engine.OfflineReverseGeocoder):
+        def __init__(self, *args, **kwargs):
+            built.append(self)
+            super().__init__(*args, **kwargs)
+    
+    monkeypatch.setattr(engine, 'OfflineReverseGeocoder', CountingGeocoder)
+    used = []
+    monkeypatch.setattr(planner.router, 'find_cities_along_route',
+                        lambda route_data, geocoder, route=None: used.append(geocoder) or [])
+    
+    request = TripRequest('Atlanta, GA', 'Denver, CO', offline_geocoding=True)
+    for _ in range(3):
+        planner._find_cities(request, {'route_data': {}, 'route': None}, lambda line: None)
+    
+    assert len(built) == 1
+    assert used == built * 3
+    assert built[0].fallback is planner.geocoder
+    assert built[0].available
+
+
+def test_location_caches_are_saved_when_the_planner_closes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with TripPlanner('test-key', use_cache=False, workers=1) as planner:
+        planner.location_cache.set('atlanta ga', [33.7, -84.4, 'Atlanta'])
+        planner.reverse_geocode_cache.set('dn5bp', 'Atlanta, GA')
+        assert not (tmp_path / engine.LOCATION_CACHE_FILE).exists()
+    
+    assert LocationCache(tmp_path / engine.LOCATION_CACHE_FILE).get('atlanta ga') == [33.7, -84.4, 'Atlanta']
+    assert LocationCache(tmp_path / engine.REVERSE_GEOCODE_CACHE_FILE).get('dn5bp') == 'Atlanta, GA'
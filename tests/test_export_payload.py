@@ -0,0 +1,72 @@
+"""Exporting a trip from its pickled export_payload(), as the batch export workers do."""
+
+import pickle
+import re
+
+import numpy as np
+import pytest
+
+pytest.importorskip('folium')
+
+from config import TripConfig
+from models import Attraction, Hotel, Veterinarian
+from planner.batch import export_quietly
+from planner.engine import TripRequest, TripResult, export_trip
+
+ROUTE = np.column_stack([np.linspace(-100.0, -96.0, 401), 35.0 + 0.2 * np.sin(np.linspace(0, 6, 401))])
+
+
+def planned_trip():
+    request = TripRequest('Amarillo, TX', 'Tulsa, OK', config=TripConfig(export_data=False, export_summary=False))
+    stops = [
+        {'name': 'Amarillo, TX', 'lat': 35.0, 'lon': -100.0, 'type': 'start', 'stop_number': 1},
+        {'name': 'Elk City, OK', 'lat': 35.1, 'lon': -98.0, 'type': 'major_stop', 'stop_number': 2},
+        {'name': 'Tulsa, OK', 'lat': 35.0, 'lon': -96.0, 'type': 'destination', 'stop_number': 3},
+    ]
+    park = Attraction(name='Red Rock Canyon', address='Hinton, OK', location='~120 mi from start', type='park',
+                      rating=4.7, user_ratings_total=2100, lat=35.05, lon=-98.4)
+    return TripResult(
+        request=request,
+        route_data={'success': True, 'distance_m': 400000.0, 'duration_s': 14400.0,
+                    'geometry': {'type': 'LineString', 'coordinates': ROUTE},
+                    'legs': [{'distance': 400000.0, 'duration': 14400.0, 'steps': [{'name': 'I 40'}] * 50}]},
+        all_cities=[{'name': f"Town {k}", 'lat': 35.0, 'lon': -99.0} for k in range(20)],
+        major_stops=stops,
+        waypoint_cities=[{'name': 'Clinton, OK', 'lat': 35.5, 'lon': -98.9, 'distance_mi': 150.0, 'type': 'waypoint'}],
+        hotels={'Elk City, OK': Hotel('Elk Inn', '1 Main St', 'Elk City, OK', 4.2, 300, '$$', 'h1', 35.1, -98.0)},
+        vets={'Elk City, OK': Veterinarian('Elk Vet', '2 Main St', 'Elk City, OK', 4.6, 80, 'v1', 35.1, -98.01,
+                                           is_24_hours=True)},
+        attractions={'parks': [park], 'ev_chargers': []},
+        route_attractions={'parks': [park]},
+        leg_bounds=[0, 400],
+    )
+
+
+def normalized(path):
+    text = open(path, encoding='utf-8').read()
+    # Folium element ids are random; GPX metadata carries the export time
+    text = re.sub(r'_[0-9a-f]{32}', '_ID', text)
+    return re.sub(r'<time>[^<]*</time>', '<time/>', text)
+
+
+def test_pickled_payload_exports_the_same_files(tmp_path):
+    in_process = export_trip(planned_trip(), tmp_path / 'in_process', log=lambda line: None)
+    
+    payload = pickle.loads(pickle.dumps(planned_trip().export_payload()))
+    from_worker = export_quietly(payload, tmp_path / 'worker')
+    
+    assert set(in_process) == set(from_worker) == {'map', 'gpx'}
+    for kind in ('map', 'gpx'):
+        assert normalized(from_worker[kind]) == normalized(in_process[kind])
+    assert all(name in normalized(from_worker['map']) for name in ('Red Rock Canyon', 'Elk Inn', 'Elk Vet'))
+    assert 'Elk City, OK' in normalized(from_worker['gpx'])
+
+
+def test_payload_drops_what_export_does_not_read():
+    trip = planned_trip()
+    payload = trip.export_payload()
+    
+    assert payload.all_cities == [] and payload.route_attractions == {} and payload.leg_bounds == []
+    assert 'legs' not in payload.route_data
+    assert payload.route_data['geometry'] is trip.route_data['geometry']
+    assert len(pickle.dumps(payload)) < len(pickle.dumps(trip))
@@ -0,0 +1,85 @@
+"""Each Places request asks only for the fields its parser reads."""
+
+import pytest
+
+import services.http_client as http_client
+from services.places import GooglePlacesFinder
+
+LAT, LON = 35.0, -100.0
+ROUTE = [[LON + k * 0.01, LAT] for k in range(101)]
+
+
+@pytest.fixture
+def finder(monkeypatch):
+    finder = GooglePlacesFinder('test-key')
+    finder.posted = []
+    
+    def fake_post(url, request_body, category, field_mask=None):
+        finder.posted.append((url, category, field_mask))
+        return {'places': []}
+    
+    monkeypatch.setattr(finder, '_post', fake_post)
+    return finder
+
+
+@pytest.mark.parametrize('search, kinds', [
+    (lambda f: f.find_pet_friendly_hotel('Amarillo, TX', LAT, LON), ['hotel']),
+    (lambda f: f.find_emergency_vet('Amarillo, TX', LAT, LON), ['vet']),
+    (lambda f: f.find_parks_nearby('Amarillo, TX', LAT, LON), ['city_park']),
+    (lambda f: f.find_museums_in_city('Amarillo, TX', LAT, LON), ['museum']),
+    (lambda f: f.find_dog_friendly_restaurants('Amarillo, TX', LAT, LON), ['restaurant']),
+    (lambda f: f.find_dog_parks_in_city('Amarillo, TX', LAT, LON), ['dog_park']),
+    (lambda f: f.find_ev_chargers_in_city('Amarillo, TX', LAT, LON), ['city_charger']),
+    (lambda f: f.find_national_parks_by_state('Texas'), ['national_park', 'national_forest']),
+    (lambda f: f.find_monuments_by_state('Texas'), ['monument']),
+    (lambda f: f.find_parks_along_route(ROUTE, 25, log=lambda line: None), ['route_park']),
+    (lambda f: f.find_scenic_viewpoints_along_route(ROUTE, 25, log=lambda line: None), ['viewpoint']),
+    (lambda f: f.find_ev_chargers_along_route(ROUTE, 25, log=lambda line: None), ['route_charger']),
+])
+def test_each_request_kind_sends_its_own_field_mask(finder, search, kinds):
+    search(finder)
+    
+    assert finder.posted
+    masks = [field_mask for _, _, field_mask in finder.posted]
+    assert masks[:len(kinds)] == [finder._field_mask(kind) for kind in kinds]
+    assert set(masks[len(kinds):]) <= {finder._field_mask(kinds[-1])}
+    for kind, field_mask in zip(kinds, masks):
+        assert field_mask.split(',') == [f"places.{field}" for field in GooglePlacesFinder.REQUEST_FIELDS[kind]]
+
+
+def test_masks_differ_between_request_kinds():
+    finder = GooglePlacesFinder('test-key')
+    masks = {kind: finder._field_mask(kind) for kind in GooglePlacesFinder.REQUEST_FIELDS}
+    
+    assert 'places.allowsDogs' in masks['hotel'] and 'places.allowsDogs' not in masks['vet']
+    assert 'places.regularOpeningHours' in masks['vet'] and 'places.regularOpeningHours' not in masks['hotel']
+    assert all('places.currentOpeningHours' not in mask for mask in masks.values())
+    assert finder._field_mask('route_park', 'route_charger', extra=('types',)).endswith(',places.types')
+
+
+def test_field_mask_is_sent_as_the_request_header(monkeypatch):
+    sent = []
+    
+    class Response:
+        status_code = 200
+        
+        def raise_for_status(self):
+            pass
+        
+        def json(self):
+            return {'places': []}
+    
+    class Session:
+        def request(self, method, url, headers=None, **kwargs):
+            sent.append(headers)
+            return Response()
+    
+    monkeypatch.setattr(http_client, 'get_session', lambda url, pool_size=None: Session())
+    monkeypatch.setattr(http_client, 'get_rate_limiter', lambda url: None)
+    finder = GooglePlacesFinder('test-key')
+    
+    finder.find_emergency_vet('Amarillo, TX', LAT, LON)
+    finder.find_dog_parks_in_city('Amarillo, TX', LAT, LON)
+    
+    assert [headers['X-Goog-FieldMask'] for headers in sent] == [finder._field_mask('vet'), finder._field_mask('dog_park')]
+    assert all(headers['X-Goog-Api-Key'] == 'test-key' for headers in sent)
@@ -0,0 +1,91 @@
+"""Geohash keys and the reverse geocoding cache built on them."""
+
+import pytest
+import requests
+
+import services.http_client as http_client
+from services.cache import LocationCache
+from services.geocoder import NominatimGeocoder
+from utils.geohash import encode_geohash
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status_code = status
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Server Error")
+    
+    def json(self):
+        return self.data
+
+
+class FakeNominatim:
+    """Answers reverse geocoding requests from reply(params), recording them."""
+    
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+    
+    def request(self, method, url, params=None, **kwargs):
+        self.calls.append(params)
+        return self.reply(params)
+
+
+@pytest.fixture
+def nominatim(monkeypatch):
+    def install(reply):
+        fake = FakeNominatim(reply)
+        monkeypatch.setattr(http_client, 'get_session', lambda url, pool_size=None: fake)
+        monkeypatch.setattr(http_client, 'get_rate_limiter', lambda url: None)
+        return fake
+    return install
+
+
+def city(name, state):
+    return FakeResponse({'address': {'city': name, 'state': state}})
+
+
+def test_known_geohashes():
+    assert encode_geohash(57.64911, 10.40744, precision=11) == 'u4pruydqqvj'
+    assert encode_geohash(33.76, -84.40) == 'dn5bp'
+    assert encode_geohash(-33.8688, 151.2093, precision=6) == 'r3gx2f'
+
+
+def test_prefixes_nest_and_neighbours_differ():
+    fine = encode_geohash(40.7128, -74.0060, precision=9)
+    assert encode_geohash(40.7128, -74.0060, precision=5) == fine[:5]
+    # ~200 m apart share a 5-character cell; ~50 km apart don't
+    assert encode_geohash(40.7128, -74.0060) == encode_geohash(40.7138, -74.0080)
+    assert encode_geohash(40.7128, -74.0060) != encode_geohash(41.1, -74.0)
+
+
+def test_reverse_geocode_is_cached_per_cell(nominatim, tmp_path):
+    fake = nominatim(lambda params: city('Atlanta', 'Georgia'))
+    geocoder = NominatimGeocoder(reverse_cache=LocationCache(tmp_path / 'reverse.json'))
+    
+    assert geocoder.reverse_geocode(33.76, -84.40) == 'Atlanta, GA'
+    # Same geohash cell: answered from the cache
+    assert geocoder.reverse_geocode(33.77, -84.39) == 'Atlanta, GA'
+    assert len(fake.calls) == 1
+    
+    # Just across a cell boundary
+    assert geocoder.reverse_geocode(33.749, -84.388) == 'Atlanta, GA'
+    assert len(fake.calls) == 2
+
+
+def test_negative_results_are_cached_but_failures_are_not(nominatim, tmp_path):
+    replies = [FakeResponse({}, status=503), FakeResponse({'address': {'county': 'Empty County'}})]
+    fake = nominatim(lambda params: replies.pop(0))
+    cache = LocationCache(tmp_path / 'reverse.json')
+    geocoder = NominatimGeocoder(reverse_cache=cache)
+    
+    assert geocoder.reverse_geocode(31.0, -104.0) is None
+    assert encode_geohash(31.0, -104.0) not in cache
+    
+    assert geocoder.reverse_geocode(31.0, -104.0) is None
+    assert geocoder.reverse_geocode(31.0, -104.0) is None
+    assert len(fake.calls) == 2
+    assert encode_geohash(31.0, -104.0) in cache
@@ -0,0 +1,132 @@
+"""Pooled sessions and request-step execution in the synchronous ServiceClient."""
+
+import pytest
+import requests
+
+import services.http_client as http_client
+from services.http_client import Blocking, JSONRequest, ServiceClient, close_sessions, get_session
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status_code = status
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Server Error")
+    
+    def json(self):
+        return self.data
+
+
+class StubSession:
+    """Serves url -> (data, status) from a table, recording each request's arguments."""
+    
+    def __init__(self, table):
+        self.table = table
+        self.calls = []
+    
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return FakeResponse(*self.table[url])
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+    
+    def acquire(self):
+        self.acquired += 1
+        return 0.0
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    def install(table):
+        session = StubSession(table)
+        limiter = CountingLimiter()
+        monkeypatch.setattr(http_client, 'get_session', lambda url, pool_size=None: session)
+        monkeypatch.setattr(http_client, 'get_rate_limiter', lambda url: limiter)
+        return session, limiter
+    return install
+
+
+def test_sessions_are_pooled_per_host(monkeypatch):
+    monkeypatch.setattr(http_client, '_sessions', {})
+    
+    search = get_session('https://nominatim.example/search?q=x', pool_size=4)
+    reverse = get_session('https://nominatim.example/reverse', pool_size=99)
+    other = get_session('https://router.example/route/v1')
+    
+    assert search is reverse
+    assert other is not search
+    assert search.get_adapter('https://nominatim.example/search')._pool_maxsize == 4
+    assert set(http_client._sessions) == {'https://nominatim.example', 'https://router.example'}
+    
+    close_sessions()
+    assert http_client._sessions == {}
+    assert get_session('https://nominatim.example/search') is not search
+
+
+def test_request_merges_headers_and_waits_for_the_rate_limit(stub):
+    session, limiter = stub({'https://api.example/v1': ({'ok': True}, 200)})
+    client = ServiceClient(headers={'User-Agent': 'trip-planner', 'Accept': 'text/plain'}, timeout=5)
+    
+    client.get('https://api.example/v1', params={'q': 'x'}, headers={'Accept': 'application/json'})
+    client.post('https://api.example/v1', json={'a': 1}, timeout=30)
+    
+    (get_method, _, get_kwargs), (post_method, _, post_kwargs) = session.calls
+    assert (get_method, post_method) == ('GET', 'POST')
+    assert get_kwargs['headers'] == {'User-Agent': 'trip-planner', 'Accept': 'application/json'}
+    assert get_kwargs['params'] == {'q': 'x'} and get_kwargs['timeout'] == 5
+    assert post_kwargs['json'] == {'a': 1} and post_kwargs['timeout'] == 30
+    assert limiter.acquired == 2
+
+
+def test_run_sends_each_step_result_back_into_the_generator(stub):
+    session, _ = stub({'https://api.example/a': ({'value': 3}, 200),
+                       'https://api.example/b': ({'value': 4}, 200)})
+    
+    def steps():
+        cached = yield Blocking(lambda key: {'cached': key}, 'k')
+        first = yield JSONRequest('GET', 'https://api.example/a', params={'n': 1})
+        second = yield JSONRequest('POST', 'https://api.example/b', json={'n': 2}, headers={'X-Test': '1'})
+        return cached, first['value'] + second['value']
+    
+    assert ServiceClient().run(steps()) == ({'cached': 'k'}, 7)
+    assert [(method, url) for method, url, _ in session.calls] == [
+        ('GET', 'https://api.example/a'), ('POST', 'https://api.example/b')]
+    assert session.calls[1][2]['json'] == {'n': 2}
+    assert session.calls[1][2]['headers'] == {'X-Test': '1'}
+
+
+def test_run_throws_step_errors_into_the_generator(stub):
+    stub({'https://api.example/down': ({}, 503), 'https://api.example/up': ({'value': 1}, 200)})
+    
+    def steps(log):
+        try:
+            yield JSONRequest('GET', 'https://api.example/down')
+        except requests.HTTPError as e:
+            log.append(str(e))
+        try:
+            yield Blocking(lambda: 1 / 0)
+        except ZeroDivisionError:
+            log.append('blocking failed')
+        data = yield JSONRequest('GET', 'https://api.example/up')
+        return data['value']
+    
+    log = []
+    assert ServiceClient().run(steps(log)) == 1
+    assert log == ['503 Server Error', 'blocking failed']
+
+
+def test_uncaught_step_error_propagates(stub):
+    stub({'https://api.example/down': ({}, 500)})
+    
+    def steps():
+        yield JSONRequest('GET', 'https://api.example/down')
+        return 'unreachable'
+    
+    with pytest.raises(requests.HTTPError, match='500'):
+        ServiceClient().run(steps())
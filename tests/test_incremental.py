@@ -0,0 +1,63 @@
+"""Carrying route scan results of a previous plan over to an edited trip."""
+
+import numpy as np
+
+from models import Attraction
+from planner.engine import TripRequest, TripResult
+from planner.incremental import kept_route_attractions
+from services.router import leg_key
+from utils import RouteGeometry
+
+A, B, C = (35.0, -100.0), (35.0, -99.0), (35.0, -98.0)
+VIA = (35.5, -99.5)
+
+
+def line(start, end, n=101):
+    """[lon, lat] coordinates from start to end (given as (lat, lon))."""
+    return [[lon, lat] for lat, lon in zip(np.linspace(start[0], end[0], n), np.linspace(start[1], end[1], n))]
+
+
+def park(name, lat, lon, miles):
+    return Attraction(name=name, address='', location=f"~{miles} mi from start", type='park',
+                      rating=4.8, user_ratings_total=900, lat=lat, lon=lon)
+
+
+def test_kept_attractions_are_relabeled_from_the_new_route():
+    coordinates = line(A, B) + line(B, C)[1:]
+    previous = TripResult(
+        request=TripRequest('A', 'C', via=['B']),
+        route_data={'geometry': {'coordinates': coordinates}, 'legs': [{}, {}]},
+        waypoints=[A, B, C],
+        leg_bounds=[0, 100, 200],
+        route_attractions={'parks': [park('Changed Leg Park', 35.01, -99.5, 28),
+                                     park('Kept Leg Park', 35.01, -98.5, 85)]},
+    )
+    # A via city inserted before the kept B -> C leg makes it start farther along
+    route = RouteGeometry(line(A, VIA) + line(VIA, B)[1:] + line(B, C)[1:])
+    
+    kept = kept_route_attractions(previous, 'parks', {leg_key(B, C)}, route)
+    
+    assert [attraction.name for attraction in kept] == ['Kept Leg Park']
+    vertex = 250  # (35.0, -98.5) on the new route
+    assert kept[0].location == f"~{int(route.distance_at(vertex) / 1609.34)} mi from start"
+    assert int(route.distance_at(vertex) / 1609.34) > 85 + 30
+    assert previous.route_attractions['parks'][1].location == "~85 mi from start"
+
+
+def test_chargers_keep_their_mile_labels():
+    coordinates = line(A, B)
+    charger = Attraction(name='Charger', address='', location='Mile 20', type='ev_charger',
+                         rating=4.0, user_ratings_total=10, lat=35.0, lon=-99.5)
+    previous = TripResult(
+        request=TripRequest('A', 'B'),
+        route_data={'geometry': {'coordinates': coordinates}, 'legs': [{}]},
+        waypoints=[A, B],
+        leg_bounds=[0, 100],
+        route_attractions={'ev_chargers': [charger]},
+    )
+    route = RouteGeometry(line((35.0, -101.0), A) + coordinates[1:])
+    
+    kept = kept_route_attractions(previous, 'ev_chargers', {leg_key(A, B)}, route)
+    
+    assert kept[0].location == f"Mile {int(route.distance_at(150) / 1609.34)}"
+    assert kept_route_attractions(previous, 'parks', {leg_key(A, B)}, route) is None
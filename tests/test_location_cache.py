@@ -0,0 +1,50 @@
+"""LocationCache batching and atomic writes."""
+
+import json
+
+from services.cache import LocationCache
+
+
+def test_entries_are_written_in_batches(tmp_path):
+    path = tmp_path / 'locations.json'
+    cache = LocationCache(path, flush_every=3)
+    
+    cache.set('atlanta ga', [33.7, -84.4, 'Atlanta'])
+    cache.set('nowhere', None)
+    assert not path.exists()
+    
+    cache.set('denver co', [39.7, -105.0, 'Denver'])
+    assert json.loads(path.read_text()) == {
+        'atlanta ga': [33.7, -84.4, 'Atlanta'], 'nowhere': None, 'denver co': [39.7, -105.0, 'Denver']
+    }
+    assert [p.name for p in tmp_path.iterdir()] == ['locations.json']
+
+
+def test_flush_writes_unsaved_entries_only(tmp_path, monkeypatch):
+    path = tmp_path / 'locations.json'
+    cache = LocationCache(path, flush_every=100)
+    cache.set('atlanta ga', [33.7, -84.4, 'Atlanta'])
+    cache.flush()
+    
+    reloaded = LocationCache(path)
+    assert 'atlanta ga' in reloaded
+    assert reloaded.get('atlanta ga') == [33.7, -84.4, 'Atlanta']
+    
+    writes = []
+    monkeypatch.setattr(cache, '_save', lambda: writes.append(True))
+    cache.flush()
+    assert writes == []
+
+
+def test_unreadable_file_is_ignored_and_clear_removes_it(tmp_path):
+    path = tmp_path / 'locations.json'
+    path.write_text('{not json')
+    cache = LocationCache(path, flush_every=1)
+    assert 'anything' not in cache
+    
+    cache.set('atlanta ga', None)
+    assert json.loads(path.read_text()) == {'atlanta ga': None}
+    cache.clear()
+    assert not path.exists()
+    cache.flush()
+    assert not path.exists()
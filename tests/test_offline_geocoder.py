@@ -0,0 +1,58 @@
+"""OfflineReverseGeocoder against the bundled gazetteer and small synthetic ones."""
+
+from services.offline_geocoder import OfflineReverseGeocoder
+
+
+def write_gazetteer(tmp_path, rows):
+    path = tmp_path / 'places.csv'
+    lines = ['name,state,lat,lon,population'] + [','.join(map(str, row)) for row in rows]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+def test_neighborhoods_resolve_to_their_city():
+    geocoder = OfflineReverseGeocoder()
+    points = [(40.7564, -73.9864), (41.8841, -87.6333), (39.9512, -75.1592)]
+    assert geocoder.reverse_geocode_many(points) == ['New York City, NY', 'Chicago, IL', 'Philadelphia, PA']
+
+
+def test_bundled_names_have_no_commas():
+    geocoder = OfflineReverseGeocoder()
+    assert geocoder.available
+    assert all(name.count(',') == 1 for name in geocoder.names)
+
+
+def test_most_populous_place_in_range_wins(tmp_path):
+    path = write_gazetteer(tmp_path, [
+        ('Big City', 'GA', 33.75, -84.39, 500000),
+        ('Downtown', 'GA', 33.755, -84.39, 20000),
+        ('Far Town', 'AL', 33.0, -86.0, 3000),
+    ])
+    geocoder = OfflineReverseGeocoder(gazetteer_path=path, max_distance_miles=15)
+    
+    # Next to the neighborhood, but the city is in range too
+    assert geocoder.reverse_geocode(33.756, -84.39) == 'Big City, GA'
+    assert geocoder.reverse_geocode(33.01, -86.0) == 'Far Town, AL'
+    assert geocoder.reverse_geocode(35.0, -90.0) is None
+
+
+def test_population_threshold_and_point_order(tmp_path):
+    path = write_gazetteer(tmp_path, [
+        ('Hamlet', 'TX', 31.0, -97.0, 500),
+        ('Town', 'TX', 31.05, -97.0, 2000),
+    ])
+    geocoder = OfflineReverseGeocoder(gazetteer_path=path, min_population=1000)
+    points = [(31.0, -97.0), (40.0, -80.0), (31.05, -97.0)]
+    assert geocoder.reverse_geocode_many(points) == ['Town, TX', None, 'Town, TX']
+    assert geocoder.reverse_geocode_many(points, min_population=100)[0] == 'Town, TX'
+    assert geocoder.reverse_geocode_many([]) == []
+
+
+def test_missing_gazetteer_uses_fallback(tmp_path):
+    class Fallback:
+        def reverse_geocode(self, lat, lon):
+            return f"{lat:.0f}/{lon:.0f}"
+    
+    geocoder = OfflineReverseGeocoder(fallback=Fallback(), gazetteer_path=tmp_path / 'missing.csv')
+    assert not geocoder.available
+    assert geocoder.reverse_geocode_many([(31.0, -97.0)]) == ['31/-97']
@@ -0,0 +1,134 @@
+"""Search-along-route (corridor) scans against a mocked Places session."""
+
+import pytest
+import requests
+
+import services.http_client as http_client
+import services.places as places
+from services.places import GooglePlacesFinder
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status_code = status
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Server Error")
+    
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """Stands in for the pooled Places session; reply(url, body) returns a FakeResponse."""
+    
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+    
+    def request(self, method, url, headers=None, json=None, **kwargs):
+        self.calls.append((url, json, headers))
+        return self.reply(url, json)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    def install(reply):
+        fake = FakeSession(reply)
+        monkeypatch.setattr(http_client, 'get_session', lambda url, pool_size=None: fake)
+        return fake
+    return install
+
+
+def route_coordinates(lat=35.0, lon_start=-100.0, lon_end=-99.7, n=61):
+    step = (lon_end - lon_start) / (n - 1)
+    return [[lon_start + k * step, lat] for k in range(n)]
+
+
+def park(name, lon, lat=35.0):
+    return {
+        'id': name, 'displayName': {'text': name}, 'formattedAddress': f"{name} Rd",
+        'location': {'latitude': lat, 'longitude': lon}, 'rating': 4.8, 'userRatingCount': 900,
+    }
+
+
+def test_corridor_search_follows_result_pages(session):
+    pages = {None: {'places': [park('Far Park', -99.75)], 'nextPageToken': 'page-2'},
+             'page-2': {'places': [park('Near Park', -99.95)]}}
+    fake = session(lambda url, body: FakeResponse(pages[body.get('pageToken')]))
+    finder = GooglePlacesFinder('test-key', corridor_search=True)
+    
+    parks = finder.find_parks_along_route(route_coordinates())
+    
+    assert [url for url, _, _ in fake.calls] == [GooglePlacesFinder.TEXT_SEARCH_URL] * 2
+    assert 'nextPageToken' in fake.calls[0][2]['X-Goog-FieldMask'].split(',')
+    assert fake.calls[1][1]['pageToken'] == 'page-2'
+    assert {p.name for p in parks} == {'Far Park', 'Near Park'}
+    labels = {p.name: p.location for p in parks}
+    assert labels == {'Near Park': '~2 mi from start', 'Far Park': '~14 mi from start'}
+
+
+def test_corridor_search_stops_after_max_pages(session):
+    fake = session(lambda url, body: FakeResponse({'places': [], 'nextPageToken': 'more'}))
+    finder = GooglePlacesFinder('test-key', corridor_search=True)
+    
+    finder.find_parks_along_route(route_coordinates())
+    
+    assert len(fake.calls) == places.PLACES_CORRIDOR_MAX_PAGES
+
+
+def test_corridor_drops_places_far_from_route(session):
+    session(lambda url, body: FakeResponse({'places': [park('Off Route Park', -99.9, lat=35.2)]}))
+    finder = GooglePlacesFinder('test-key', corridor_search=True)
+    
+    assert finder.find_parks_along_route(route_coordinates()) == []
+
+
+def test_route_too_long_for_polyline_falls_back_to_sampling(session, monkeypatch):
+    monkeypatch.setattr(places, 'PLACES_CORRIDOR_MAX_POLYLINE_CHARS', 10)
+    fake = session(lambda url, body: FakeResponse({'places': [park('Nearby Park', -99.9)]}))
+    finder = GooglePlacesFinder('test-key', corridor_search=True)
+    
+    assert finder._corridor_polylines(route_coordinates()) is None
+    parks = finder.find_parks_along_route(route_coordinates())
+    
+    assert fake.calls
+    assert {url for url, _, _ in fake.calls} == {GooglePlacesFinder.NEARBY_SEARCH_URL}
+    assert [p.name for p in parks] == ['Nearby Park']
+
+
+def test_failed_corridor_request_falls_back_to_sampling(session):
+    def reply(url, body):
+        if url == GooglePlacesFinder.TEXT_SEARCH_URL:
+            return FakeResponse({'error': 'unavailable'}, status=503)
+        return FakeResponse({'places': [park('Nearby Park', -99.9)]})
+    fake = session(reply)
+    finder = GooglePlacesFinder('test-key', corridor_search=True)
+    
+    parks = finder.find_parks_along_route(route_coordinates())
+    
+    assert fake.calls[0][0] == GooglePlacesFinder.TEXT_SEARCH_URL
+    assert {url for url, _, _ in fake.calls[1:]} == {GooglePlacesFinder.NEARBY_SEARCH_URL}
+    assert [p.name for p in parks] == ['Nearby Park']
+
+
+def test_route_scan_reports_through_callers_log(session, capsys):
+    def reply(url, body):
+        if url == GooglePlacesFinder.TEXT_SEARCH_URL:
+            return FakeResponse({'error': 'unavailable'}, status=503)
+        return FakeResponse({'places': [park('Nearby Park', -99.9)]})
+    session(reply)
+    finder = GooglePlacesFinder('test-key', corridor_search=True)
+    
+    lines = []
+    found = finder.scan_route(route_coordinates(), ['parks'], log=lines.append)
+    finder.corridor_search = False
+    finder.scan_route(route_coordinates(), ['parks', 'ev_chargers'], log=lines.append)
+    
+    assert [p.name for p in found['parks']] == ['Nearby Park']
+    assert any('Corridor search failed' in line for line in lines)
+    assert any('Coverage plan for parks' in line for line in lines)
+    assert any('route scan requests for parks, ev_chargers' in line for line in lines)
+    assert capsys.readouterr().out == ''
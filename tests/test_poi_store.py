@@ -0,0 +1,100 @@
+"""POIStore answers from fully queried circles and misses everywhere else."""
+
+import pytest
+
+import services.poi_store as poi_store
+from services.poi_store import POIStore
+
+FIELD_MASK = 'places.id,places.displayName,places.location,places.rating,places.userRatingCount'
+
+
+def nearby_request(lat, lon, radius_m, types=('park',), max_results=20, **extra):
+    return {
+        'includedTypes': list(types),
+        'locationRestriction': {'circle': {'center': {'latitude': lat, 'longitude': lon}, 'radius': radius_m}},
+        'maxResultCount': max_results,
+        **extra,
+    }
+
+
+def place(place_id, lat, lon, rating=4.5, reviews=100):
+    return {
+        'id': place_id, 'displayName': {'text': place_id}, 'location': {'latitude': lat, 'longitude': lon},
+        'rating': rating, 'userRatingCount': reviews,
+    }
+
+
+@pytest.fixture
+def store():
+    store = POIStore(':memory:')
+    yield store
+    store._conn.close()
+
+
+def test_search_inside_a_queried_circle_is_answered_locally(store):
+    store.record(nearby_request(35.0, -100.0, 20000), FIELD_MASK, {'places': [
+        place('big', 35.01, -100.0, rating=4.8, reviews=5000),
+        place('small', 35.02, -100.01, rating=4.9, reviews=10),
+        place('outside', 35.15, -100.0),
+    ]})
+    
+    answer = store.lookup(nearby_request(35.01, -100.0, 5000), FIELD_MASK)
+    
+    assert [p['id'] for p in answer['places']] == ['big', 'small']
+    assert store.stats() == {'hits': 1, 'misses': 0, 'places': 3, 'circles': 1}
+
+
+def test_circle_needs_full_coverage(store):
+    store.record(nearby_request(35.0, -100.0, 10000), FIELD_MASK, {'places': []})
+    
+    # Pokes out of the queried circle
+    assert store.lookup(nearby_request(35.05, -100.0, 10000), FIELD_MASK) is None
+    
+    # Neither circle alone covers it, but together they do
+    store.record(nearby_request(35.05, -100.0, 10000), FIELD_MASK, {'places': []})
+    assert store.lookup(nearby_request(35.025, -100.0, 9000), FIELD_MASK) == {'places': []}
+
+
+def test_full_result_pages_are_not_treated_as_complete(store):
+    store.record(nearby_request(35.0, -100.0, 20000, max_results=2), FIELD_MASK, {'places': [
+        place('a', 35.0, -100.0), place('b', 35.01, -100.0),
+    ]})
+    
+    assert store.lookup(nearby_request(35.0, -100.0, 5000), FIELD_MASK) is None
+    assert store.stats()['places'] == 2 and store.stats()['circles'] == 0
+
+
+def test_category_fields_and_ttl_must_match(store, monkeypatch):
+    store.ttls = {'parks': 3600}
+    store.record(nearby_request(35.0, -100.0, 20000), FIELD_MASK, {'places': [place('a', 35.0, -100.0)]})
+    
+    assert store.lookup(nearby_request(35.0, -100.0, 5000, types=('museum',)), FIELD_MASK) is None
+    assert store.lookup(nearby_request(35.0, -100.0, 5000), FIELD_MASK + ',places.websiteUri') is None
+    # Type order, ranking and result count don't change which places qualify
+    same = nearby_request(35.0, -100.0, 5000, max_results=5, rankPreference='DISTANCE')
+    assert store.lookup(same, FIELD_MASK, 'parks') is not None
+    
+    later = poi_store.time.time() + 7200
+    monkeypatch.setattr(poi_store.time, 'time', lambda: later)
+    assert store.lookup(same, FIELD_MASK, 'parks') is None
+
+
+def test_lookup_returns_only_requested_fields_in_requested_order(store):
+    store.record(nearby_request(35.0, -100.0, 20000), FIELD_MASK, {'places': [
+        place('far', 35.03, -100.0, rating=5.0, reviews=9000), place('near', 35.001, -100.0, rating=3.0, reviews=5),
+    ]})
+    
+    answer = store.lookup(nearby_request(35.0, -100.0, 10000, rankPreference='DISTANCE'), 'places.id,places.rating')
+    
+    assert answer == {'places': [{'id': 'near', 'rating': 3.0}, {'id': 'far', 'rating': 5.0}]}
+
+
+def test_places_merge_fields_seen_under_other_masks(store):
+    body = nearby_request(35.0, -100.0, 20000)
+    store.record(body, FIELD_MASK, {'places': [place('a', 35.0, -100.0)]})
+    store.record(body, FIELD_MASK + ',places.websiteUri',
+                 {'places': [{**place('a', 35.0, -100.0), 'websiteUri': 'https://a.test'}]})
+    
+    answer = store.lookup(nearby_request(35.0, -100.0, 5000), FIELD_MASK + ',places.websiteUri')
+    assert answer['places'][0]['websiteUri'] == 'https://a.test'
+    assert store.stats()['places'] == 1
@@ -0,0 +1,61 @@
+"""Encoded polylines: the vectorized codec against the scalar one."""
+
+import numpy as np
+import pytest
+
+from utils.polyline import (decode_polyline, decode_polyline_array, encode_polyline,
+                            encode_polyline_array, simplify_polyline)
+
+GOOGLE_EXAMPLE = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+
+
+def random_track(n=2000, seed=11):
+    """Mostly small steps with a few long jumps, both signs, as [lat, lon] rows."""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.002, size=(n, 2))
+    steps[::250] = rng.uniform(-20, 20, size=(len(steps[::250]), 2))
+    return np.clip(np.array([35.0, -100.0]) + np.cumsum(steps, axis=0), [-89, -179], [89, 179])
+
+
+def test_reference_encoding():
+    assert encode_polyline(GOOGLE_EXAMPLE) == '_p~iF~ps|U_ulLnnqC_mqNvxq`@'
+    assert encode_polyline_array(np.array(GOOGLE_EXAMPLE)) == '_p~iF~ps|U_ulLnnqC_mqNvxq`@'
+    assert decode_polyline_array('_p~iF~ps|U_ulLnnqC_mqNvxq`@').tolist() == [list(p) for p in GOOGLE_EXAMPLE]
+
+
+@pytest.mark.parametrize('precision', [5, 6])
+def test_vectorized_codec_matches_scalar(precision):
+    track = random_track()
+    encoded = encode_polyline([tuple(row) for row in track], precision)
+    
+    assert encode_polyline_array(track, precision) == encoded
+    decoded = decode_polyline_array(encoded, precision)
+    assert decoded.tolist() == [list(p) for p in decode_polyline(encoded, precision)]
+    assert decoded.flags['C_CONTIGUOUS']
+    assert np.abs(decoded - track).max() <= 0.5 / 10 ** precision + 1e-12
+
+
+def test_lonlat_view_shares_the_buffer():
+    decoded = decode_polyline_array(encode_polyline(GOOGLE_EXAMPLE, 6), 6)
+    lonlat = decoded[:, ::-1]
+    
+    assert np.shares_memory(lonlat, decoded)
+    assert lonlat[0].tolist() == [-120.2, 38.5]
+
+
+def test_edge_cases():
+    assert encode_polyline_array(np.empty((0, 2))) == ''
+    assert decode_polyline_array('').shape == (0, 2)
+    # Zero deltas and a repeated point still take one chunk each
+    points = [(0.0, 0.0), (0.0, 0.0), (-0.00001, 0.00001)]
+    assert encode_polyline_array(np.array(points)) == encode_polyline(points)
+    assert decode_polyline_array(encode_polyline(points)).tolist() == [list(p) for p in points]
+
+
+def test_simplify_keeps_corners_and_ends():
+    line = [(35.0, -100.0 + k * 0.01) for k in range(50)] + [(35.0 + k * 0.01, -99.51) for k in range(1, 50)]
+    
+    simplified = simplify_polyline(line, tolerance_m=50)
+    
+    assert simplified == [line[0], line[49], line[-1]]
+    assert simplify_polyline(line[:2], tolerance_m=50) == line[:2]
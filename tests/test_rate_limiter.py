@@ -0,0 +1,121 @@
+"""TokenBucket pacing against a fake clock, and per-host limiter lookup."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import services.rate_limiter as rate_limiter
+from services.rate_limiter import TokenBucket, get_rate_limiter
+
+
+class FakeClock:
+    """Stands in for the time module; sleeping advances the clock."""
+    
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', fake)
+    return fake
+
+
+def test_burst_is_free_then_requests_are_spaced(clock):
+    bucket = TokenBucket(rate=2.0, capacity=3)
+    
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert clock.sleeps == pytest.approx([0.5, 0.5])
+
+
+def test_idle_time_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    
+    clock.now += 60
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    # Only two tokens accumulated, however long the bucket sat idle
+    assert bucket.acquire() == pytest.approx(1.0)
+
+
+def test_sustained_rate_never_exceeds_burst_plus_refill(clock):
+    # The Places budget: a burst of 10, then 10 requests per second
+    bucket = TokenBucket(rate=10.0, capacity=10)
+    start = clock.now
+    granted = []
+    for _ in range(50):
+        bucket.acquire()
+        granted.append(clock.now - start)
+    
+    assert sum(clock.sleeps) == pytest.approx(4.0)
+    for k, elapsed in enumerate(granted, 1):
+        assert k <= 10 + 10.0 * elapsed + 1e-9
+
+
+def test_partial_refill_shortens_the_wait(clock):
+    bucket = TokenBucket(rate=2.0, capacity=1)
+    bucket.acquire()
+    
+    clock.now += 0.25
+    assert bucket.acquire() == pytest.approx(0.25)
+    clock.now += 2.0
+    assert bucket.acquire() == 0.0
+
+
+def test_concurrent_callers_are_spaced_one_interval_apart(clock):
+    bucket = TokenBucket(rate=5.0, capacity=3)
+    
+    # The clock stands still, as if every worker asked at the same moment
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        waits = sorted(pool.map(lambda _: bucket._reserve(1), range(20)))
+    
+    assert waits == pytest.approx([0.0] * 3 + [k / 5.0 for k in range(1, 18)])
+
+
+def test_waiting_callers_reserve_in_arrival_order(clock):
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    bucket.acquire()
+    
+    # Reserved without sleeping, as concurrent callers would be
+    assert [bucket._reserve(1) for _ in range(3)] == pytest.approx([1.0, 2.0, 3.0])
+
+
+def test_async_acquire_sleeps_on_the_event_loop(clock, monkeypatch):
+    slept = []
+    
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+    
+    monkeypatch.setattr(rate_limiter.asyncio, 'sleep', fake_sleep)
+    bucket = TokenBucket(rate=4.0, capacity=1)
+    
+    async def acquire_twice():
+        return [await bucket.acquire_async(), await bucket.acquire_async()]
+    
+    assert asyncio.run(acquire_twice()) == pytest.approx([0.0, 0.25])
+    assert slept == pytest.approx([0.25])
+    assert clock.sleeps == []
+
+
+def test_limiters_are_shared_per_configured_host():
+    search = get_rate_limiter('https://nominatim.openstreetmap.org/search?q=x')
+    reverse = get_rate_limiter('https://nominatim.openstreetmap.org/reverse')
+    
+    assert search is reverse
+    assert (search.rate, search.capacity) == (1.0, 1)
+    assert get_rate_limiter('https://places.googleapis.com/v1/places:searchText') is not search
+    assert get_rate_limiter('https://example.test/api') is None
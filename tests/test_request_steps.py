@@ -0,0 +1,149 @@
+"""Request generators shared by the sync and async service clients."""
+
+import asyncio
+import threading
+
+import pytest
+import requests
+
+pytest.importorskip('aiohttp')
+
+import services.http_client as http_client
+from services.async_services import AsyncHTTPPool, AsyncNominatimGeocoder, AsyncServiceClient
+from services.cache import LocationCache
+from services.geocoder import NominatimGeocoder
+from services.http_client import Blocking, JSONRequest, ServiceClient
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status_code = status
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Server Error")
+    
+    def json(self):
+        return self.data
+
+
+class FakeHosts:
+    """Serves both clients from one table of url -> (data, status), recording requested URLs."""
+    
+    def __init__(self):
+        self.table = {}
+        self.requested = []
+    
+    def request(self, method, url, **kwargs):
+        self.requested.append(url)
+        return FakeResponse(*self.table[url])
+
+
+@pytest.fixture
+def hosts(monkeypatch):
+    fake = FakeHosts()
+    
+    async def fake_async_request(self, method, url, **kwargs):
+        response = fake.request(method, url)
+        response.raise_for_status()
+        return response.json()
+    
+    monkeypatch.setattr(http_client, 'get_session', lambda url, pool_size=None: fake)
+    monkeypatch.setattr(AsyncServiceClient, 'request', fake_async_request)
+    return fake
+
+
+def lookup_steps(log):
+    cached = yield Blocking(lambda: threading.get_ident())
+    log.append(cached)
+    try:
+        data = yield JSONRequest('GET', 'https://example.test/ok')
+        yield JSONRequest('GET', 'https://example.test/fail')
+    except requests.HTTPError as e:
+        return data['value'], str(e)
+    return data['value'], None
+
+
+def test_sync_and_async_clients_run_the_same_steps(hosts):
+    hosts.table.update({'https://example.test/ok': ({'value': 7}, 200),
+                          'https://example.test/fail': ({}, 500)})
+    sync_threads, async_threads = [], []
+    
+    assert ServiceClient().run(lookup_steps(sync_threads)) == (7, '500 Server Error')
+    
+    async def run_async():
+        async with AsyncHTTPPool() as pool:
+            result = await AsyncServiceClient(pool).run(lookup_steps(async_threads))
+            return result, threading.get_ident()
+    
+    result, loop_thread = asyncio.run(run_async())
+    assert result == (7, '500 Server Error')
+    assert sync_threads == [threading.get_ident()]
+    # Blocking steps run off the event loop's thread
+    assert async_threads[0] != loop_thread
+
+
+def test_geocoders_share_caching_and_failure_handling(hosts, tmp_path):
+    search = NominatimGeocoder.BASE_URL
+    hosts.table[search] = ([{'lat': '33.7', 'lon': '-84.4', 'display_name': 'Atlanta, GA, USA'}], 200)
+    cache = LocationCache(tmp_path / 'locations.json')
+    
+    assert NominatimGeocoder(cache=cache).geocode('Atlanta, GA') == (33.7, -84.4, 'Atlanta, GA, USA')
+    
+    async def geocode_async(query):
+        async with AsyncHTTPPool() as pool:
+            return await AsyncNominatimGeocoder(pool, cache=cache).geocode(query)
+    
+    # Served from the cache the sync geocoder filled
+    assert asyncio.run(geocode_async('atlanta ga')) == (33.7, -84.4, 'Atlanta, GA, USA')
+    assert hosts.requested == [search]
+    
+    # Failures are reported as None and not cached
+    hosts.table[search] = ([], 503)
+    assert asyncio.run(geocode_async('Nowhere, ZZ')) is None
+    assert 'nowhere zz' not in cache
+
+
+def test_route_scan_is_cancelled_when_the_city_search_fails(monkeypatch, tmp_path):
+    import planner.async_pipeline as pipeline
+    
+    async def geocode(self, address):
+        return (33.7, -84.4, address) if address.startswith('Atlanta') else (39.7, -105.0, address)
+    
+    async def get_route(self, waypoints):
+        coordinates = [[-84.4 - k * 0.2, 33.7 + k * 0.06] for k in range(101)]
+        return {'success': True, 'distance_m': 1.9e6, 'duration_s': 7.2e4,
+                'geometry': {'type': 'LineString', 'coordinates': coordinates}, 'legs': []}
+    
+    async def find_cities_along_route(self, route_data, geocoder, route=None):
+        await asyncio.sleep(0)
+        raise RuntimeError('city search failed')
+    
+    scan = {}
+    
+    async def scan_route(self, route, categories=None, sample_interval_miles=None):
+        scan['started'] = True
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            scan['cancelled'] = True
+            raise
+    
+    monkeypatch.setattr(pipeline.AsyncNominatimGeocoder, 'geocode', geocode)
+    monkeypatch.setattr(pipeline.AsyncOSRMRouter, 'get_route', get_route)
+    monkeypatch.setattr(pipeline.AsyncOSRMRouter, 'find_cities_along_route', find_cities_along_route)
+    monkeypatch.setattr(pipeline.AsyncGooglePlacesFinder, 'scan_route', scan_route)
+    
+    async def plan():
+        with pytest.raises(RuntimeError, match='city search failed'):
+            await pipeline.plan_trip_async(
+                'Atlanta, GA', 'Denver, CO', api_key='test-key',
+                location_cache=LocationCache(tmp_path / 'locations.json'),
+                reverse_geocode_cache=LocationCache(tmp_path / 'reverse.json')
+            )
+        # Cancelled with the trip, not left running until the loop shuts down
+        await asyncio.sleep(0)
+        assert scan == {'started': True, 'cancelled': True}
+    
+    asyncio.run(plan())
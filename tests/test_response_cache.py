@@ -0,0 +1,84 @@
+"""ResponseCache expiry, eviction and accounting against a fake clock."""
+
+import pytest
+
+import services.cache as cache_module
+from services.cache import ResponseCache
+
+
+class FakeClock:
+    """Stands in for the time module."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, 'time', fake)
+    return fake
+
+
+def test_each_category_expires_after_its_own_ttl(tmp_path, clock):
+    cache = ResponseCache(tmp_path / 'cache.db', ttls={'hotels': 60, 'parks': 3600}, default_ttl=600)
+    cache.set('hotel', {'places': ['Inn']}, 'hotels')
+    cache.set('park', {'places': ['Park']}, 'parks')
+    cache.set('other', {'places': []}, 'museums')
+    
+    clock.now += 59
+    assert cache.get('hotel') == {'places': ['Inn']}
+    
+    clock.now += 2
+    assert cache.get('hotel') is None
+    assert cache.get('other') == {'places': []}
+    
+    clock.now += 600
+    assert cache.get('other') is None
+    assert cache.get('park') == {'places': ['Park']}
+    # Expired entries are deleted when they are looked up
+    assert cache.stats()['entries'] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = ResponseCache(tmp_path / 'cache.db', max_entries=2)
+    cache.set('a', {'n': 1})
+    clock.now += 1
+    cache.set('b', {'n': 2})
+    clock.now += 1
+    # Reading 'a' makes 'b' the least recently used
+    assert cache.get('a') == {'n': 1}
+    clock.now += 1
+    
+    cache.set('c', {'n': 3})
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == {'n': 1}
+    assert cache.get('c') == {'n': 3}
+    assert cache.stats()['entries'] == 2
+
+
+def test_hits_and_misses_are_counted(tmp_path, clock):
+    cache = ResponseCache(tmp_path / 'cache.db', ttls={'vets': 10})
+    key = ResponseCache.make_key('https://places.test', {'b': 2, 'a': 1}, 'places.id')
+    
+    assert cache.get(key) is None
+    cache.set(key, {'places': []}, 'vets')
+    assert cache.get(ResponseCache.make_key('https://places.test', {'a': 1, 'b': 2}, 'places.id')) == {'places': []}
+    clock.now += 11
+    assert cache.get(key) is None
+    
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'entries': 0}
+
+
+def test_entries_persist_in_the_database_file(tmp_path, clock):
+    path = tmp_path / 'cache.db'
+    ResponseCache(path).set('a', {'n': 1})
+    
+    reopened = ResponseCache(path)
+    assert reopened.get('a') == {'n': 1}
+    reopened.clear()
+    assert reopened.stats()['entries'] == 0
@@ -0,0 +1,137 @@
+"""RouteGeometry chainage, sections and lookups on synthetic routes."""
+
+import numpy as np
+import pytest
+
+from utils.coverage import plan_corridor_coverage
+from utils.distance import haversine_distance
+from utils.route_geometry import RouteGeometry
+
+
+def straight_route(n=201, lat=35.0, lon_start=-100.0, lon_end=-98.0):
+    """[lon, lat] vertices evenly spaced along a parallel."""
+    return [[float(lon), lat] for lon in np.linspace(lon_start, lon_end, n)]
+
+
+def winding_route(n=300, seed=7):
+    """Irregularly spaced [lon, lat] vertices wandering north-east."""
+    rng = np.random.default_rng(seed)
+    steps = rng.uniform([0.0, -0.01], [0.03, 0.02], size=(n - 1, 2))
+    return np.vstack(([-100.0, 35.0], [-100.0, 35.0] + np.cumsum(steps, axis=0))).tolist()
+
+
+def walk_samples(coordinates, interval_m):
+    """Vertex-by-vertex sampling, as the scanners did before the chainage index."""
+    indices, since_last = [], 0.0
+    for i in range(1, len(coordinates)):
+        (lon1, lat1), (lon2, lat2) = coordinates[i - 1], coordinates[i]
+        since_last += haversine_distance(lat1, lon1, lat2, lon2, unit='meters')
+        if since_last >= interval_m:
+            indices.append(i)
+            since_last = 0.0
+    return indices
+
+
+def test_chainage_matches_scalar_haversine():
+    coordinates = winding_route()
+    route = RouteGeometry(coordinates)
+    
+    total = 0.0
+    for i in range(1, len(coordinates)):
+        (lon1, lat1), (lon2, lat2) = coordinates[i - 1], coordinates[i]
+        total += haversine_distance(lat1, lon1, lat2, lon2, unit='meters')
+        assert route.distance_at(i) == pytest.approx(total)
+    assert route.total_m == pytest.approx(total)
+    assert route.latlon[5].tolist() == [coordinates[5][1], coordinates[5][0]]
+
+
+@pytest.mark.parametrize('interval_m', [2000.0, 25000.0, 160934.0])
+def test_sampling_matches_vertex_walk(interval_m):
+    coordinates = winding_route()
+    route = RouteGeometry(coordinates)
+    
+    assert route.sample_indices(interval_m) == walk_samples(coordinates, interval_m)
+    samples = route.sample_points(interval_m)
+    assert [(lat, lon) for lat, lon, _ in samples] == [
+        (coordinates[i][1], coordinates[i][0]) for i in walk_samples(coordinates, interval_m)
+    ]
+
+
+def test_split_pieces_share_boundaries_and_cover_the_route():
+    coordinates = winding_route()
+    route = RouteGeometry(coordinates)
+    
+    pieces = route.split(50000)
+    assert len(pieces) > 3
+    assert pieces[0][0] == coordinates[0] and pieces[-1][-1] == coordinates[-1]
+    for before, after in zip(pieces, pieces[1:]):
+        assert before[-1] == after[0]
+        assert RouteGeometry(before).total_m >= 50000
+    assert sum(len(piece) - 1 for piece in pieces) == len(coordinates) - 1
+
+
+def test_point_at_interpolates_and_clamps():
+    route = RouteGeometry(straight_route(n=3, lon_start=-100.0, lon_end=-99.0))
+    
+    assert route.point_at(-5.0) == (35.0, -100.0)
+    assert route.point_at(route.distance_at(1) / 2) == pytest.approx((35.0, -99.75))
+    assert route.point_at(route.total_m + 100) == (35.0, -99.0)
+    assert route.index_at(route.distance_at(1)) == 1
+    assert route.index_at(route.total_m + 1) == len(route)
+
+
+def test_nearest_vertex():
+    route = RouteGeometry(straight_route())
+    
+    i, offset_m = route.nearest_vertex(35.01, -99.0)
+    assert i == 100
+    assert offset_m == pytest.approx(haversine_distance(35.01, -99.0, 35.0, -99.0, unit='meters'))
+
+
+def test_leg_bounds_snap_to_waypoints():
+    route = RouteGeometry(straight_route())
+    leg_m = [route.distance_at(90), route.total_m - route.distance_at(90)]
+    
+    # Proportional split only, then snapped to the via point at vertex 95
+    assert route.leg_bounds(leg_m) == [0, 90, 200]
+    waypoints = [(35.0, -100.0), (35.0, route.lons[95]), (35.0, -98.0)]
+    assert route.leg_bounds(leg_m, waypoints) == [0, 95, 200]
+
+
+def test_from_route_uses_duration_annotations():
+    coordinates = straight_route(n=4)
+    legs = [{'annotation': {'duration': [10.0, 20.0]}}, {'annotation': {'duration': [30.0]}}]
+    route = RouteGeometry.from_route({'geometry': {'coordinates': coordinates}, 'legs': legs, 'duration_s': 999})
+    assert route.cumulative_s.tolist() == [0.0, 10.0, 30.0, 60.0]
+    
+    # Without annotations the total duration is spread by distance
+    route = RouteGeometry.from_route({'geometry': {'coordinates': coordinates}, 'legs': [{}], 'duration_s': 90})
+    assert route.time_at(route.total_m) == pytest.approx(90)
+    assert route.time_at(route.distance_at(1)) == pytest.approx(30)
+
+
+def test_section_keeps_trip_chainage():
+    route = RouteGeometry(straight_route())
+    route.cumulative_s = route.cumulative_m / 25.0
+    section = route.section(80, 160)
+    
+    assert len(section) == 81
+    assert section.distance_at(0) == route.distance_at(80)
+    assert section.total_m == pytest.approx(route.distance_at(160) - route.distance_at(80))
+    assert section.time_at(section.distance_at(40)) == pytest.approx(route.distance_at(120) / 25.0)
+    assert section.point_at(0.0) == (route.lats[80], route.lons[80])
+    assert section.point_at(route.distance_at(100)) == pytest.approx((route.lats[100], route.lons[100]))
+
+
+def test_section_samples_are_labelled_from_trip_start():
+    route = RouteGeometry(straight_route())
+    section = route.section(80, 160)
+    interval_m = 5 * route.segment_m[0] - 1.0
+    
+    samples = section.sample_points(interval_m)
+    assert [s[2] for s in samples] == [route.distance_at(i) for i in range(85, 161, 5)]
+    
+    plan = plan_corridor_coverage(section, radius_m=5000, corridor_m=2000)
+    stations = [center[2] for center in plan.centers]
+    assert route.distance_at(80) <= min(stations) and max(stations) <= route.distance_at(160)
+    assert plan.coverage_pct == pytest.approx(100.0)
@@ -0,0 +1,169 @@
+"""Multi-category route scans (GooglePlacesFinder.scan_route) against a mocked Places session."""
+
+import asyncio
+
+import numpy as np
+import pytest
+import requests
+
+import services.http_client as http_client
+from services.places import GooglePlacesFinder
+from utils.route_geometry import RouteGeometry
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status_code = status
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Server Error")
+    
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """Stands in for the pooled Places session; reply(url, body) returns a FakeResponse."""
+    
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+    
+    def request(self, method, url, headers=None, json=None, **kwargs):
+        self.calls.append((url, json, headers))
+        return self.reply(url, json)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    def install(reply=lambda url, body: FakeResponse({'places': []})):
+        fake = FakeSession(reply)
+        monkeypatch.setattr(http_client, 'get_session', lambda url, pool_size=None: fake)
+        monkeypatch.setattr(http_client, 'get_rate_limiter', lambda url: None)
+        return fake
+    return install
+
+
+def route_coordinates(lat=35.0, lon_start=-100.0, lon_end=-98.0, n=201):
+    step = (lon_end - lon_start) / (n - 1)
+    return [[lon_start + k * step, lat] for k in range(n)]
+
+
+def test_empty_category_list_scans_nothing(session):
+    fake = session()
+    finder = GooglePlacesFinder('test-key')
+    
+    assert finder.scan_route(route_coordinates(), [], log=lambda line: None) == {}
+    assert fake.calls == []
+    
+    scanned = finder.scan_route(route_coordinates(), None, log=lambda line: None)
+    assert set(scanned) == set(GooglePlacesFinder.ROUTE_SCAN_CATEGORIES)
+    assert fake.calls
+
+
+def test_async_empty_category_list_scans_nothing():
+    pytest.importorskip('aiohttp')
+    from services.async_services import AsyncGooglePlacesFinder, AsyncHTTPPool
+    
+    async def scan():
+        async with AsyncHTTPPool() as pool:
+            finder = AsyncGooglePlacesFinder('test-key', pool)
+            return await finder.scan_route(route_coordinates(), [], log=lambda line: None)
+    
+    assert asyncio.run(scan()) == {}
+
+
+def place(name, lat, lon, types, place_id=None):
+    return {
+        'id': place_id or name, 'displayName': {'text': name}, 'formattedAddress': '',
+        'rating': 4.8, 'userRatingCount': 900, 'location': {'latitude': lat, 'longitude': lon}, 'types': types,
+    }
+
+
+def test_parks_and_chargers_share_one_request_per_point(session):
+    fake = session()
+    finder = GooglePlacesFinder('test-key')
+    
+    for sample_interval_miles in (None, 25):
+        requests_ = finder._route_scan_requests(RouteGeometry(route_coordinates()), ['parks', 'ev_chargers'],
+                                                sample_interval_miles, log=lambda line: None)
+        assert requests_
+        for request in requests_:
+            assert request['categories'] == ['parks', 'ev_chargers']
+            assert set(request['body']['includedTypes']) == {
+                'park', 'national_park', 'state_park', 'electric_vehicle_charging_station'}
+            assert request['body']['locationRestriction']['circle']['radius'] == 20000
+            assert request['field_mask'].endswith('places.types')
+    
+    finder.scan_route(route_coordinates(), ['parks', 'ev_chargers'], 25, log=lambda line: None)
+    assert len(fake.calls) == len(requests_)
+
+
+def test_each_category_keeps_only_its_own_radius(session):
+    # 10 km north of the route: outside the 5 km park circle, inside the 20 km charger circle
+    def reply(url, body):
+        lat = body['locationRestriction']['circle']['center']['latitude']
+        lon = body['locationRestriction']['circle']['center']['longitude']
+        return FakeResponse({'places': [
+            place(f"Far Park {lon:.2f}", lat + 0.09, lon, ['park']),
+            place(f"Near Park {lon:.2f}", lat + 0.02, lon, ['park']),
+            place(f"Charger {lon:.2f}", lat + 0.09, lon, ['electric_vehicle_charging_station']),
+        ]})
+    session(reply)
+    
+    scanned = GooglePlacesFinder('test-key').scan_route(route_coordinates(), ['parks', 'ev_chargers'], 25,
+                                                         log=lambda line: None)
+    
+    assert scanned['parks'] and all(park.name.startswith('Near Park') for park in scanned['parks'])
+    assert scanned['ev_chargers'] and all(charger.name.startswith('Charger') for charger in scanned['ev_chargers'])
+
+
+def test_full_combined_response_is_retried_per_category_at_its_own_radius(session):
+    def reply(url, body):
+        lat = body['locationRestriction']['circle']['center']['latitude']
+        lon = body['locationRestriction']['circle']['center']['longitude']
+        if 'electric_vehicle_charging_station' in body['includedTypes'] and 'park' in body['includedTypes']:
+            # Twenty chargers crowd out every park
+            return FakeResponse({'places': [
+                place(f"Charger {k}", lat, lon, ['electric_vehicle_charging_station']) for k in range(20)
+            ]})
+        return FakeResponse({'places': [place(f"Park {lon:.2f}", lat, lon, ['park'])]})
+    fake = session(reply)
+    finder = GooglePlacesFinder('test-key')
+    
+    scanned = finder.scan_route(route_coordinates(), ['parks', 'ev_chargers'], 25, log=lambda line: None)
+    
+    combined = [body for _, body, _ in fake.calls if body['maxResultCount'] == 20]
+    retries = [body for _, body, _ in fake.calls if body['includedTypes'] == ['park', 'national_park', 'state_park']]
+    assert combined and len(retries) == len(combined)
+    assert all(body['locationRestriction']['circle']['radius'] == 5000 for body in retries)
+    assert len(scanned['parks']) == len(combined)
+    assert len(scanned['ev_chargers']) == 5
+
+
+def winding_route(miles=1040, n=4000, seed=1):
+    """A meandering route heading roughly east-northeast, as [lon, lat] coordinates."""
+    rng = np.random.default_rng(seed)
+    step_m = miles * 1609.34 / n
+    heading = np.cumsum(rng.normal(0, 0.05, n)) + 0.3
+    coordinates = [[-100.0, 35.0]]
+    for h in heading:
+        lon, lat = coordinates[-1]
+        coordinates.append([lon + step_m * np.cos(h) / (111320 * np.cos(np.radians(lat))),
+                            lat + step_m * np.sin(h) / 111320])
+    return coordinates
+
+
+def test_default_plan_makes_no_more_calls_than_sampling():
+    route = RouteGeometry(winding_route())
+    finder = GooglePlacesFinder('test-key')
+    lines = []
+    
+    planned = finder._route_scan_requests(route, finder.ROUTE_SCAN_CATEGORIES, log=lines.append)
+    
+    sampled = sum(len(route.sample_points(miles * 1609.34))
+                  for miles in finder.SAMPLING_INTERVAL_MILES.values())
+    assert len(planned) <= sampled
+    assert any('fixed-interval sampling: ' in line for line in lines)
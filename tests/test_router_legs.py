@@ -0,0 +1,113 @@
+"""OSRMRouter leg cache: fetching only the missing legs and stitching them back together."""
+
+import numpy as np
+import pytest
+
+import services.http_client as http_client
+from services.cache import ResponseCache
+from services.router import OSRMRouter, stitch_legs
+
+A, B, C, D = (35.0, -100.0), (35.1, -99.0), (35.0, -98.0), (35.2, -97.0)
+SEGMENTS_PER_LEG = 10
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+        self.status_code = 200
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self.data
+
+
+class FakeOSRM:
+    """Routes straight lines between the requested waypoints, with per-segment annotations."""
+    
+    def __init__(self):
+        self.requested = []
+    
+    def request(self, method, url, params=None, **kwargs):
+        waypoints = [tuple(map(float, pair.split(','))) for pair in url.rsplit('/', 1)[1].split(';')]
+        self.requested.append([(lat, lon) for lon, lat in waypoints])
+        coordinates, legs = [list(waypoints[0])], []
+        for (lon1, lat1), (lon2, lat2) in zip(waypoints, waypoints[1:]):
+            t = np.linspace(0, 1, SEGMENTS_PER_LEG + 1)[1:]
+            coordinates.extend([lon1 + (lon2 - lon1) * s, lat1 + (lat2 - lat1) * s] for s in t)
+            legs.append({'distance': 1000.0, 'duration': 60.0,
+                         'annotation': {'distance': [100.0] * SEGMENTS_PER_LEG,
+                                        'duration': [6.0] * SEGMENTS_PER_LEG}})
+        return FakeResponse({'code': 'Ok', 'routes': [{
+            'distance': 1000.0 * len(legs), 'duration': 60.0 * len(legs),
+            'geometry': {'type': 'LineString', 'coordinates': coordinates}, 'legs': legs,
+        }]})
+
+
+@pytest.fixture
+def osrm(monkeypatch):
+    fake = FakeOSRM()
+    monkeypatch.setattr(http_client, 'get_session', lambda url, pool_size=None: fake)
+    monkeypatch.setattr(http_client, 'get_rate_limiter', lambda url: None)
+    return fake
+
+
+@pytest.fixture
+def router():
+    return OSRMRouter(cache=ResponseCache(':memory:'), geometries='geojson')
+
+
+def test_cached_route_is_stitched_without_requests(osrm, router):
+    fetched, fetched_bounds = router.get_route_legs([A, B, C, D])
+    
+    route_data, bounds = OSRMRouter(cache=router.cache, geometries='geojson').get_route_legs([A, B, C, D])
+    
+    assert len(osrm.requested) == 1
+    assert bounds == fetched_bounds == [0, 10, 20, 30]
+    np.testing.assert_allclose(route_data['geometry']['coordinates'], fetched['geometry']['coordinates'], atol=1e-6)
+    assert route_data['distance_m'] == fetched['distance_m'] == 3000.0
+
+
+def test_only_the_missing_middle_leg_is_fetched(osrm, router):
+    router.get_route_legs([A, B])
+    router.get_route_legs([C, D])
+    
+    route_data, bounds = router.get_route_legs([A, B, C, D])
+    
+    assert osrm.requested[2:] == [[B, C]]
+    assert bounds == [0, 10, 20, 30]
+    coordinates = route_data['geometry']['coordinates']
+    for k, (lat, lon) in enumerate([A, B, C, D]):
+        np.testing.assert_allclose(coordinates[bounds[k]], [lon, lat], atol=1e-6)
+
+
+def test_missing_runs_group_consecutive_legs():
+    leg = (np.zeros((2, 2)), {})
+    
+    assert OSRMRouter._missing_runs([None, None, leg, None]) == [(0, 2), (3, 4)]
+    assert OSRMRouter._missing_runs([leg, leg]) == []
+
+
+def test_stitching_keeps_the_shared_vertex_once():
+    first = (np.array([[0.0, 0.0], [1.0, 0.0], [2.0, 0.0]]), {'distance': 2.0, 'duration': 1.0})
+    second = (np.array([[2.0, 0.0], [3.0, 0.0]]), {'distance': 1.0, 'duration': 1.0})
+    
+    route_data, bounds = stitch_legs([first, second])
+    
+    assert route_data['geometry']['coordinates'].tolist() == [[0, 0], [1, 0], [2, 0], [3, 0]]
+    assert bounds == [0, 2, 3]
+    assert route_data['distance_m'] == 3.0
+
+
+def test_stitched_annotations_match_the_vertices(osrm, router):
+    router.get_route_legs([A, B])
+    router.get_route_legs([B, C])
+    
+    route_data, bounds = router.get_route_legs([A, B, C, D])
+    
+    coordinates = route_data['geometry']['coordinates']
+    segments = [len(leg['annotation']['distance']) for leg in route_data['legs']]
+    assert sum(segments) == len(coordinates) - 1
+    assert segments == np.diff(bounds).tolist()
+    assert not (np.diff(coordinates, axis=0) == 0).all(axis=1).any()
@@ -0,0 +1,118 @@
+"""SingleFlight and AsyncSingleFlight coalescing of concurrent identical calls."""
+
+import asyncio
+import threading
+
+import pytest
+
+from services.single_flight import AsyncSingleFlight, SingleFlight, coalesced_count, request_key
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    
+    def fetch():
+        calls.append(threading.get_ident())
+        release.wait(5)
+        return {'value': 42}
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('key', fetch))) for _ in range(5)]
+    before = coalesced_count()
+    for thread in threads:
+        thread.start()
+    while coalesced_count() - before < 4:
+        release.wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert len(calls) == 1
+    assert results == [{'value': 42}] * 5
+    assert all(result is results[0] for result in results)
+
+
+def test_waiters_get_the_leaders_exception_and_later_calls_run_again():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    
+    def fail():
+        calls.append(1)
+        release.wait(5)
+        raise ValueError('upstream down')
+    
+    errors = []
+    
+    def call():
+        try:
+            flight.do('key', fail)
+        except ValueError as e:
+            errors.append(str(e))
+    
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    before = coalesced_count()
+    for thread in threads:
+        thread.start()
+    while coalesced_count() - before < 2:
+        release.wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert errors == ['upstream down'] * 3
+    assert len(calls) == 1
+    # Nothing is remembered once the call finishes
+    assert flight.do('key', lambda: 'fresh') == 'fresh'
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight()
+    assert [flight.do(k, lambda k=k: k * 2) for k in (1, 2, 3)] == [2, 4, 6]
+
+
+def test_async_callers_share_one_task():
+    flight = AsyncSingleFlight()
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [1, 2, 3]
+    
+    async def main():
+        return await asyncio.gather(*(flight.do('key', fetch) for _ in range(4)))
+    
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert results == [[1, 2, 3]] * 4
+    assert flight._tasks == {}
+
+
+def test_cancelled_async_waiter_leaves_the_shared_call_running():
+    flight = AsyncSingleFlight()
+    
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return 'done'
+    
+    async def main():
+        first = asyncio.ensure_future(flight.do('key', fetch))
+        second = asyncio.ensure_future(flight.do('key', fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+    
+    assert asyncio.run(main()) == 'done'
+
+
+def test_request_key_ignores_dict_order_but_not_content():
+    a = request_key('get', 'https://example.test', {'q': 'x', 'limit': 1}, None, {'A': '1'})
+    b = request_key('GET', 'https://example.test', {'limit': 1, 'q': 'x'}, None, {'A': '1'})
+    assert a == b
+    assert a != request_key('GET', 'https://example.test', {'q': 'y', 'limit': 1}, None, {'A': '1'})
+    assert a != request_key('POST', 'https://example.test', {'q': 'x', 'limit': 1}, None, {'A': '1'})
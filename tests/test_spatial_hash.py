@@ -0,0 +1,66 @@
+"""SpatialHash radius queries and skipping of repeated route search points."""
+
+import numpy as np
+import pytest
+
+from services.places import GooglePlacesFinder
+from utils.distance import haversine_distance
+from utils.spatial_hash import SpatialHash
+
+
+def test_nearby_matches_brute_force():
+    rng = np.random.default_rng(3)
+    points = rng.uniform([34.0, -101.0], [36.0, -99.0], size=(500, 2))
+    index = SpatialHash(20000)
+    for k, (lat, lon) in enumerate(points):
+        index.add(lat, lon, float(k))
+    
+    for lat, lon in rng.uniform([34.0, -101.0], [36.0, -99.0], size=(50, 2)):
+        expected = {
+            float(k) for k, (plat, plon) in enumerate(points)
+            if haversine_distance(lat, lon, plat, plon, unit='meters') <= 15000
+        }
+        found = set(index.nearby(lat, lon, 15000))
+        # Chord vs great-circle distance only differs in the last few meters
+        for tag in found ^ expected:
+            plat, plon = points[int(tag)]
+            assert haversine_distance(lat, lon, plat, plon, unit='meters') == pytest.approx(15000, abs=1)
+
+
+def test_queries_work_across_the_antimeridian():
+    index = SpatialHash(5000)
+    index.add(52.0, 179.99, 1.0)
+    
+    assert index.nearby(52.0, -179.99, 5000) == [1.0]
+    assert index.nearby(52.0, -179.9, 5000) == []
+
+
+def out_and_back_points(spacing_m, n=40):
+    """Search points every spacing_m east along a parallel, then back to the start."""
+    step_deg = spacing_m / 111320 / np.cos(np.radians(35.0))
+    lons = [-100.0 + k * step_deg for k in range(n)]
+    lons += lons[-2::-1]
+    return [(35.0, lon, k * spacing_m) for k, lon in enumerate(lons)]
+
+
+def test_return_leg_of_a_round_trip_is_skipped():
+    finder = GooglePlacesFinder('test-key')
+    points = out_and_back_points(4000)
+    lines = []
+    
+    kept = finder._skip_repeat_points(points, 5000, 'parks', lines.append)
+    
+    # Every return-leg point is within one radius of an outbound point more than two radii back
+    assert kept == points[:40]
+    assert finder.route_scan_stats['repeat_points_skipped'] == len(points) - 40
+    assert finder.route_scan_stats['search_points'] == 40
+    assert lines == [f"    ↩ parks: skipped {len(points) - 40} search points already covered earlier on the route"]
+
+
+def test_one_way_route_keeps_every_point():
+    finder = GooglePlacesFinder('test-key')
+    points = out_and_back_points(4000)[:40]
+    lines = []
+    
+    assert finder._skip_repeat_points(points, 5000, 'parks', lines.append) == points
+    assert lines == []
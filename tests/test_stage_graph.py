@@ -0,0 +1,100 @@
+"""StageGraph scheduling, log ordering and failure handling, and OrderedFanOut."""
+
+import threading
+import time
+
+import pytest
+
+from utils.concurrency import OrderedFanOut, StageGraph
+
+
+def test_stages_run_after_their_dependencies():
+    graph = StageGraph(log=lambda line: None)
+    graph.add('route', lambda results, log: 'route')
+    graph.add('cities', lambda results, log: results['route'] + '+cities', deps=['route'])
+    graph.add('scan', lambda results, log: results['route'] + '+scan', deps=['route'])
+    graph.add('stops', lambda results, log: (results['cities'], results['scan']), deps=['cities', 'scan'])
+    
+    results = graph.run()
+    
+    assert results['stops'] == ('route+cities', 'route+scan')
+    for name, deps in (('cities', ['route']), ('scan', ['route']), ('stops', ['cities', 'scan'])):
+        assert all(graph.timings[dep][1] <= graph.timings[name][0] for dep in deps)
+
+
+def test_independent_stages_overlap():
+    both_running = threading.Barrier(2, timeout=5)
+    graph = StageGraph(log=lambda line: None)
+    graph.add('route', lambda results, log: None)
+    graph.add('cities', lambda results, log: both_running.wait(), deps=['route'])
+    graph.add('scan', lambda results, log: both_running.wait(), deps=['route'])
+    
+    # Would time out on the barrier if the two stages ran one after the other
+    graph.run()
+
+
+def test_logs_come_out_in_stage_order():
+    lines = []
+    graph = StageGraph(log=lines.append)
+    
+    def slow(results, log):
+        time.sleep(0.05)
+        log('first: done')
+    
+    graph.add('first', slow)
+    graph.add('second', lambda results, log: log('second: done'))
+    graph.run()
+    
+    assert graph.timings['second'][1] < graph.timings['first'][1]
+    assert lines == ['first: done', 'second: done']
+
+
+def test_failed_stage_skips_dependents_and_is_raised():
+    ran, lines = [], []
+    graph = StageGraph(log=lines.append)
+    
+    def fail(results, log):
+        log('route: failing')
+        raise RuntimeError('no route')
+    
+    graph.add('route', fail)
+    graph.add('cities', lambda results, log: ran.append('cities'), deps=['route'])
+    graph.add('weather', lambda results, log: log('weather: ok'))
+    
+    with pytest.raises(RuntimeError, match='no route'):
+        graph.run()
+    assert ran == []
+    assert lines == ['route: failing', 'weather: ok']
+
+
+def test_unknown_dependency_is_rejected():
+    graph = StageGraph()
+    with pytest.raises(ValueError, match='unknown stages: route'):
+        graph.add('cities', lambda results, log: None, deps=['route'])
+
+
+def test_critical_path_follows_the_latest_dependency():
+    graph = StageGraph(log=lambda line: None)
+    graph.add('route', lambda results, log: None)
+    graph.add('cities', lambda results, log: time.sleep(0.05), deps=['route'])
+    graph.add('scan', lambda results, log: None, deps=['route'])
+    graph.add('stops', lambda results, log: None, deps=['cities', 'scan'])
+    graph.run()
+    
+    assert graph.critical_path() == ['route', 'cities', 'stops']
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_fan_out_keeps_submission_order(workers):
+    def delayed(k):
+        time.sleep(0.001 * (5 - k))
+        if k == 3:
+            raise KeyError(k)
+        return k * k
+    
+    with OrderedFanOut(max_workers=workers) as fan_out:
+        assert fan_out.map(lambda k: k * k, range(5)) == [0, 1, 4, 9, 16]
+        futures = [fan_out.submit(delayed, k) for k in range(5)]
+        assert [f.result() for f in futures[:3]] == [0, 1, 4]
+        with pytest.raises(KeyError):
+            futures[3].result()
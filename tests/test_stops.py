@@ -0,0 +1,72 @@
+"""select_stops spacing by driving time, checked against a city-by-city greedy scan."""
+
+import numpy as np
+import pytest
+
+from planner.stops import select_stops
+from utils.route_geometry import RouteGeometry
+
+ORIGIN = {'name': 'Start, TX', 'lat': 35.0, 'lon': -100.0}
+DESTINATION = {'name': 'End, TX', 'lat': 35.0, 'lon': -90.0}
+
+
+def cities_along(miles):
+    return [{'name': f"City {k}", 'lat': 35.0, 'lon': -100.0, 'distance_mi': float(mi)} for k, mi in enumerate(miles)]
+
+
+def greedy_stops(cities, city_s, target_hours, waypoint_interval):
+    """The original one-city-at-a-time walk, over the same route distances and times."""
+    majors, waypoints = [], []
+    last_major_s = last_waypoint_m = 0.0
+    for city, seconds in zip(cities, city_s):
+        meters = city['distance_mi'] * 1609.34
+        if seconds - last_major_s >= target_hours * 3600 * 0.8:
+            majors.append(city['name'])
+            last_major_s, last_waypoint_m = seconds, meters
+        elif meters - last_waypoint_m >= waypoint_interval * 1609.34 * 0.8:
+            waypoints.append(city['name'])
+            last_waypoint_m = meters
+    return majors, waypoints
+
+
+def run(cities, target_hours, waypoint_interval, route=None):
+    majors, waypoints = select_stops(ORIGIN, DESTINATION, [], False, cities, target_hours, waypoint_interval,
+                                     log=lambda line: None, route=route)
+    return [stop['name'] for stop in majors[1:-1]], [city['name'] for city in waypoints]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_binary_search_matches_greedy_scan(seed):
+    rng = np.random.default_rng(seed)
+    miles = np.sort(rng.uniform(0, 2500, size=400))
+    cities = cities_along(miles)
+    for target_hours, waypoint_interval in ((8, 100), (3, 40), (12, 500)):
+        city_s = miles / 65 * 3600
+        assert run(cities, target_hours, waypoint_interval) == greedy_stops(
+            cities, city_s, target_hours, waypoint_interval)
+
+
+def test_spacing_follows_the_route_time_index():
+    # 600 miles east along a parallel: the first half at 30 mph, the second at 75 mph
+    route = RouteGeometry([[lon, 35.0] for lon in np.linspace(-100.0, -89.0, 601)])
+    half_m = route.total_m / 2
+    route.cumulative_s = np.where(route.cumulative_m <= half_m,
+                                  route.cumulative_m / (30 * 1609.34 / 3600),
+                                  half_m / (30 * 1609.34 / 3600) + (route.cumulative_m - half_m) / (75 * 1609.34 / 3600))
+    # Every 7 miles, so no gap between cities lands exactly on a threshold
+    miles = np.arange(3, route.total_m / 1609.34, 7)
+    cities = cities_along(miles)
+    
+    majors, waypoints = run(cities, 5, 95, route=route)
+    
+    assert (majors, waypoints) == greedy_stops(cities, route.time_at(miles * 1609.34), 5, 95)
+    # 4 h of driving is only 120 miles at 30 mph but 300 at 75 mph
+    first, second = (int(name.split()[1]) for name in majors[:2])
+    assert 120 <= miles[first] < 127
+    assert miles[second] - miles[first] > 120
+
+
+def test_no_cities_leaves_only_the_ends():
+    majors, waypoints = select_stops(ORIGIN, DESTINATION, [], True, [], 8, 100, log=lambda line: None)
+    assert [stop['type'] for stop in majors] == ['start', 'destination', 'return']
+    assert waypoints == []
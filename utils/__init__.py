@@ -3,10 +3,18 @@
 from .distance import haversine_distance, calculate_popularity_score
 from .map_generator import create_trip_map
 from .gpx_exporter import create_gpx_file
+from .geohash import encode_geohash
+from .concurrency import OrderedFanOut, StageGraph, StageError
+from .route_geometry import RouteGeometry
 
 __all__ = [
     'haversine_distance',
     'calculate_popularity_score',
     'create_trip_map',
     'create_gpx_file',
+    'encode_geohash',
+    'OrderedFanOut',
+    'StageGraph',
+    'StageError',
+    'RouteGeometry',
 ]
@@ -0,0 +1,201 @@
+"""Bounded concurrent execution helpers and a stage scheduler."""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+class OrderedFanOut:
+    """
+    Run independent calls on a bounded thread pool, gathering results in submission order.
+    
+    With max_workers <= 1 every call runs inline when submitted, which keeps the
+    original sequential behaviour available for debugging.
+    """
+    
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if max_workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='places')
+    
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Schedule func(*args, **kwargs) and return its future."""
+        if self._executor is not None:
+            return self._executor.submit(func, *args, **kwargs)
+        
+        future: Future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def map(self, func: Callable, items: Iterable) -> List[Any]:
+        """Call func on every item concurrently and return the results in item order."""
+        futures = [self.submit(func, item) for item in items]
+        return [future.result() for future in futures]
+    
+    def shutdown(self):
+        """Wait for outstanding calls and release the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+class StageError(Exception):
+    """A pipeline stage could not produce its result; dependent stages are not run."""
+
+
+class _Stage:
+    def __init__(self, name: str, func: Callable, deps: Sequence[str]):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+
+
+class StageGraph:
+    """
+    Run named stages as soon as their dependencies finish, independent stages concurrently.
+    
+    Each stage is called as func(results, log), where results holds the return
+    values of the stages finished so far (always including its dependencies).
+    Lines a stage logs are held back and emitted in the order the stages were
+    added, so the output reads the same however the stages overlap.
+    """
+    
+    def __init__(self, log: Callable[[str], None] = print):
+        """
+        Args:
+            log: Receives every stage's log lines, in stage order
+        """
+        self.log = log
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self.restored: List[str] = []
+        self._stages: List[_Stage] = []
+        self._logs: Dict[str, List[str]] = {}
+        self._done: Set[str] = set()
+        self._flushed = 0
+        self._checkpoint = None
+    
+    def add(self, name: str, func: Callable[[Dict[str, Any], Callable[[str], None]], Any],
+            deps: Sequence[str] = ()) -> None:
+        """
+        Add a stage (dependencies must already have been added).
+        
+        Args:
+            name: Stage name, also the key of its result
+            func: Called as func(results, log) and returns the stage's result
+            deps: Names of the stages whose results it needs
+        """
+        known = {stage.name for stage in self._stages}
+        missing = [dep for dep in deps if dep not in known]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {', '.join(missing)}")
+        self._stages.append(_Stage(name, func, deps))
+        self._logs[name] = []
+    
+    def run(self, max_workers: Optional[int] = None, checkpoint=None) -> Dict[str, Any]:
+        """
+        Run every stage.
+        
+        With a checkpoint, stages it already holds are restored instead of run
+        (their log lines are replayed) and every stage that finishes is saved to
+        it. A checkpoint provides completed() -> {name: (result, log_lines)} and
+        save(name, result, log_lines).
+        
+        Args:
+            max_workers: Stages allowed to run at once (default: all; 1 runs them one by one)
+            checkpoint: Where finished stages are restored from and saved to
+        
+        Returns:
+            Results by stage name (raises the first stage exception, once running stages finish)
+        """
+        start = time.perf_counter()
+        pending = list(self._stages)
+        running: Dict[Future, _Stage] = {}
+        error: Optional[BaseException] = None
+        self._checkpoint = checkpoint
+        
+        if checkpoint is not None:
+            completed = checkpoint.completed()
+            for stage in self._stages:
+                # A stage is only as good as the inputs it was computed from
+                if stage.name in completed and all(dep in self.results for dep in stage.deps):
+                    self.results[stage.name], lines = completed[stage.name]
+                    self._logs[stage.name] = list(lines)
+                    self._done.add(stage.name)
+                    self.timings[stage.name] = (0.0, 0.0)
+                    self.restored.append(stage.name)
+                    pending.remove(stage)
+            self._flush()
+        
+        with ThreadPoolExecutor(max_workers=max_workers or max(len(self._stages), 1),
+                                thread_name_prefix='stage') as executor:
+            while True:
+                if error is None:
+                    for stage in [s for s in pending if all(dep in self.results for dep in s.deps)]:
+                        pending.remove(stage)
+                        running[executor.submit(self._run_stage, stage, start)] = stage
+                if not running:
+                    break
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    try:
+                        self.results[stage.name] = future.result()
+                    except Exception as e:
+                        error = error or e
+                    self._done.add(stage.name)
+                self._flush()
+        
+        self._flush(skip_unfinished=True)
+        if error is not None:
+            raise error
+        return self.results
+    
+    def _run_stage(self, stage: _Stage, start: float) -> Any:
+        began = time.perf_counter() - start
+        try:
+            result = stage.func(self.results, self._logs[stage.name].append)
+        finally:
+            self.timings[stage.name] = (began, time.perf_counter() - start)
+        if self._checkpoint is not None:
+            self._checkpoint.save(stage.name, result, list(self._logs[stage.name]))
+        return result
+    
+    def _flush(self, skip_unfinished: bool = False) -> None:
+        """Emit held-back log lines of finished stages, in stage order."""
+        while self._flushed < len(self._stages):
+            stage = self._stages[self._flushed]
+            if stage.name not in self._done and not skip_unfinished:
+                break
+            for line in self._logs[stage.name]:
+                self.log(line)
+            self._logs[stage.name] = []
+            self._flushed += 1
+    
+    def critical_path(self) -> List[str]:
+        """
+        The chain of stages that determined the total run time.
+        
+        Returns:
+            Stage names from first to last, ending with the stage that finished last
+        """
+        if not self.timings:
+            return []
+        deps = {stage.name: stage.deps for stage in self._stages}
+        name = max(self.timings, key=lambda n: self.timings[n][1])
+        path = [name]
+        while deps[name]:
+            name = max(deps[name], key=lambda n: self.timings[n][1])
+            path.insert(0, name)
+        return path
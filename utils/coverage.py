@@ -0,0 +1,175 @@
+"""Search-circle placement covering a corridor around a route."""
+
+import numpy as np
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from utils.route_geometry import RouteGeometry, RouteLike, EARTH_RADIUS_M
+
+# Rows of the candidate/element dot-product matrix evaluated at once
+CHUNK_SIZE = 512
+
+
+@dataclass
+class CoveragePlan:
+    """Search circle centers along a route and how well they cover the corridor."""
+    radius_m: float
+    corridor_m: float
+    centers: List[Tuple[float, float, float]] = field(default_factory=list)  # (lat, lon, distance_from_start_m)
+    coverage_pct: float = 100.0
+    
+    @property
+    def calls(self) -> int:
+        return len(self.centers)
+
+
+def _unit_vectors(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    lat_r = np.radians(lats)
+    lon_r = np.radians(lons)
+    return np.column_stack((np.cos(lat_r) * np.cos(lon_r), np.cos(lat_r) * np.sin(lon_r), np.sin(lat_r)))
+
+
+def _to_lat_lon(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return np.degrees(np.arcsin(np.clip(vectors[:, 2], -1, 1))), np.degrees(np.arctan2(vectors[:, 1], vectors[:, 0]))
+
+
+def _resample(route: RouteGeometry, step_m: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Points every step_m along the route.
+    
+    Returns:
+        (unit vectors, distance from start in meters)
+    """
+    vectors = _unit_vectors(route.lats, route.lons)
+    cumulative = route.cumulative_m
+    
+    stations = np.append(np.arange(cumulative[0], cumulative[-1], step_m), cumulative[-1])
+    points = np.column_stack([np.interp(stations, cumulative, vectors[:, k]) for k in range(3)])
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    return points, stations
+
+
+def _corridor_points(points: np.ndarray, offsets_m: List[float]) -> np.ndarray:
+    """Offset each centerline point sideways (perpendicular to the route) by each distance."""
+    tangents = np.gradient(points, axis=0)
+    normals = np.cross(points, tangents)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+    
+    shifted = []
+    for offset in offsets_m:
+        angle = offset / EARTH_RADIUS_M
+        shifted.append(points * np.cos(angle) + normals * np.sin(angle))
+    return np.vstack(shifted)
+
+
+def _covered_sets(candidates: np.ndarray, elements: np.ndarray, radius_m: float) -> List[np.ndarray]:
+    """Indices of the elements within radius_m of each candidate."""
+    min_dot = np.cos(radius_m / EARTH_RADIUS_M)
+    sets = []
+    for start in range(0, len(candidates), CHUNK_SIZE):
+        within = candidates[start:start + CHUNK_SIZE] @ elements.T >= min_dot
+        sets.extend(np.flatnonzero(row) for row in within)
+    return sets
+
+
+def corridor_coverage(
+    route_geometry: RouteLike,
+    centers: List[Tuple[float, float]],
+    radius_m: float,
+    corridor_m: float
+) -> float:
+    """
+    Percentage of the corridor within radius_m of at least one center.
+    
+    Args:
+        route_geometry: RouteGeometry or list of [lon, lat] coordinates (GeoJSON order)
+        centers: (lat, lon) search circle centers
+        radius_m: Search circle radius
+        corridor_m: Corridor half-width around the route
+    """
+    route = RouteGeometry.wrap(route_geometry)
+    if len(route) < 2:
+        return 100.0
+    if not centers:
+        return 0.0
+    
+    step_m = max(radius_m / 8, 100.0)
+    points, _ = _resample(route, step_m)
+    offsets = [0.0] if corridor_m <= 0 else [-corridor_m, -corridor_m / 2, 0.0, corridor_m / 2, corridor_m]
+    checks = _corridor_points(points, offsets)
+    
+    center_vectors = _unit_vectors(np.array([c[0] for c in centers]), np.array([c[1] for c in centers]))
+    min_dot = np.cos(radius_m / EARTH_RADIUS_M)
+    covered = np.zeros(len(checks), dtype=bool)
+    for start in range(0, len(checks), CHUNK_SIZE):
+        chunk = checks[start:start + CHUNK_SIZE]
+        covered[start:start + CHUNK_SIZE] = (chunk @ center_vectors.T >= min_dot).any(axis=1)
+    return 100.0 * covered.mean()
+
+
+def plan_corridor_coverage(
+    route_geometry: RouteLike,
+    radius_m: float,
+    corridor_m: float = 0.0
+) -> CoveragePlan:
+    """
+    Choose a near-minimal set of search circle centers covering the route corridor.
+    
+    The corridor is discretized into points along and beside the route and
+    covered by circles centered on the route (a greedy set cover). One circle
+    can serve several passes of a twisty road or loop, and straight stretches
+    get evenly spaced circles with no gaps.
+    
+    Args:
+        route_geometry: RouteGeometry or list of [lon, lat] coordinates (GeoJSON order)
+        radius_m: Search circle radius
+        corridor_m: Corridor half-width to cover (must be below radius_m)
+    
+    Returns:
+        CoveragePlan with centers in route order
+    """
+    corridor_m = min(corridor_m, radius_m * 0.9)
+    plan = CoveragePlan(radius_m=radius_m, corridor_m=corridor_m)
+    route = RouteGeometry.wrap(route_geometry)
+    if len(route) < 2:
+        return plan
+    
+    # Candidate centers every quarter radius along the route
+    step_m = max(radius_m / 4, 250.0)
+    candidates, stations = _resample(route, step_m)
+    offsets = [0.0] if corridor_m <= 0 else [-corridor_m, 0.0, corridor_m]
+    elements = _corridor_points(candidates, offsets)
+    covers = _covered_sets(candidates, elements, radius_m)
+    
+    # Greedy cover sweeping along the route: the earliest uncovered corridor point
+    # gets the circle reaching farthest ahead among nearby candidates that cover it
+    # (optimal for a simple corridor). Points on later passes of a loop are marked
+    # covered along the way, so they never need circles of their own. The circle
+    # must also reach the point before it on the same line, so consecutive circles
+    # overlap instead of leaving a gap up to one step long between them.
+    covering = [[] for _ in range(len(elements))]
+    for i, cover in enumerate(covers):
+        for element in cover:
+            covering[element].append(i)
+    
+    n = len(candidates)
+    uncovered = np.ones(len(elements), dtype=bool)
+    sweep_order = np.argsort(np.tile(np.arange(n), len(offsets)), kind='stable')
+    chosen = []
+    for element in sweep_order:
+        if not uncovered[element] or not covering[element]:
+            continue
+        station = stations[element % n]
+        nearby = [i for i in covering[element] if abs(stations[i] - station) <= 2 * radius_m] or covering[element]
+        if element % n:
+            behind = set(covering[element - 1])
+            nearby = [i for i in nearby if i in behind] or nearby
+        best = max(nearby, key=lambda i: stations[i])
+        chosen.append(best)
+        uncovered[covers[best]] = False
+    
+    chosen.sort(key=lambda i: stations[i])
+    lats, lons = _to_lat_lon(candidates[chosen])
+    plan.centers = [(float(lat), float(lon), float(stations[i])) for lat, lon, i in zip(lats, lons, chosen)]
+    plan.coverage_pct = corridor_coverage(route, [(c[0], c[1]) for c in plan.centers], radius_m, corridor_m)
+    return plan
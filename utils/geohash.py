@@ -0,0 +1,41 @@
+"""Geohash encoding for spatially quantized cache keys."""
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(lat: float, lon: float, precision: int = 5) -> str:
+    """
+    Encode a coordinate as a geohash string.
+    
+    Args:
+        lat, lon: Coordinate to encode
+        precision: Number of characters (5 ≈ 4.9 km cells, roughly city level)
+        
+    Returns:
+        Geohash string of the cell containing the coordinate
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    use_lon = True
+    
+    while len(geohash) < precision:
+        rng, value = (lon_range, lon) if use_lon else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits = bits << 1
+            rng[1] = mid
+        use_lon = not use_lon
+        
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    
+    return ''.join(geohash)
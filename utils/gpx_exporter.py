@@ -1,13 +1,14 @@
 """GPX export utilities for importing routes into navigation apps."""
 
-from typing import List, Dict
+import numpy as np
+from typing import List, Dict, Union
 from datetime import datetime
 from xml.etree import ElementTree as ET
 from xml.dom import minidom
 
 
 def create_gpx_file(
-    route_geometry: List[List[float]],
+    route_geometry: Union[np.ndarray, List[List[float]]],
     major_stops: List[Dict],
     waypoint_cities: List[Dict],
     hotels: Dict,
@@ -28,7 +29,7 @@ def create_gpx_file(
     - Most GPS devices
     
     Args:
-        route_geometry: List of [lat, lon] coordinates from route
+        route_geometry: [lat, lon] coordinates from route (list or (N, 2) array)
         major_stops: List of major stop city dicts
         waypoint_cities: List of waypoint city dicts
         hotels: Dict of hotels at major stops
@@ -248,11 +249,11 @@ def create_gpx_file(
     # Create track segment
     trkseg = ET.SubElement(trk, 'trkseg')
     
-    # Add all route points (coordinates are [lat, lon] format)
-    for coord in route_geometry:
+    # Add all route points (coordinates are [lat, lon] format), converted to Python floats in one pass
+    for lat, lon in np.asarray(route_geometry, dtype=float).reshape(-1, 2).tolist():
         trkpt = ET.SubElement(trkseg, 'trkpt', {
-            'lat': str(coord[0]),
-            'lon': str(coord[1])
+            'lat': str(lat),
+            'lon': str(lon)
         })
     
     # Pretty print and save
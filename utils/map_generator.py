@@ -1,15 +1,17 @@
 """Map generation utilities for the road trip planner."""
 
 import folium
+import numpy as np
 from folium import plugins
-from typing import List, Dict
+from typing import List, Dict, Union
 from datetime import datetime
 from models import Hotel, Veterinarian
 from utils.distance import haversine_distance
+from utils.route_geometry import RouteGeometry
 
 
 def create_trip_map(
-    route_geometry: List[List[float]],
+    route_geometry: Union[np.ndarray, List[List[float]]],
     major_stops: List[Dict],
     waypoint_cities: List[Dict],
     hotels: Dict[str, Hotel],
@@ -19,13 +21,11 @@ def create_trip_map(
     trip_name: str,
     route_data: Dict = None
 ) -> folium.Map:
-    """Create an interactive map for the trip."""
+    """Create an interactive map for the trip (route_geometry holds [lat, lon] rows)."""
     
     # Calculate map center
-    all_lats = [coord[0] for coord in route_geometry]
-    all_lons = [coord[1] for coord in route_geometry]
-    center_lat = sum(all_lats) / len(all_lats)
-    center_lon = sum(all_lons) / len(all_lons)
+    route_points = np.asarray(route_geometry, dtype=float).reshape(-1, 2)
+    center_lat, center_lon = (float(value) for value in route_points.mean(axis=0))
     
     # Create map
     m = folium.Map(
@@ -139,6 +139,8 @@ def create_trip_map(
     if route_data and len(all_stops) > 1:
         distance_group = folium.FeatureGroup(name='📏 Distances & Times', show=True)
         stop_cities = [stop for stop in all_stops if stop['type'] != 'return']
+        # Nearest route vertex to each stop, found with one vectorized pass per stop
+        route_index = RouteGeometry(route_points[:, ::-1])
         
         for i in range(len(stop_cities) - 1):
             current_stop = stop_cities[i]
@@ -147,24 +149,12 @@ def create_trip_map(
             distance_mi = haversine_distance(current_stop['lat'], current_stop['lon'], 
                                            next_stop['lat'], next_stop['lon'], 'miles')
             hours = distance_mi / 60.0
-            route_coords = route_geometry
-            
-            def find_closest_point_index(lat, lon, coords):
-                min_dist = float('inf')
-                min_idx = 0
-                for idx, coord in enumerate(coords):
-                    dist = haversine_distance(lat, lon, coord[0], coord[1], 'miles')
-                    if dist < min_dist:
-                        min_dist = dist
-                        min_idx = idx
-                return min_idx
-            
-            start_idx = find_closest_point_index(current_stop['lat'], current_stop['lon'], route_coords)
-            end_idx = find_closest_point_index(next_stop['lat'], next_stop['lon'], route_coords)
+            start_idx = route_index.nearest_vertex(current_stop['lat'], current_stop['lon'])[0]
+            end_idx = route_index.nearest_vertex(next_stop['lat'], next_stop['lon'])[0]
             
             mid_idx = (start_idx + end_idx) // 2
-            if mid_idx < len(route_coords):
-                mid_lat, mid_lon = route_coords[mid_idx][0], route_coords[mid_idx][1]
+            if mid_idx < len(route_points):
+                mid_lat, mid_lon = float(route_points[mid_idx][0]), float(route_points[mid_idx][1])
             else:
                 mid_lat = (current_stop['lat'] + next_stop['lat']) / 2
                 mid_lon = (current_stop['lon'] + next_stop['lon']) / 2
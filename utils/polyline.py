@@ -0,0 +1,167 @@
+"""Encoded polyline format (Google / OSRM) and polyline simplification."""
+
+import math
+import numpy as np
+from typing import List, Tuple
+
+
+def encode_polyline(points: List[Tuple[float, float]], precision: int = 5) -> str:
+    """
+    Encode (lat, lon) points with the Encoded Polyline Algorithm.
+
+    Args:
+        points: List of (lat, lon) tuples
+        precision: Decimal places kept (5 for Google, 6 for OSRM polyline6)
+
+    Returns:
+        Encoded polyline string
+    """
+    factor = 10 ** precision
+    chunks = []
+    prev_lat = prev_lon = 0
+
+    for lat, lon in points:
+        lat_i = int(round(lat * factor))
+        lon_i = int(round(lon * factor))
+        for delta in (lat_i - prev_lat, lon_i - prev_lon):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        prev_lat, prev_lon = lat_i, lon_i
+
+    return ''.join(chunks)
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> List[Tuple[float, float]]:
+    """
+    Decode an encoded polyline.
+
+    Returns:
+        List of (lat, lon) tuples
+    """
+    factor = 10 ** precision
+    points = []
+    index = lat = lon = 0
+
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        points.append((lat / factor, lon / factor))
+
+    return points
+
+
+def encode_polyline_array(points: np.ndarray, precision: int = 5) -> str:
+    """
+    Vectorized encode_polyline for an (N, 2) array of [lat, lon] rows.
+
+    Args:
+        points: Array (or array view) of [lat, lon] rows
+        precision: Decimal places kept (5 for Google, 6 for OSRM polyline6)
+
+    Returns:
+        Encoded polyline string, identical to encode_polyline's
+    """
+    scaled = np.rint(np.asarray(points, dtype=float).reshape(-1, 2) * 10 ** precision).astype(np.int64)
+    deltas = np.diff(scaled, axis=0, prepend=0).ravel()
+    values = np.where(deltas < 0, ~(deltas << 1), deltas << 1)
+
+    # Each value becomes 5-bit chunks, least significant first; all but the last get the 0x20 flag
+    shifts = np.arange(0, 64, 5)
+    chunks = (values[:, None] >> shifts) & 0x1f
+    lengths = np.maximum(1, (np.floor(np.log2(np.maximum(values, 1))).astype(np.int64) // 5) + 1)
+    positions = np.arange(len(shifts))
+    used = positions < lengths[:, None]
+    flagged = positions < (lengths[:, None] - 1)
+    chunks = (chunks | np.where(flagged, 0x20, 0)) + 63
+    return chunks[used].astype(np.uint8).tobytes().decode('ascii')
+
+
+def decode_polyline_array(encoded: str, precision: int = 5) -> np.ndarray:
+    """
+    Vectorized decode_polyline, straight into one float64 buffer.
+
+    Returns:
+        (N, 2) C-contiguous array of [lat, lon] rows; [:, ::-1] is a zero-copy
+        [lon, lat] (GeoJSON order) view of it
+    """
+    data = np.frombuffer(encoded.encode('ascii'), dtype=np.uint8).astype(np.int64) - 63
+    if not len(data):
+        return np.empty((0, 2))
+    ends = data < 0x20
+
+    # Value each byte belongs to and its 5-bit position within that value
+    value_ids = np.concatenate(([0], np.cumsum(ends)[:-1]))
+    starts = np.flatnonzero(np.concatenate(([True], ends[:-1])))
+    positions = np.arange(len(data)) - starts[value_ids]
+    values = np.zeros(len(starts), dtype=np.int64)
+    np.add.at(values, value_ids, (data & 0x1f) << (5 * positions))
+
+    deltas = np.where(values & 1, ~(values >> 1), values >> 1)
+    return np.cumsum(deltas.reshape(-1, 2), axis=0) / 10 ** precision
+
+
+def simplify_polyline(points: List[Tuple[float, float]], tolerance_m: float) -> List[Tuple[float, float]]:
+    """
+    Ramer-Douglas-Peucker simplification of (lat, lon) points.
+
+    Distances use a local equirectangular projection, which is accurate to well
+    under a percent at the tolerances used for search corridors.
+
+    Args:
+        points: List of (lat, lon) tuples
+        tolerance_m: Maximum distance a dropped point may lie from the simplified line
+
+    Returns:
+        Subset of points (first and last always kept)
+    """
+    if len(points) < 3:
+        return list(points)
+
+    meters_per_deg = 111320.0
+    ref_lat = math.radians(sum(lat for lat, _ in points) / len(points))
+    xy = [(lon * meters_per_deg * math.cos(ref_lat), lat * meters_per_deg) for lat, lon in points]
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        x1, y1 = xy[start]
+        x2, y2 = xy[end]
+        dx, dy = x2 - x1, y2 - y1
+        seg_len_sq = dx * dx + dy * dy
+
+        max_dist = -1.0
+        max_index = start
+        for i in range(start + 1, end):
+            px, py = xy[i]
+            if seg_len_sq == 0:
+                dist = math.hypot(px - x1, py - y1)
+            else:
+                t = max(0.0, min(1.0, ((px - x1) * dx + (py - y1) * dy) / seg_len_sq))
+                dist = math.hypot(px - (x1 + t * dx), py - (y1 + t * dy))
+            if dist > max_dist:
+                max_dist = dist
+                max_index = i
+
+        if max_dist > tolerance_m:
+            keep[max_index] = True
+            stack.append((start, max_index))
+            stack.append((max_index, end))
+
+    return [point for point, kept in zip(points, keep) if kept]
@@ -0,0 +1,218 @@
+"""Route geometry with a precomputed chainage (distance along the route) index."""
+
+import numpy as np
+from typing import List, Dict, Optional, Tuple, Union
+
+EARTH_RADIUS_M = 6371000.0
+
+
+class RouteGeometry:
+    """A route polyline with segment lengths and cumulative distance computed once.
+    
+    Scanners that need to walk the route (sampling, splitting, snapping places
+    to the route) share one instance instead of re-summing haversine distances
+    vertex by vertex.
+    """
+    
+    def __init__(self, coordinates: Union[np.ndarray, List[List[float]]]):
+        """
+        Args:
+            coordinates: [lon, lat] coordinates (GeoJSON order); a float64 array
+                (as in OSRMRouter route data) is used without copying
+        """
+        self.coordinates = coordinates
+        self.lonlat = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        self.lons = self.lonlat[:, 0]
+        self.lats = self.lonlat[:, 1]
+        
+        self._lat_r = np.radians(self.lats)
+        self._lon_r = np.radians(self.lons)
+        self.segment_m = self._haversine_m(self._lat_r[:-1], self._lon_r[:-1], self._lat_r[1:], self._lon_r[1:])
+        self.cumulative_m = np.concatenate(([0.0], np.cumsum(self.segment_m)))
+        # Driving time to each vertex, in seconds; set by from_route()
+        self.cumulative_s: Optional[np.ndarray] = None
+    
+    @classmethod
+    def from_route(cls, route_data: Dict) -> 'RouteGeometry':
+        """
+        Build from OSRMRouter.get_route() output, with a driving time index.
+        
+        Times come from the legs' OSRM duration annotations when every leg has
+        them; otherwise the route's total duration is spread evenly by distance.
+        """
+        route = cls(route_data['geometry']['coordinates'])
+        durations = [leg.get('annotation', {}).get('duration') for leg in route_data.get('legs', [])]
+        if durations and all(d is not None for d in durations) and sum(map(len, durations)) == len(route) - 1:
+            route.cumulative_s = np.concatenate(([0.0], np.cumsum(np.concatenate(durations))))
+        else:
+            total_s = route_data.get('duration_s', 0.0)
+            route.cumulative_s = route.cumulative_m * (total_s / route.total_m if route.total_m > 0 else 0.0)
+        return route
+    
+    @classmethod
+    def wrap(cls, route: Union['RouteGeometry', List[List[float]]]) -> 'RouteGeometry':
+        """Return route unchanged if it is already a RouteGeometry, else index the coordinate list."""
+        return route if isinstance(route, cls) else cls(route)
+    
+    @staticmethod
+    def _haversine_m(lat1, lon1, lat2, lon2):
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+    
+    @property
+    def latlon(self) -> np.ndarray:
+        """[lat, lon] rows (map and GPX order), a view of the same buffer."""
+        return self.lonlat[:, ::-1]
+    
+    def __len__(self) -> int:
+        return len(self.lats)
+    
+    @property
+    def total_m(self) -> float:
+        return float(self.cumulative_m[-1] - self.cumulative_m[0]) if len(self) else 0.0
+    
+    def section(self, start: int, end: int) -> 'RouteGeometry':
+        """
+        Vertices start..end (inclusive) as a route of their own.
+        
+        The section keeps this route's chainage and driving times, so distances
+        reported from it (sample points, "~N mi from start" labels) are still
+        measured from the start of the whole trip.
+        """
+        part = RouteGeometry(self.coordinates[start:end + 1])
+        part.cumulative_m = self.cumulative_m[start:end + 1]
+        if self.cumulative_s is not None:
+            part.cumulative_s = self.cumulative_s[start:end + 1]
+        return part
+    
+    def distance_at(self, index: int) -> float:
+        """Distance from the start to vertex index, in meters."""
+        return float(self.cumulative_m[index])
+    
+    def time_at(self, distance_m: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Driving time from the start to distance_m along the route, in seconds.
+        
+        Interpolated between vertices; distance_m may be an array. Without a time
+        index (see from_route) the route is assumed to average 65 mph.
+        """
+        if self.cumulative_s is None:
+            return np.asarray(distance_m) / (65 * 1609.34 / 3600)
+        return np.interp(distance_m, self.cumulative_m, self.cumulative_s)
+    
+    def index_at(self, distance_m: float) -> int:
+        """Index of the first vertex at least distance_m from the start (len(self) if past the end)."""
+        return int(np.searchsorted(self.cumulative_m, distance_m, side='left'))
+    
+    def point_at(self, distance_m: float) -> Tuple[float, float]:
+        """
+        Position distance_m along the route, interpolated within its segment.
+        
+        Returns:
+            (lat, lon), clamped to the route's ends
+        """
+        if len(self) < 2 or distance_m <= self.cumulative_m[0]:
+            return float(self.lats[0]), float(self.lons[0])
+        i = self.index_at(distance_m)
+        if i >= len(self):
+            return float(self.lats[-1]), float(self.lons[-1])
+        
+        start = self.cumulative_m[i - 1]
+        fraction = (distance_m - start) / (self.cumulative_m[i] - start) if self.cumulative_m[i] > start else 0.0
+        lat = self.lats[i - 1] + fraction * (self.lats[i] - self.lats[i - 1])
+        lon = self.lons[i - 1] + fraction * (self.lons[i] - self.lons[i - 1])
+        return float(lat), float(lon)
+    
+    def sample_indices(self, interval_m: float) -> List[int]:
+        """
+        Vertices at least interval_m apart along the route.
+        
+        Each index is the first vertex interval_m or more past the previous one
+        (the start is not included), matching a vertex-by-vertex walk.
+        """
+        indices = []
+        last = self.cumulative_m[0]
+        while True:
+            i = self.index_at(last + interval_m)
+            if i >= len(self):
+                return indices
+            indices.append(i)
+            last = self.cumulative_m[i]
+    
+    def sample_points(self, interval_m: float) -> List[Tuple[float, float, float]]:
+        """
+        Route vertices every interval_m (see sample_indices).
+        
+        Returns:
+            (lat, lon, distance_from_start_m) tuples
+        """
+        return [
+            (float(self.lats[i]), float(self.lons[i]), float(self.cumulative_m[i]))
+            for i in self.sample_indices(interval_m)
+        ]
+    
+    def split(self, length_m: float) -> List[List[List[float]]]:
+        """
+        Split the route into consecutive pieces about length_m long.
+        
+        Pieces share their boundary vertex.
+        
+        Returns:
+            [lon, lat] coordinates of each piece (slices of self.coordinates)
+        """
+        bounds = [0] + self.sample_indices(length_m)
+        if bounds[-1] < len(self) - 1:
+            bounds.append(len(self) - 1)
+        return [self.coordinates[start:end + 1] for start, end in zip(bounds, bounds[1:])]
+    
+    def leg_bounds(self, leg_distances_m: List[float],
+                   waypoints: Optional[List[Tuple[float, float]]] = None) -> List[int]:
+        """
+        Find where each leg of a multi-waypoint route starts and ends.
+        
+        Each boundary is placed at the legs' share of the total distance and, given
+        the waypoints, snapped to the vertex nearest the waypoint within a tenth of
+        the shorter adjacent leg.
+        
+        Args:
+            leg_distances_m: Length of each leg, in route order (OSRM legs' distance)
+            waypoints: (lat, lon) of every waypoint, start and end included
+        
+        Returns:
+            Vertex indices [0, end of leg 1, ..., last vertex]; leg k is
+            coordinates[bounds[k]:bounds[k + 1] + 1]
+        """
+        total = sum(leg_distances_m)
+        scale = self.total_m / total if total > 0 else 0.0
+        bounds = [0]
+        along_m = self.cumulative_m[0]
+        for k, leg_m in enumerate(leg_distances_m[:-1]):
+            along_m += leg_m * scale
+            i = max(min(self.index_at(along_m), len(self) - 1), bounds[-1])
+            if waypoints is not None:
+                window_m = 0.1 * min(leg_m, leg_distances_m[k + 1]) * scale
+                lo = max(self.index_at(along_m - window_m), bounds[-1])
+                hi = min(self.index_at(along_m + window_m), len(self) - 1)
+                if lo <= hi:
+                    lat, lon = waypoints[k + 1]
+                    offsets = self._haversine_m(self._lat_r[lo:hi + 1], self._lon_r[lo:hi + 1],
+                                                np.radians(lat), np.radians(lon))
+                    i = lo + int(np.argmin(offsets))
+            bounds.append(i)
+        bounds.append(len(self) - 1)
+        return bounds
+    
+    def nearest_vertex(self, lat: float, lon: float) -> Tuple[int, float]:
+        """
+        Route vertex closest to a point.
+        
+        Returns:
+            (vertex index, distance to it in meters)
+        """
+        offsets = self._haversine_m(self._lat_r, self._lon_r, np.radians(lat), np.radians(lon))
+        i = int(np.argmin(offsets))
+        return i, float(offsets[i])
+
+
+# Anything the route scanners accept: a RouteGeometry or a raw [lon, lat] list
+RouteLike = Union[RouteGeometry, List[List[float]]]
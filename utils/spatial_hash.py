@@ -0,0 +1,64 @@
+"""Spatial hash for "is there already a point near here?" queries."""
+
+import math
+from typing import Dict, List, Tuple
+
+EARTH_RADIUS_M = 6371000.0
+
+
+class SpatialHash:
+    """
+    Points bucketed into cubic cells on the Earth-centered (x, y, z) grid.
+    
+    A cell is as wide as the search radius, so a radius query only has to
+    look at the 27 cells around the query point. Works anywhere on the globe
+    (no projection seams); chord and great-circle distances agree to well
+    under a meter at road-trip search radii.
+    """
+    
+    def __init__(self, cell_m: float):
+        self.cell_m = cell_m
+        self._cells: Dict[Tuple[int, int, int], List[Tuple[Tuple[float, float, float], float]]] = {}
+    
+    @staticmethod
+    def _xyz(lat: float, lon: float) -> Tuple[float, float, float]:
+        lat_r = math.radians(lat)
+        lon_r = math.radians(lon)
+        return (
+            EARTH_RADIUS_M * math.cos(lat_r) * math.cos(lon_r),
+            EARTH_RADIUS_M * math.cos(lat_r) * math.sin(lon_r),
+            EARTH_RADIUS_M * math.sin(lat_r)
+        )
+    
+    def _cell(self, xyz: Tuple[float, float, float]) -> Tuple[int, int, int]:
+        return tuple(int(math.floor(c / self.cell_m)) for c in xyz)
+    
+    def add(self, lat: float, lon: float, tag: float = 0.0) -> None:
+        """
+        Insert a point.
+        
+        Args:
+            lat, lon: Point coordinate
+            tag: Value returned with the point by nearby() (e.g. distance along the route)
+        """
+        xyz = self._xyz(lat, lon)
+        self._cells.setdefault(self._cell(xyz), []).append((xyz, tag))
+    
+    def nearby(self, lat: float, lon: float, radius_m: float) -> List[float]:
+        """
+        Tags of stored points within radius_m (radius_m must not exceed the cell size).
+        
+        Returns:
+            Tags of the matching points
+        """
+        xyz = self._xyz(lat, lon)
+        cx, cy, cz = self._cell(xyz)
+        radius_sq = radius_m * radius_m
+        tags = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    for point, tag in self._cells.get((cx + dx, cy + dy, cz + dz), ()):
+                        if sum((a - b) ** 2 for a, b in zip(point, xyz)) <= radius_sq:
+                            tags.append(tag)
+        return tags